@@ -5,11 +5,30 @@ SXIVA Dashboard API
 Simple Flask API for syncing .sxiva data to TimescaleDB.
 """
 
+import hashlib
 import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 from datetime import datetime
-from flask import Flask, request, jsonify
+from functools import wraps
+from pathlib import Path
+from flask import Flask, request, jsonify, make_response
 import psycopg2
-from psycopg2.extras import Json
+from psycopg2.extensions import TRANSACTION_STATUS_IDLE
+from psycopg2.extras import Json, execute_values
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+import numpy as np
+
+try:
+    from sxiva.rolling import SERIES as ROLLING_SUM_SERIES, category_rolling_sums
+except ImportError:
+    # Running from a checkout: the engine is part of the sxiva tools package
+    sys.path.insert(0, str(Path(__file__).resolve().parents[2] / 'tools'))
+    from sxiva.rolling import SERIES as ROLLING_SUM_SERIES, category_rolling_sums
+from sxiva.manifest import payload_digest
 
 app = Flask(__name__)
 
@@ -21,15 +40,219 @@ DB_USER = os.getenv('DB_USER', 'sxiva_user')
 DB_PASSWORD = os.getenv('DB_PASSWORD', 'changeme123')
 API_TOKEN = os.getenv('API_TOKEN', 'changeme-set-a-real-token')
 
-def get_db_connection():
-    """Create a database connection"""
-    return psycopg2.connect(
-        host=DB_HOST,
-        port=DB_PORT,
-        dbname=DB_NAME,
-        user=DB_USER,
-        password=DB_PASSWORD
-    )
+# Maximum number of days accepted by /api/sync/batch in one request
+MAX_BATCH_SIZE = int(os.getenv('MAX_BATCH_SIZE', '500'))
+
+# Response cache for the public analytics endpoints (entries per process)
+RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', '128'))
+
+# Connection pool (per process; gunicorn workers each get their own)
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '2'))  # Idle connections kept open (extra ones are closed on return)
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '5'))
+DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '10'))  # Seconds to wait for a free connection
+DB_POOL_CHECK_IDLE = float(os.getenv('DB_POOL_CHECK_IDLE', '30'))  # Ping connections idle longer than this
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_slots = threading.BoundedSemaphore(DB_POOL_MAX)
+_pool_in_use = 0
+_pool_waits = 0  # Checkouts that had to wait for a free connection
+_last_used = {}  # id(conn) -> time.monotonic() when it was returned
+
+def get_pool():
+    """Get the process-wide connection pool, creating it on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadedConnectionPool(
+                DB_POOL_MIN, DB_POOL_MAX,
+                host=DB_HOST,
+                port=DB_PORT,
+                dbname=DB_NAME,
+                user=DB_USER,
+                password=DB_PASSWORD
+            )
+        return _pool
+
+def _is_healthy(conn):
+    """Check a pooled connection before handing it out"""
+    if conn.closed:
+        return False
+
+    # Only ping connections that sat idle long enough to have been dropped
+    last_used = _last_used.get(id(conn))
+    if last_used is not None and time.monotonic() - last_used < DB_POOL_CHECK_IDLE:
+        return True
+
+    try:
+        cur = conn.cursor()
+        cur.execute("SELECT 1")
+        cur.close()
+        conn.rollback()
+        return True
+    except psycopg2.Error:
+        return False
+
+@contextmanager
+def db_connection():
+    """
+    Check out a pooled database connection.
+
+    Waits up to DB_POOL_TIMEOUT seconds when all DB_POOL_MAX connections are
+    in use. The connection is returned to the pool on exit; an uncommitted
+    transaction (e.g. after an error) is rolled back first, and a broken
+    connection is discarded.
+    """
+    global _pool_in_use, _pool_waits
+
+    if not _pool_slots.acquire(blocking=False):
+        with _pool_lock:
+            _pool_waits += 1
+        if not _pool_slots.acquire(timeout=DB_POOL_TIMEOUT):
+            raise PoolError(f'No database connection available within {DB_POOL_TIMEOUT}s')
+
+    pool = None
+    conn = None
+    try:
+        pool = get_pool()
+        conn = pool.getconn()
+        # Replace dead connections (e.g. after a database restart)
+        for _ in range(DB_POOL_MAX):
+            if _is_healthy(conn):
+                break
+            _last_used.pop(id(conn), None)
+            pool.putconn(conn, close=True)
+            conn = pool.getconn()
+        else:
+            raise psycopg2.OperationalError('No healthy database connection available')
+
+        with _pool_lock:
+            _pool_in_use += 1
+    except Exception:
+        if conn is not None:
+            pool.putconn(conn, close=True)
+        _pool_slots.release()
+        raise
+
+    try:
+        yield conn
+    finally:
+        broken = bool(conn.closed)
+        if not broken:
+            try:
+                if conn.get_transaction_status() != TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except psycopg2.Error:
+                broken = True
+
+        if broken:
+            _last_used.pop(id(conn), None)
+        else:
+            _last_used[id(conn)] = time.monotonic()
+        pool.putconn(conn, close=broken)
+
+        with _pool_lock:
+            _pool_in_use -= 1
+        _pool_slots.release()
+
+def pool_stats():
+    """Connection pool usage for /api/health"""
+    with _pool_lock:
+        in_use = _pool_in_use
+        waits = _pool_waits
+    return {
+        'min': DB_POOL_MIN,
+        'max': DB_POOL_MAX,
+        'in_use': in_use,
+        'saturation': round(in_use / DB_POOL_MAX, 2),
+        'waits': waits
+    }
+
+_response_cache = OrderedDict()  # (endpoint, params) -> (data_version, body, mimetype)
+_response_cache_lock = threading.Lock()
+
+def get_data_version():
+    """
+    Get (data_version, last_sync_timestamp) from sync_metadata.
+
+    data_version is bumped by every sync write, so it identifies the state of
+    the data across all worker processes.
+    """
+    with db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("""
+            SELECT data_version, last_sync_timestamp
+            FROM sync_metadata
+            WHERE id = 1
+        """)
+        row = cur.fetchone()
+        cur.close()
+
+    if not row:
+        return 0, None
+    return row[0], row[1]
+
+def normalized_params():
+    """Query parameters as a hashable key (order-insensitive, lists sorted)"""
+    params = []
+    for key in sorted(request.args):
+        values = []
+        for value in request.args.getlist(key):
+            values.extend(part.strip() for part in value.split(',') if part.strip())
+        params.append((key, ','.join(sorted(set(values)))))
+    return tuple(params)
+
+def cached_response(view):
+    """
+    Cache a GET endpoint's successful responses until the data changes.
+
+    Entries are keyed by endpoint and normalized query parameters, and are
+    valid for one data_version. Responses carry ETag and Last-Modified, and
+    conditional requests that still match get 304 Not Modified.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            data_version, last_modified = get_data_version()
+        except Exception:
+            # Let the endpoint report the database error
+            return view(*args, **kwargs)
+
+        key = (request.endpoint, normalized_params())
+        key_digest = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()[:16]
+        etag = f'{data_version}-{key_digest}'
+
+        with _response_cache_lock:
+            entry = _response_cache.get(key)
+            hit = entry is not None and entry[0] == data_version
+            if hit:
+                _response_cache.move_to_end(key)
+
+        if not hit:
+            result = view(*args, **kwargs)
+            response = make_response(result)
+            if response.status_code != 200:
+                return response
+
+            entry = (data_version, response.get_data(), response.mimetype)
+            with _response_cache_lock:
+                _response_cache[key] = entry
+                _response_cache.move_to_end(key)
+                while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                    _response_cache.popitem(last=False)
+
+        response = make_response(entry[1])
+        response.mimetype = entry[2]
+        response.set_etag(etag)
+        if last_modified is not None:
+            response.last_modified = last_modified
+        # Let browsers keep the response but revalidate it every time
+        response.cache_control.no_cache = True
+        response.headers['X-Cache'] = 'hit' if hit else 'miss'
+
+        return response.make_conditional(request)
+
+    return wrapper
 
 def check_auth():
     """Verify the API token"""
@@ -44,15 +267,245 @@ def check_auth():
 
     return parts[1] == API_TOKEN
 
+# daily_category_minutes.minutes is an INTEGER column: whole minutes below 2**31,
+# the same rule the day cache applies to its int32 category column
+def valid_category_minutes(minutes):
+    return type(minutes) is int and 0 <= minutes < 2 ** 31
+
+def validate_daily_payload(data):
+    """Check a daily sync payload, returning an error message or None"""
+    if not isinstance(data, dict):
+        return 'Expected a JSON object'
+
+    if 'date' not in data:
+        return 'Missing required field: date'
+
+    if 'day_of_week' not in data:
+        return 'Missing required field: day_of_week'
+
+    # Each value becomes a daily_category_minutes row
+    category_minutes = data.get('category_minutes')
+    if category_minutes is not None:
+        if not isinstance(category_minutes, dict):
+            return 'category_minutes must be an object'
+        for category, minutes in category_minutes.items():
+            if not valid_category_minutes(minutes):
+                return f'category_minutes[{category!r}] must be a whole number of minutes'
+
+    return None
+
+# Rows of history a rolling metric at one date depends on: the 15-row average of
+# 7-row alcohol sums reaches back 14 + 6 rows (the 7-row averages need fewer)
+ROLLING_METRICS_LOOKBACK = 20
+
+def refresh_rolling_metrics(cur, since=None):
+    """
+    Recompute daily_rolling_metrics from `since` (a date) onward, or for
+    every date if since is None.
+
+    The windows are over rows, so a day written at `since` only changes the
+    metrics of rows after it; the ROLLING_METRICS_LOOKBACK rows before it are
+    read as window input but not rewritten.
+    """
+    cur.execute("""
+        WITH window_input AS (
+            SELECT date, alc, dep_avg, sleep_score
+            FROM daily_summary
+            WHERE %(since)s::date IS NULL
+               OR date >= COALESCE((
+                    SELECT date FROM daily_summary
+                    WHERE date < %(since)s::date
+                    ORDER BY date DESC
+                    OFFSET %(lookback)s - 1 LIMIT 1
+                  ), '-infinity'::date)
+        ),
+        rolling_7day AS (
+            -- Depression and sleep stay null when missing (don't coalesce to 0)
+            SELECT
+                date,
+                dep_avg,
+                sleep_score,
+                SUM(COALESCE(alc, 0)) OVER last_7_rows AS alc_7day_sum,
+                AVG(dep_avg) OVER last_7_rows AS dep_7day_avg,
+                AVG(sleep_score) OVER last_7_rows AS sleep_7day_avg
+            FROM window_input
+            WINDOW last_7_rows AS (ORDER BY date ROWS BETWEEN 6 PRECEDING AND CURRENT ROW)
+        ),
+        rolling_15day AS (
+            SELECT
+                *,
+                AVG(alc_7day_sum) OVER (
+                    ORDER BY date
+                    ROWS BETWEEN 14 PRECEDING AND CURRENT ROW
+                ) AS alc_15day_avg
+            FROM rolling_7day
+        )
+        INSERT INTO daily_rolling_metrics (
+            date, alc_7day_sum, alc_15day_avg, dep_raw, dep_7day_avg, sleep_raw, sleep_7day_avg
+        )
+        SELECT date, alc_7day_sum, alc_15day_avg, dep_avg, dep_7day_avg, sleep_score, sleep_7day_avg
+        FROM rolling_15day
+        WHERE %(since)s::date IS NULL OR date >= %(since)s::date
+        ON CONFLICT (date) DO UPDATE SET
+            alc_7day_sum = EXCLUDED.alc_7day_sum,
+            alc_15day_avg = EXCLUDED.alc_15day_avg,
+            dep_raw = EXCLUDED.dep_raw,
+            dep_7day_avg = EXCLUDED.dep_7day_avg,
+            sleep_raw = EXCLUDED.sleep_raw,
+            sleep_7day_avg = EXCLUDED.sleep_7day_avg
+    """, {'since': since, 'lookback': ROLLING_METRICS_LOOKBACK})
+
+def upsert_daily_summaries(cur, days):
+    """
+    Upsert daily payloads into daily_summary with a single multi-row
+    INSERT ... ON CONFLICT, then bump sync_metadata. Each row keeps the
+    payload's hash (payload_digest) for /api/sync/hashes.
+
+    Returns the list of dates written (a date given twice keeps the last entry).
+    """
+    # ON CONFLICT can't update the same row twice in one statement
+    by_date = {}
+    for day in days:
+        by_date[day['date']] = day
+
+    rows = [
+        {
+            'date': day['date'],
+            'day_of_week': day['day_of_week'],
+            'category_minutes': Json(day.get('category_minutes', {})),
+            'sleep_score': day.get('sleep_score'),
+            'sleep_hours': day.get('sleep_hours'),
+            'dep_min': day.get('dep_min'),
+            'dep_max': day.get('dep_max'),
+            'dep_avg': day.get('dep_avg'),
+            'dist': day.get('dist'),
+            'soc': day.get('soc'),
+            'out': day.get('out'),
+            'exe': day.get('exe'),
+            'alc': day.get('alc'),
+            'xmx': day.get('xmx'),
+            'wea': day.get('wea'),
+            'meet': day.get('meet'),
+            'abi': day.get('abi'),
+            'save': day.get('save'),
+            'content_hash': payload_digest(day)
+        }
+        for day in by_date.values()
+    ]
+
+    # Upsert (INSERT ... ON CONFLICT UPDATE) to replace existing data
+    execute_values(cur, """
+        INSERT INTO daily_summary (
+            date, day_of_week, category_minutes,
+            sleep_score, sleep_hours,
+            dep_min, dep_max, dep_avg,
+            dist, soc, out, exe, alc, xmx, wea, meet,
+            abi, save, content_hash,
+            created_at, updated_at
+        ) VALUES %s
+        ON CONFLICT (date) DO UPDATE SET
+            day_of_week = EXCLUDED.day_of_week,
+            category_minutes = EXCLUDED.category_minutes,
+            sleep_score = EXCLUDED.sleep_score,
+            sleep_hours = EXCLUDED.sleep_hours,
+            dep_min = EXCLUDED.dep_min,
+            dep_max = EXCLUDED.dep_max,
+            dep_avg = EXCLUDED.dep_avg,
+            dist = EXCLUDED.dist,
+            soc = EXCLUDED.soc,
+            out = EXCLUDED.out,
+            exe = EXCLUDED.exe,
+            alc = EXCLUDED.alc,
+            xmx = EXCLUDED.xmx,
+            wea = EXCLUDED.wea,
+            meet = EXCLUDED.meet,
+            abi = EXCLUDED.abi,
+            save = EXCLUDED.save,
+            content_hash = EXCLUDED.content_hash,
+            updated_at = NOW()
+    """, rows, template="""(
+            %(date)s, %(day_of_week)s, %(category_minutes)s,
+            %(sleep_score)s, %(sleep_hours)s,
+            %(dep_min)s, %(dep_max)s, %(dep_avg)s,
+            %(dist)s, %(soc)s, %(out)s, %(exe)s, %(alc)s, %(xmx)s, %(wea)s, %(meet)s,
+            %(abi)s, %(save)s, %(content_hash)s,
+            NOW(), NOW()
+        )""", page_size=len(rows))
+
+    # Mirror category_minutes into the normalized daily_category_minutes table
+    dates = list(by_date)
+    cur.execute("""
+        DELETE FROM daily_category_minutes
+        WHERE date = ANY(%(dates)s::date[])
+    """, {'dates': dates})
+
+    category_rows = [
+        (date, category, minutes)
+        for date, day in by_date.items()
+        for category, minutes in (day.get('category_minutes') or {}).items()
+        if valid_category_minutes(minutes)
+    ]
+    if category_rows:
+        execute_values(cur, """
+            INSERT INTO daily_category_minutes (date, category, minutes)
+            VALUES %s
+        """, category_rows, page_size=len(category_rows))
+
+    # Rolling metrics from the earliest written date onward
+    refresh_rolling_metrics(cur, since=min(dates))
+
+    bump_sync_metadata(cur, len(rows))
+
+    return dates
+
+def bump_sync_metadata(cur, count):
+    """
+    Record a sync of `count` days: update sync_metadata with the current
+    timestamp and bump the data version (invalidates cached analytics
+    responses in every worker).
+    """
+    cur.execute("""
+        UPDATE sync_metadata
+        SET last_sync_timestamp = NOW(),
+            last_sync_file_count = last_sync_file_count + %(count)s,
+            data_version = data_version + 1
+        WHERE id = 1
+    """, {'count': count})
+
+def category_minute_columns(cur, days):
+    """
+    Minutes per category, as one int64 array per category aligned with
+    `days` (sorted daily_summary dates, as days since 1970-01-01); 0 where
+    a day has no minutes in the category.
+    """
+    cur.execute("""
+        SELECT category, ARRAY_AGG(date - DATE '1970-01-01'), ARRAY_AGG(minutes)
+        FROM daily_category_minutes
+        GROUP BY category
+    """)
+    columns = {}
+    for category, category_days, minutes in cur.fetchall():
+        category_days = np.array(category_days, dtype=np.int64)
+        index = np.searchsorted(days, category_days)
+        # Only days present in daily_summary count
+        found = index < len(days)
+        found[found] = days[index[found]] == category_days[found]
+        column = np.zeros(len(days), dtype=np.int64)
+        column[index[found]] = np.array(minutes, dtype=np.int64)[found]
+        columns[category] = column
+    return columns
+
 @app.route('/api/health', methods=['GET'])
 def health():
     """Health check endpoint (no auth required)"""
     try:
-        conn = get_db_connection()
-        conn.close()
-        return jsonify({'status': 'healthy', 'database': 'connected'}), 200
+        with db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.close()
+        return jsonify({'status': 'healthy', 'database': 'connected', 'pool': pool_stats()}), 200
     except Exception as e:
-        return jsonify({'status': 'unhealthy', 'error': str(e)}), 500
+        return jsonify({'status': 'unhealthy', 'error': str(e), 'pool': pool_stats()}), 500
 
 @app.route('/api/sync/daily', methods=['POST'])
 def sync_daily():
@@ -88,84 +541,18 @@ def sync_daily():
         return jsonify({'error': 'Invalid JSON'}), 400
 
     # Validate required fields
-    if 'date' not in data:
-        return jsonify({'error': 'Missing required field: date'}), 400
-
-    if 'day_of_week' not in data:
-        return jsonify({'error': 'Missing required field: day_of_week'}), 400
+    error = validate_daily_payload(data)
+    if error:
+        return jsonify({'error': error}), 400
 
     try:
-        # Upsert (INSERT ... ON CONFLICT UPDATE) to replace existing data
-        conn = get_db_connection()
-        cur = conn.cursor()
+        with db_connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            INSERT INTO daily_summary (
-                date, day_of_week, category_minutes,
-                sleep_score, sleep_hours,
-                dep_min, dep_max, dep_avg,
-                dist, soc, out, exe, alc, xmx, wea, meet,
-                abi, save,
-                created_at, updated_at
-            ) VALUES (
-                %(date)s, %(day_of_week)s, %(category_minutes)s,
-                %(sleep_score)s, %(sleep_hours)s,
-                %(dep_min)s, %(dep_max)s, %(dep_avg)s,
-                %(dist)s, %(soc)s, %(out)s, %(exe)s, %(alc)s, %(xmx)s, %(wea)s, %(meet)s,
-                %(abi)s, %(save)s,
-                NOW(), NOW()
-            )
-            ON CONFLICT (date) DO UPDATE SET
-                day_of_week = EXCLUDED.day_of_week,
-                category_minutes = EXCLUDED.category_minutes,
-                sleep_score = EXCLUDED.sleep_score,
-                sleep_hours = EXCLUDED.sleep_hours,
-                dep_min = EXCLUDED.dep_min,
-                dep_max = EXCLUDED.dep_max,
-                dep_avg = EXCLUDED.dep_avg,
-                dist = EXCLUDED.dist,
-                soc = EXCLUDED.soc,
-                out = EXCLUDED.out,
-                exe = EXCLUDED.exe,
-                alc = EXCLUDED.alc,
-                xmx = EXCLUDED.xmx,
-                wea = EXCLUDED.wea,
-                meet = EXCLUDED.meet,
-                abi = EXCLUDED.abi,
-                save = EXCLUDED.save,
-                updated_at = NOW()
-        """, {
-            'date': data['date'],
-            'day_of_week': data['day_of_week'],
-            'category_minutes': Json(data.get('category_minutes', {})),
-            'sleep_score': data.get('sleep_score'),
-            'sleep_hours': data.get('sleep_hours'),
-            'dep_min': data.get('dep_min'),
-            'dep_max': data.get('dep_max'),
-            'dep_avg': data.get('dep_avg'),
-            'dist': data.get('dist'),
-            'soc': data.get('soc'),
-            'out': data.get('out'),
-            'exe': data.get('exe'),
-            'alc': data.get('alc'),
-            'xmx': data.get('xmx'),
-            'wea': data.get('wea'),
-            'meet': data.get('meet'),
-            'abi': data.get('abi'),
-            'save': data.get('save')
-        })
-
-        # Update sync metadata with current timestamp
-        cur.execute("""
-            UPDATE sync_metadata
-            SET last_sync_timestamp = NOW(),
-                last_sync_file_count = last_sync_file_count + 1
-            WHERE id = 1
-        """)
+            upsert_daily_summaries(cur, [data])
 
-        conn.commit()
-        cur.close()
-        conn.close()
+            conn.commit()
+            cur.close()
 
         return jsonify({
             'status': 'success',
@@ -176,6 +563,116 @@ def sync_daily():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/sync/batch', methods=['POST'])
+def sync_batch():
+    """
+    Sync several days in one transaction.
+
+    Request body:
+    {
+        "days": [
+            {"date": "2025-01-17", "day_of_week": "F", ...},
+            {"date": "2025-01-18", "day_of_week": "S", ...}
+        ]
+    }
+
+    Each entry has the same shape as the /api/sync/daily body. If a date
+    appears more than once, the last entry wins. Either every day is written
+    or none is.
+    """
+    # Check authentication
+    if not check_auth():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    # Parse request body
+    data = request.get_json()
+    if not data or not isinstance(data.get('days'), list):
+        return jsonify({'error': 'Invalid JSON: expected {"days": [...]}'}), 400
+
+    days = data['days']
+    if not days:
+        return jsonify({'error': 'No days to sync'}), 400
+
+    if len(days) > MAX_BATCH_SIZE:
+        return jsonify({'error': f'Too many days in batch (max {MAX_BATCH_SIZE})'}), 413
+
+    # Validate every entry before writing anything
+    for i, day in enumerate(days):
+        error = validate_daily_payload(day)
+        if error:
+            return jsonify({'error': f'days[{i}]: {error}'}), 400
+
+    try:
+        with db_connection() as conn:
+            cur = conn.cursor()
+
+            dates = upsert_daily_summaries(cur, days)
+
+            conn.commit()
+            cur.close()
+
+        return jsonify({
+            'status': 'success',
+            'count': len(dates),
+            'dates': dates,
+            'message': 'Data synced successfully'
+        }), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/sync/hashes', methods=['GET'])
+def sync_hashes():
+    """
+    Get the payload hash of every synced day, optionally within a date range.
+
+    Query parameters:
+    - start: first date (YYYY-MM-DD, inclusive; default: earliest)
+    - end: last date (YYYY-MM-DD, inclusive; default: latest)
+
+    Response:
+    {
+        "hashes": {"2025-01-17": "9f2c...", "2025-01-18": "41d0..."}
+    }
+
+    Hashes are payload_digest() of the payload each day was last synced
+    with; the client uploads only the days whose payload hashes differently.
+    Days written before hashes were stored are left out (and so resynced).
+    """
+    # Check authentication
+    if not check_auth():
+        return jsonify({'error': 'Unauthorized'}), 401
+
+    try:
+        start = request.args.get('start')
+        end = request.args.get('end')
+        if start:
+            start = datetime.strptime(start, '%Y-%m-%d').date()
+        if end:
+            end = datetime.strptime(end, '%Y-%m-%d').date()
+    except ValueError:
+        return jsonify({'error': 'Invalid date: expected YYYY-MM-DD'}), 400
+
+    try:
+        with db_connection() as conn:
+            cur = conn.cursor()
+
+            cur.execute("""
+                SELECT date, content_hash
+                FROM daily_summary
+                WHERE content_hash IS NOT NULL
+                  AND (%(start)s::date IS NULL OR date >= %(start)s::date)
+                  AND (%(end)s::date IS NULL OR date <= %(end)s::date)
+            """, {'start': start, 'end': end})
+
+            hashes = {row[0].isoformat(): row[1] for row in cur.fetchall()}
+            cur.close()
+
+        return jsonify({'hashes': hashes}), 200
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/status/last-sync', methods=['GET'])
 def last_sync():
     """Get the last sync timestamp from sync_metadata table"""
@@ -184,18 +681,17 @@ def last_sync():
         return jsonify({'error': 'Unauthorized'}), 401
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        with db_connection() as conn:
+            cur = conn.cursor()
 
-        cur.execute("""
-            SELECT last_sync_timestamp, last_sync_file_count
-            FROM sync_metadata
-            WHERE id = 1
-        """)
+            cur.execute("""
+                SELECT last_sync_timestamp, last_sync_file_count
+                FROM sync_metadata
+                WHERE id = 1
+            """)
 
-        row = cur.fetchone()
-        cur.close()
-        conn.close()
+            row = cur.fetchone()
+            cur.close()
 
         if row:
             return jsonify({
@@ -212,6 +708,7 @@ def last_sync():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/category-rolling-sum', methods=['GET'])
+@cached_response
 def category_rolling_sum():
     """
     Get rolling sum of category minutes with exponential weighting for multiple groups.
@@ -251,170 +748,43 @@ def category_rolling_sum():
         return jsonify({'error': 'days and limit must be positive integers'}), 400
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        with db_connection() as conn:
+            cur = conn.cursor()
 
-        # Build SQL query with window functions for hobby, work, and other
-        cur.execute("""
-            WITH category_breakdowns AS (
-                -- Split category minutes into hobby, work, and other
-                SELECT
-                    date,
-                    COALESCE(
-                        (
-                            SELECT SUM((value)::int)
-                            FROM jsonb_each_text(category_minutes)
-                            WHERE key = ANY(%(hobby_categories)s)
-                        ),
-                        0
-                    ) AS hobby_minutes,
-                    COALESCE(
-                        (
-                            SELECT SUM((value)::int)
-                            FROM jsonb_each_text(category_minutes)
-                            WHERE key = ANY(%(work_categories)s)
-                        ),
-                        0
-                    ) + COALESCE(meet, 0) AS work_minutes,
-                    COALESCE(
-                        (
-                            SELECT SUM((value)::int)
-                            FROM jsonb_each_text(category_minutes)
-                            WHERE key != ALL(%(all_specified)s)
-                        ),
-                        0
-                    ) AS other_minutes,
-                    COALESCE(
-                        (
-                            SELECT SUM((value)::int)
-                            FROM jsonb_each_text(category_minutes)
-                        ),
-                        0
-                    ) + COALESCE(meet, 0) AS total_minutes
+            cur.execute("""
+                SELECT date - DATE '1970-01-01', COALESCE(meet, 0)
                 FROM daily_summary
                 ORDER BY date
-            ),
-            weekdays_only AS (
-                -- Filter to weekdays only for work calculation
-                SELECT
-                    date,
-                    work_minutes,
-                    ROW_NUMBER() OVER (ORDER BY date DESC) as recency_rank
-                FROM category_breakdowns
-                WHERE EXTRACT(DOW FROM date) BETWEEN 1 AND 5  -- Monday to Friday
-            ),
-            rolling_calcs AS (
-                -- Calculate raw sums using window functions
-                SELECT
-                    cb.date,
-                    cb.hobby_minutes,
-                    cb.work_minutes,
-                    cb.other_minutes,
-                    cb.total_minutes,
-                    EXTRACT(DOW FROM cb.date) AS day_of_week,
-                    SUM(cb.hobby_minutes) OVER (
-                        ORDER BY cb.date
-                        ROWS BETWEEN %(window_days)s - 1 PRECEDING AND CURRENT ROW
-                    ) AS hobby_raw,
-                    -- Work: sum over last 5 weekdays only (subquery with explicit columns)
-                    (
-                        SELECT COALESCE(SUM(work_minutes), 0)
-                        FROM (
-                            SELECT work_minutes
-                            FROM weekdays_only
-                            WHERE date <= cb.date
-                            ORDER BY date DESC
-                            LIMIT 5
-                        ) AS last_5_weekdays
-                    ) AS work_raw,
-                    SUM(cb.other_minutes) OVER (
-                        ORDER BY cb.date
-                        ROWS BETWEEN %(window_days)s - 1 PRECEDING AND CURRENT ROW
-                    ) AS other_raw,
-                    SUM(cb.total_minutes) OVER (
-                        ORDER BY cb.date
-                        ROWS BETWEEN %(window_days)s - 1 PRECEDING AND CURRENT ROW
-                    ) AS total_raw
-                FROM category_breakdowns cb
-            )
-            SELECT
-                date,
-                hobby_raw,
-                ROUND(
-                    (
-                        -- Calculate weighted sum for hobby categories
-                        SELECT
-                            SUM(cb.hobby_minutes * EXP(-%(decay_lambda)s * (rc.date - cb.date))) *
-                            (%(window_days)s::float / SUM(EXP(-%(decay_lambda)s * (rc.date - cb.date))))
-                        FROM category_breakdowns cb
-                        WHERE cb.date <= rc.date
-                          AND cb.date > rc.date - INTERVAL '1 day' * %(window_days)s
-                    )::numeric,
-                    1
-                ) AS hobby_weighted,
-                work_raw,
-                ROUND(
-                    COALESCE(
-                        (
-                            -- Calculate weighted sum for work categories (weekdays only, last 5)
-                            SELECT
-                                SUM(work_minutes * EXP(-%(decay_lambda)s * (rc.date - date))) *
-                                (5.0 / NULLIF(SUM(EXP(-%(decay_lambda)s * (rc.date - date))), 0))
-                            FROM (
-                                SELECT date, work_minutes
-                                FROM weekdays_only
-                                WHERE date <= rc.date
-                                ORDER BY date DESC
-                                LIMIT 5
-                            ) AS last_5_weekdays_weighted
-                        ),
-                        0
-                    )::numeric,
-                    1
-                ) AS work_weighted,
-                other_raw,
-                total_raw
-            FROM rolling_calcs rc
-            ORDER BY date DESC
-            LIMIT %(limit)s
-        """, {
-            'hobby_categories': hobby_categories,
-            'work_categories': work_categories,
-            'all_specified': all_specified,
-            'window_days': window_days,
-            'limit': limit,
-            'decay_lambda': decay_lambda
-        })
-
-        rows = cur.fetchall()
-
-        # Get list of all categories and split into hobby/work/other
-        cur = conn.cursor()
-        cur.execute("""
-            SELECT DISTINCT jsonb_object_keys(category_minutes) as category
-            FROM daily_summary
-            ORDER BY category
-        """)
-        all_categories = [row[0] for row in cur.fetchall()]
+            """)
+            summary = cur.fetchall()
+            days = np.array([row[0] for row in summary], dtype=np.int64)
+            meet = np.array([row[1] for row in summary], dtype=np.int64)
+            minutes = category_minute_columns(cur, days)
+            cur.close()
+
+        sums = category_rolling_sums(
+            days.astype('datetime64[D]'), minutes, meet,
+            hobby=hobby_categories,
+            work=work_categories,
+            window_days=window_days,
+            decay_lambda=decay_lambda,
+            limit=limit,
+        )
+
+        # Split the list of all categories into hobby/work/other
+        all_categories = sorted(minutes)
         hobby_cats = [cat for cat in all_categories if cat in hobby_categories]
         work_cats = [cat for cat in all_categories if cat in work_categories]
         other_cats = [cat for cat in all_categories if cat not in all_specified]
 
-        cur.close()
-        conn.close()
-
         # Format response
+        columns = {name: sums[name].tolist() for name in ROLLING_SUM_SERIES}
         data = [
             {
-                'date': row[0].isoformat(),
-                'hobby_raw': int(row[1]) if row[1] is not None else 0,
-                'hobby_weighted': float(row[2]) if row[2] is not None else 0.0,
-                'work_raw': int(row[3]) if row[3] is not None else 0,
-                'work_weighted': float(row[4]) if row[4] is not None else 0.0,
-                'other_raw': int(row[5]) if row[5] is not None else 0,
-                'total_raw': int(row[6]) if row[6] is not None else 0
+                'date': day.isoformat(),
+                **{name: values[i] for name, values in columns.items()}
             }
-            for row in reversed(rows)  # Reverse to get chronological order
+            for i, day in enumerate(sums['date'].tolist())  # Chronological order
         ]
 
         return jsonify({
@@ -430,6 +800,7 @@ def category_rolling_sum():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/alcohol-depression', methods=['GET'])
+@cached_response
 def alcohol_depression():
     """
     Get 7-day and 15-day rolling sum for alcohol, and raw/7-day average for depression.
@@ -450,59 +821,26 @@ def alcohol_depression():
         return jsonify({'error': 'limit must be a positive integer'}), 400
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        with db_connection() as conn:
+            cur = conn.cursor()
 
-        # Build SQL query with window functions
-        cur.execute("""
-            WITH rolling_7day AS (
-                -- Calculate 7-day rolling sum for alcohol and 7-day average for depression
-                -- Keep depression as null when missing (don't coalesce to 0)
-                SELECT
-                    date,
-                    COALESCE(alc, 0) AS alc_value,
-                    dep_avg AS dep_raw,
-                    SUM(COALESCE(alc, 0)) OVER (
-                        ORDER BY date
-                        ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
-                    ) AS alc_7day_sum,
-                    AVG(dep_avg) OVER (
-                        ORDER BY date
-                        ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
-                    ) AS dep_7day_avg
-                FROM daily_summary
-                ORDER BY date
-            ),
-            rolling_15day AS (
-                -- Calculate 15-day moving average for alcohol
+            # Read the series precomputed at sync time (see refresh_rolling_metrics)
+            cur.execute("""
                 SELECT
                     date,
-                    alc_value,
-                    dep_raw,
                     alc_7day_sum,
-                    dep_7day_avg,
-                    AVG(alc_7day_sum) OVER (
-                        ORDER BY date
-                        ROWS BETWEEN 14 PRECEDING AND CURRENT ROW
-                    ) AS alc_15day_avg
-                FROM rolling_7day
-            )
-            SELECT
-                date,
-                alc_7day_sum,
-                alc_15day_avg,
-                dep_raw,
-                dep_7day_avg
-            FROM rolling_15day
-            ORDER BY date DESC
-            LIMIT %(limit)s
-        """, {
-            'limit': limit
-        })
-
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+                    alc_15day_avg,
+                    dep_raw,
+                    dep_7day_avg
+                FROM daily_rolling_metrics
+                ORDER BY date DESC
+                LIMIT %(limit)s
+            """, {
+                'limit': limit
+            })
+
+            rows = cur.fetchall()
+            cur.close()
 
         # Format response (keep depression as null when missing)
         data = [
@@ -524,6 +862,7 @@ def alcohol_depression():
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/sleep-score', methods=['GET'])
+@cached_response
 def sleep_score():
     """
     Get raw (1-day) and 7-day average of sleep score.
@@ -544,37 +883,24 @@ def sleep_score():
         return jsonify({'error': 'limit must be a positive integer'}), 400
 
     try:
-        conn = get_db_connection()
-        cur = conn.cursor()
+        with db_connection() as conn:
+            cur = conn.cursor()
 
-        # Build SQL query with window functions
-        cur.execute("""
-            WITH rolling_7day AS (
-                -- Calculate 7-day average (null sleep_score means no data, not 0)
+            # Read the series precomputed at sync time (see refresh_rolling_metrics)
+            cur.execute("""
                 SELECT
                     date,
-                    sleep_score AS sleep_raw,
-                    AVG(sleep_score) OVER (
-                        ORDER BY date
-                        ROWS BETWEEN 6 PRECEDING AND CURRENT ROW
-                    ) AS sleep_7day_avg
-                FROM daily_summary
-                ORDER BY date
-            )
-            SELECT
-                date,
-                sleep_raw,
-                sleep_7day_avg
-            FROM rolling_7day
-            ORDER BY date DESC
-            LIMIT %(limit)s
-        """, {
-            'limit': limit
-        })
-
-        rows = cur.fetchall()
-        cur.close()
-        conn.close()
+                    sleep_raw,
+                    sleep_7day_avg
+                FROM daily_rolling_metrics
+                ORDER BY date DESC
+                LIMIT %(limit)s
+            """, {
+                'limit': limit
+            })
+
+            rows = cur.fetchall()
+            cur.close()
 
         # Format response (keep null as null so frontend can skip missing data)
         data = [
@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Bulk import of .sxiva history into the dashboard database.
+
+Rebuilding the database (new container, schema migration) through the sync
+API replays every file as parse -> HTTP -> upsert. This admin tool instead
+runs next to Postgres: it extracts every dated file in the data directory
+in parallel (through the data directory's day cache, so files unchanged
+since the last sync or `sxiva stats` aren't parsed again), streams the rows
+into a staging table with COPY, and merges them into daily_summary in one
+statement. daily_category_minutes, daily_rolling_metrics and sync_metadata
+are then brought up to date as a sync would, all in one transaction.
+
+Usage:
+    # Uses the same DB_* environment variables as app.py
+    DB_HOST=localhost DB_PASSWORD=... python3 dashboard/server/import_history.py ~/src/minutes/data
+
+    # Drop every day first (e.g. after a migration that rewrote the tables)
+    DB_HOST=localhost DB_PASSWORD=... python3 dashboard/server/import_history.py ~/src/minutes/data --replace
+"""
+
+import argparse
+import csv
+import io
+import json
+import sys
+import time
+from pathlib import Path
+
+import app as dashboard
+from sxiva.day_cache import ATTRIBUTE_COLUMNS, DayCache, day_files
+from sxiva.manifest import file_digest, payload_digest
+from sxiva.parser_extractor import SxivaDataExtractor
+
+# daily_summary columns loaded from the payloads
+COLUMNS = ['date', 'day_of_week', 'category_minutes', *ATTRIBUTE_COLUMNS, 'content_hash']
+
+
+class RowStream:
+    """
+    File-like object that COPY reads CSV from, formatting the days as it is
+    read so the rows are never all in memory as text.
+    """
+
+    def __init__(self, days):
+        self._days = iter(days)
+        self._buffer = ''
+        self._out = io.StringIO()
+        self._writer = csv.writer(self._out, lineterminator='\n')
+
+    def _line(self, day):
+        self._out.seek(0)
+        self._out.truncate()
+        self._writer.writerow(
+            [day['date'], day['day_of_week'], json.dumps(day.get('category_minutes') or {})]
+            + [day.get(column) for column in ATTRIBUTE_COLUMNS]
+            + [payload_digest(day)]
+        )
+        return self._out.getvalue()
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            day = next(self._days, None)
+            if day is None:
+                break
+            self._buffer += self._line(day)
+        if size < 0:
+            size = len(self._buffer)
+        chunk, self._buffer = self._buffer[:size], self._buffer[size:]
+        return chunk
+
+
+def import_days(cur, days, replace=False):
+    """
+    Load day payloads into daily_summary and its derived tables.
+
+    The days are copied into a temporary staging table and merged with one
+    INSERT ... ON CONFLICT; if a date is given twice, the last entry wins,
+    as in /api/sync/batch.
+
+    Args:
+        cur: Cursor of a transaction the caller commits
+        days: Iterable of sync payloads
+        replace: If True, drop every existing day first
+
+    Returns:
+        int: Number of dates written
+    """
+    cur.execute("""
+        CREATE TEMP TABLE daily_summary_staging
+        (LIKE daily_summary INCLUDING DEFAULTS)
+        ON COMMIT DROP
+    """)
+    cur.execute("ALTER TABLE daily_summary_staging ADD COLUMN seq BIGSERIAL")
+
+    cur.copy_expert(f"""
+        COPY daily_summary_staging ({', '.join(COLUMNS)})
+        FROM STDIN WITH (FORMAT csv)
+    """, RowStream(days))
+
+    if replace:
+        cur.execute("TRUNCATE daily_summary, daily_category_minutes, daily_rolling_metrics")
+
+    updates = ',\n            '.join(f'{column} = EXCLUDED.{column}' for column in COLUMNS[1:])
+    cur.execute(f"""
+        INSERT INTO daily_summary ({', '.join(COLUMNS)}, created_at, updated_at)
+        SELECT DISTINCT ON (date) {', '.join(COLUMNS)}, NOW(), NOW()
+        FROM daily_summary_staging
+        ORDER BY date, seq DESC
+        ON CONFLICT (date) DO UPDATE SET
+            {updates},
+            updated_at = NOW()
+        RETURNING date
+    """)
+    dates = [row[0] for row in cur.fetchall()]
+    if not dates:
+        return 0
+
+    # Mirror category_minutes into daily_category_minutes, as upserts do
+    cur.execute("""
+        DELETE FROM daily_category_minutes
+        WHERE date = ANY(%(dates)s::date[])
+    """, {'dates': dates})
+    # Only whole minutes below 2**31, as dashboard.valid_category_minutes()
+    # (the upsert skips the rest, and load_payloads() drops such days anyway)
+    cur.execute("""
+        INSERT INTO daily_category_minutes (date, category, minutes)
+        SELECT ds.date, cm.key, (cm.value #>> '{}')::int
+        FROM daily_summary ds, jsonb_each(ds.category_minutes) AS cm
+        WHERE ds.date = ANY(%(dates)s::date[])
+          AND jsonb_typeof(cm.value) = 'number'
+          AND CASE WHEN (cm.value #>> '{}') ~ '^[0-9]{1,10}$'
+                   THEN (cm.value #>> '{}')::bigint < 2147483648
+                   ELSE false END
+    """, {'dates': dates})
+
+    dashboard.refresh_rolling_metrics(cur, since=None if replace else min(dates))
+    dashboard.bump_sync_metadata(cur, len(dates))
+
+    return len(dates)
+
+
+def load_payloads(data_dir, jobs=None):
+    """
+    Payloads of the dated files in data_dir, in date order. Only files the
+    day cache doesn't have for their content are parsed, with `jobs` worker
+    processes. Days the sync API would reject are left out.
+
+    Returns:
+        (payloads, files parsed, files that couldn't be extracted or were rejected)
+    """
+    extractor = SxivaDataExtractor()
+    files = day_files(data_dir)
+
+    cache = DayCache.load(data_dir)
+    cache.retain(p.name for p in files)
+    parsed = cache.update(files, jobs=jobs)
+    cache.save()
+
+    payloads = []
+    failed = 0
+    for file_path in files:
+        data = cache.get(file_path.name, file_digest(file_path))
+        if data is None:
+            # Payloads the cache can't hold (or failed extractions) aren't cached
+            data = extractor.extract_from_file(file_path)
+        error = 'could not extract' if data is None else dashboard.validate_daily_payload(data)
+        if error:
+            print(f"Warning: skipping {file_path.name}: {error}", file=sys.stderr)
+            failed += 1
+        else:
+            payloads.append(data)
+    return payloads, parsed, failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Bulk import .sxiva files into the dashboard database')
+    parser.add_argument('data_dir', type=Path, help='Directory of YYYYMMDD .sxiva files')
+    parser.add_argument('--jobs', '-j', type=int, default=None, help='Extraction worker processes (default: one per CPU)')
+    parser.add_argument('--replace', action='store_true', help='Drop every existing day first')
+    args = parser.parse_args(argv)
+
+    if not args.data_dir.is_dir():
+        print(f"Error: not a directory: {args.data_dir}", file=sys.stderr)
+        return 1
+
+    started = time.perf_counter()
+    days, parsed, failed = load_payloads(args.data_dir, jobs=args.jobs)
+    extract_seconds = time.perf_counter() - started
+    print(f"Read {len(days)} day(s) ({parsed} file(s) parsed, the rest cached) in {extract_seconds:.2f}s")
+    if failed:
+        print(f"Warning: skipped {failed} file(s)", file=sys.stderr)
+
+    started = time.perf_counter()
+    with dashboard.db_connection() as conn:
+        cur = conn.cursor()
+        count = import_days(cur, days, replace=args.replace)
+        conn.commit()
+        cur.close()
+    load_seconds = time.perf_counter() - started
+
+    print(f"Imported {count} day(s) in {load_seconds:.2f}s ({count / max(load_seconds, 1e-9):.0f} rows/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Benchmark the analytics endpoints against growing amounts of history.
+
+Seeds 1, 2, 4 and 8 years of synthetic daily_summary rows into a scratch
+schema (sxiva_bench) of the configured database and times each endpoint
+through the Flask test client, with the response cache disabled. The
+rolling-sum time should grow roughly linearly with history (flat per 1000
+rows), not quadratically; the alcohol/depression and sleep-score series are
+precomputed at sync time, so their time should stay flat.
+
+The scratch schema copies the structure of the migrated tables in `public`
+and is dropped afterwards; existing data is not touched.
+
+Usage:
+    # Uses the same DB_* environment variables as app.py
+    DB_HOST=localhost DB_PASSWORD=... python3 dashboard/server/tests/bench_rolling_sum.py
+"""
+
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BENCH_SCHEMA = 'sxiva_bench'
+YEARS = [1, 2, 4, 8]
+RUNS = 5
+
+# Every connection the app opens resolves table names in the scratch schema
+os.environ['PGOPTIONS'] = f'-c search_path={BENCH_SCHEMA}'
+os.environ['RESPONSE_CACHE_SIZE'] = '0'
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import app as dashboard  # noqa: E402
+
+ENDPOINTS = [
+    '/api/category-rolling-sum?hobby=wf,wr,bkc&work=sp&days=7&limit=30',
+    '/api/alcohol-depression?limit=60',
+    '/api/sleep-score?limit=60',
+]
+
+
+def create_schema(cur):
+    """Create the scratch schema with empty copies of the app's tables"""
+    cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+    cur.execute(f"CREATE SCHEMA {BENCH_SCHEMA}")
+    for table in ['daily_summary', 'daily_category_minutes', 'daily_rolling_metrics', 'sync_metadata']:
+        cur.execute(f"""
+            CREATE TABLE {BENCH_SCHEMA}.{table}
+            (LIKE public.{table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)
+        """)
+    cur.execute(f"""
+        INSERT INTO {BENCH_SCHEMA}.sync_metadata (id, last_sync_timestamp, last_sync_file_count)
+        VALUES (1, NOW(), 0)
+    """)
+
+
+def seed(cur, days):
+    """Replace the scratch data with `days` days of synthetic history"""
+    cur.execute(f"""
+        TRUNCATE {BENCH_SCHEMA}.daily_summary, {BENCH_SCHEMA}.daily_category_minutes,
+                 {BENCH_SCHEMA}.daily_rolling_metrics
+    """)
+    cur.execute(f"""
+        INSERT INTO {BENCH_SCHEMA}.daily_category_minutes (date, category, minutes)
+        SELECT d::date, category, (12 * floor(random() * 6))::int
+        FROM generate_series(CURRENT_DATE - %(days)s + 1, CURRENT_DATE, INTERVAL '1 day') AS d,
+             unnest(ARRAY['wf', 'wr', 'bkc', 'sp', 'jnl', 'life']) AS category
+    """, {'days': days})
+    cur.execute(f"""
+        INSERT INTO {BENCH_SCHEMA}.daily_summary (
+            date, day_of_week, category_minutes, sleep_score, dep_avg, alc, meet
+        )
+        SELECT
+            cm.date,
+            (ARRAY['U', 'M', 'T', 'W', 'R', 'F', 'S'])[EXTRACT(DOW FROM cm.date)::int + 1],
+            jsonb_object_agg(cm.category, cm.minutes),
+            60 + (random() * 35)::int,
+            round((random() * 6 - 3)::numeric, 1),
+            round((random() * 3)::numeric, 1),
+            CASE WHEN random() < 0.3 THEN 30 END
+        FROM {BENCH_SCHEMA}.daily_category_minutes cm
+        GROUP BY cm.date
+    """)
+    dashboard.refresh_rolling_metrics(cur)
+    cur.execute(f"UPDATE {BENCH_SCHEMA}.sync_metadata SET data_version = data_version + 1")
+    cur.execute(f"ANALYZE {BENCH_SCHEMA}.daily_summary")
+    cur.execute(f"ANALYZE {BENCH_SCHEMA}.daily_category_minutes")
+
+
+def time_endpoint(client, path):
+    """Median milliseconds for a GET (after one warm-up request)"""
+    response = client.get(path)
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    client = dashboard.app.test_client()
+
+    try:
+        with dashboard.db_connection() as conn:
+            cur = conn.cursor()
+            create_schema(cur)
+            conn.commit()
+
+        print(f"{'endpoint':<70} {'days':>6} {'ms':>9} {'ms/1k rows':>11}")
+        for years in YEARS:
+            days = years * 365
+            with dashboard.db_connection() as conn:
+                cur = conn.cursor()
+                seed(cur, days)
+                conn.commit()
+
+            for path in ENDPOINTS:
+                ms = time_endpoint(client, path)
+                print(f"{path:<70} {days:>6} {ms:>9.1f} {ms / days * 1000:>11.2f}")
+    finally:
+        with dashboard.db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"DROP SCHEMA IF EXISTS {BENCH_SCHEMA} CASCADE")
+            conn.commit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Shared fixtures for the tests that run app.py in-process.
+
+Those tests work in a scratch schema (sxiva_scratch) of the configured
+database, which copies the structure of the migrated tables in `public` and
+is dropped afterwards; existing data is not touched.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+SCRATCH_SCHEMA = 'sxiva_scratch'
+SCRATCH_TABLES = ['daily_summary', 'daily_category_minutes', 'daily_rolling_metrics', 'sync_metadata']
+
+# Every connection the app opens resolves table names in the scratch schema
+os.environ['PGOPTIONS'] = f'-c search_path={SCRATCH_SCHEMA}'
+os.environ['RESPONSE_CACHE_SIZE'] = '0'
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+import app as dashboard  # noqa: E402
+
+
+def drop_scratch_schema():
+    with dashboard.db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+        conn.commit()
+
+
+@pytest.fixture(scope='module')
+def scratch_db():
+    """An empty scratch schema for the module (with its sync_metadata row)"""
+    try:
+        with dashboard.db_connection() as conn:
+            cur = conn.cursor()
+            cur.execute(f"DROP SCHEMA IF EXISTS {SCRATCH_SCHEMA} CASCADE")
+            cur.execute(f"CREATE SCHEMA {SCRATCH_SCHEMA}")
+            for table in SCRATCH_TABLES:
+                cur.execute(f"""
+                    CREATE TABLE {SCRATCH_SCHEMA}.{table}
+                    (LIKE public.{table} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING INDEXES)
+                """)
+            cur.execute(f"""
+                INSERT INTO {SCRATCH_SCHEMA}.sync_metadata (id, last_sync_timestamp, last_sync_file_count)
+                VALUES (1, NOW(), 0)
+            """)
+            conn.commit()
+
+        yield dashboard
+    finally:
+        drop_scratch_schema()
@@ -36,6 +36,16 @@ def test_health_endpoint():
     assert data['status'] == 'healthy'
 
 
+def test_health_reports_pool():
+    """Test that the health endpoint reports connection pool saturation"""
+    response = requests.get(f'{API_BASE_URL}/api/health')
+    assert response.status_code == 200
+    pool = response.json()['pool']
+    assert pool['min'] <= pool['max']
+    assert 0 <= pool['in_use'] <= pool['max']
+    assert 0.0 <= pool['saturation'] <= 1.0
+
+
 def test_rolling_sum_public_access(api_headers):
     """Test that dashboard endpoint is public (no auth required)"""
     # Without auth - should work
@@ -239,6 +249,101 @@ def test_rolling_sum_lambda_parameter(api_headers):
         assert data_02['data'][0]['hobby_raw'] == data_05['data'][0]['hobby_raw']
 
 
+def test_alcohol_series_integrity():
+    """Test that the precomputed 15-day alcohol average matches its 7-day sums"""
+    response = requests.get(f'{API_BASE_URL}/api/alcohol-depression?limit=100')
+    assert response.status_code == 200
+    data = response.json()['data']
+    assert len(data) > 0, "API should return at least one day of data"
+
+    dates = [day['date'] for day in data]
+    assert dates == sorted(dates), "Dates should be in chronological order"
+
+    # Every day with 14 preceding days in the response can be checked
+    for i in range(14, len(data)):
+        window = [day['alc_7day_sum'] for day in data[i - 14:i + 1]]
+        expected = sum(window) / len(window)
+        assert abs(data[i]['alc_15day_avg'] - expected) < 0.01, \
+            f"15-day average mismatch on {data[i]['date']}: {data[i]['alc_15day_avg']} != {expected}"
+
+
+def test_analytics_conditional_requests():
+    """Test that analytics responses carry validators and honor If-None-Match"""
+    for path in ['/api/category-rolling-sum?hobby=wf,wr,bkc&days=7&limit=5',
+                 '/api/alcohol-depression?limit=5',
+                 '/api/sleep-score?limit=5']:
+        response = requests.get(f'{API_BASE_URL}{path}')
+        assert response.status_code == 200
+        etag = response.headers.get('ETag')
+        assert etag
+        assert 'Last-Modified' in response.headers
+
+        response = requests.get(f'{API_BASE_URL}{path}', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+        assert not response.content
+
+
+def test_analytics_cache_normalizes_params():
+    """Test that reordered query parameters and category lists share a cache entry"""
+    first = requests.get(
+        f'{API_BASE_URL}/api/category-rolling-sum',
+        params={'hobby': 'wf,wr,bkc', 'days': 7, 'limit': 5}
+    )
+    second = requests.get(
+        f'{API_BASE_URL}/api/category-rolling-sum',
+        params={'limit': 5, 'days': 7, 'hobby': 'bkc, wr,wf'}
+    )
+    assert first.status_code == 200
+    assert second.status_code == 200
+    assert first.headers['ETag'] == second.headers['ETag']
+    assert first.json() == second.json()
+
+
+def test_sync_batch_requires_auth():
+    """Test that the batch sync endpoint rejects requests without a token"""
+    response = requests.post(
+        f'{API_BASE_URL}/api/sync/batch',
+        json={'days': [{'date': '2025-01-17', 'day_of_week': 'F'}]}
+    )
+    assert response.status_code == 401
+
+
+def test_sync_batch_validation(api_headers):
+    """Test that an invalid batch is rejected before anything is written"""
+    # Not a list of days
+    response = requests.post(
+        f'{API_BASE_URL}/api/sync/batch',
+        json={'date': '2025-01-17', 'day_of_week': 'F'},
+        headers=api_headers
+    )
+    assert response.status_code == 400
+
+    # Second entry is missing day_of_week - whole batch rejected
+    response = requests.post(
+        f'{API_BASE_URL}/api/sync/batch',
+        json={'days': [
+            {'date': '2025-01-17', 'day_of_week': 'F'},
+            {'date': '2025-01-18'}
+        ]},
+        headers=api_headers
+    )
+    assert response.status_code == 400
+    assert 'days[1]' in response.json()['error']
+
+    # Category minutes that aren't whole minutes are a 400 for that day, not a 500
+    for minutes in (None, '40', [40], True, 12.5, 40.0, -1, 2 ** 31, 1e20):
+        response = requests.post(
+            f'{API_BASE_URL}/api/sync/batch',
+            json={'days': [
+                {'date': '2025-01-17', 'day_of_week': 'F', 'category_minutes': {'bkc': 40}},
+                {'date': '2025-01-18', 'day_of_week': 'S', 'category_minutes': {'bkc': minutes}}
+            ]},
+            headers=api_headers
+        )
+        assert response.status_code == 400
+        assert "days[1]: category_minutes['bkc']" in response.json()['error']
+
+
 if __name__ == '__main__':
     # Allow running directly for quick testing
     print(f"Testing API at: {API_BASE_URL}")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for import_history.py, the bulk COPY import of .sxiva history.
+
+An import has to leave daily_summary, daily_category_minutes and
+daily_rolling_metrics exactly as syncing the same days through
+upsert_daily_summaries() would. Runs in the scratch schema (see
+conftest.py).
+
+Usage:
+    # Uses the same DB_* environment variables as app.py
+    DB_HOST=localhost DB_PASSWORD=... pytest dashboard/server/tests/test_import_history.py -v
+"""
+
+import os
+import random
+import shutil
+import subprocess
+import sys
+from datetime import date, timedelta
+from pathlib import Path
+
+from conftest import dashboard
+import import_history
+from sxiva.manifest import payload_digest
+
+SEED = 20261018
+NUM_DAYS = 400
+CATEGORIES = ['wf', 'wr', 'bkc', 'sp', 'jnl', 'life', 'ex', 'wr.x']
+REPO_ROOT = Path(__file__).parent.parent.parent.parent
+EXAMPLES_DIR = REPO_ROOT / 'examples'
+
+# Every stored column but the timestamps
+SNAPSHOT_SQL = {
+    'daily_summary': f"SELECT {', '.join(import_history.COLUMNS)} FROM daily_summary ORDER BY date",
+    'daily_category_minutes': "SELECT * FROM daily_category_minutes ORDER BY date, category",
+    'daily_rolling_metrics': "SELECT * FROM daily_rolling_metrics ORDER BY date",
+}
+
+
+def synthetic_days():
+    rng = random.Random(SEED)
+    start = date(2024, 1, 1)
+    days = []
+    for offset in range(NUM_DAYS):
+        day = start + timedelta(days=offset)
+        payload = {
+            'date': day.isoformat(),
+            'day_of_week': 'MTWRFSU'[day.weekday()],
+            # JSON exercises the quoting of the CSV stream (commas, quotes)
+            'category_minutes': {
+                category: rng.randint(1, 180)
+                for category in rng.sample(CATEGORIES, rng.randint(0, 4))
+            },
+        }
+        if rng.random() < 0.8:
+            payload['sleep_hours'] = round(rng.uniform(4, 9), 2)
+        if rng.random() < 0.5:
+            payload['alc'] = rng.choice([0, 0.5, 1.5, 3])
+        if rng.random() < 0.3:
+            payload['meet'] = rng.randint(15, 240)
+        if rng.random() < 0.2:
+            payload['wea'] = rng.randint(-2, 2)
+        days.append(payload)
+    return days
+
+
+def snapshot(cur):
+    tables = {}
+    for table, sql in SNAPSHOT_SQL.items():
+        cur.execute(sql)
+        tables[table] = cur.fetchall()
+    return tables
+
+
+def run(operation, *args, **kwargs):
+    with dashboard.db_connection() as conn:
+        cur = conn.cursor()
+        result = operation(cur, *args, **kwargs)
+        conn.commit()
+        cur.close()
+    return result
+
+
+def clear(cur):
+    cur.execute("TRUNCATE daily_summary, daily_category_minutes, daily_rolling_metrics")
+
+
+def sync_version():
+    with dashboard.db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute("SELECT last_sync_file_count, data_version FROM sync_metadata WHERE id = 1")
+        return cur.fetchone()
+
+
+def test_import_matches_sync(scratch_db):
+    """Importing leaves every table as syncing the same days does"""
+    days = synthetic_days()
+
+    run(clear)
+    run(dashboard.upsert_daily_summaries, days)
+    synced = run(snapshot)
+
+    run(clear)
+    count_before, version_before = sync_version()
+    assert run(import_history.import_days, days) == NUM_DAYS
+    assert run(snapshot) == synced
+
+    count_after, version_after = sync_version()
+    assert count_after == count_before + NUM_DAYS
+    assert version_after == version_before + 1
+
+
+def test_import_merges_into_existing_days(scratch_db):
+    """Without --replace, other days are kept; repeated dates keep the last entry"""
+    days = synthetic_days()
+    first = dict(days[160], category_minutes={'wr': 5})
+    last = dict(days[160], category_minutes={'bkc': 7}, sleep_hours=6.5)
+
+    run(clear)
+    run(dashboard.upsert_daily_summaries, days)
+    run(dashboard.upsert_daily_summaries, [last])
+    expected = run(snapshot)
+
+    run(clear)
+    run(dashboard.upsert_daily_summaries, days[:200])
+    assert run(import_history.import_days, [*days[150:], first, last]) == NUM_DAYS - 150
+    assert run(snapshot) == expected
+
+    hashes = {row[0].isoformat(): row[-1] for row in expected['daily_summary']}
+    assert hashes[last['date']] == payload_digest(last)
+
+
+def test_import_skips_fractional_minutes(scratch_db):
+    """Category minutes sync would reject don't reach daily_category_minutes"""
+    day = {'date': '2025-01-17', 'day_of_week': 'F', 'category_minutes': {'bkc': 40, 'wr': 12.5, 'sp': 2 ** 31}}
+    run(clear)
+    assert run(import_history.import_days, [day]) == 1
+    assert run(snapshot)['daily_category_minutes'] == [(date(2025, 1, 17), 'bkc', 40)]
+
+
+def test_replace(scratch_db):
+    """--replace drops the days that aren't imported again"""
+    days = synthetic_days()
+    run(clear)
+    run(dashboard.upsert_daily_summaries, days)
+
+    assert run(import_history.import_days, days[:30], replace=True) == 30
+    tables = run(snapshot)
+    assert [row[0].isoformat() for row in tables['daily_summary']] == [day['date'] for day in days[:30]]
+    assert len(tables['daily_rolling_metrics']) == 30
+
+
+def test_main_imports_data_dir(scratch_db, tmp_path, capsys):
+    """The command line reads every dated file of a data directory"""
+    names = ['20251129S.sxiva', '20251226F.sxiva']
+    for name in names:
+        shutil.copy(EXAMPLES_DIR / name, tmp_path / name)
+    (tmp_path / 'notes.sxiva').write_text('not a day')
+
+    assert import_history.main([str(tmp_path), '--replace', '--jobs', '1']) == 0
+    output = capsys.readouterr().out
+    assert 'Imported 2 day(s)' in output and 'rows/s' in output
+
+    days, parsed, failed = import_history.load_payloads(tmp_path)
+    assert (parsed, failed) == (0, 0)  # Cached by the first read
+
+    stored = run(snapshot)['daily_summary']
+    assert [(row[0].isoformat(), row[-1]) for row in stored] == [(day['date'], payload_digest(day)) for day in days]
+
+
+def test_stats_keeps_imported_rows(tmp_path):
+    """`sxiva stats` (last file per date) and the import (every file) share the day cache"""
+    shutil.copy(EXAMPLES_DIR / '20251129S.sxiva', tmp_path / '20251129S.sxiva')
+    shutil.copy(EXAMPLES_DIR / '20251129S.sxiva', tmp_path / '20251129.sxiva')
+    shutil.copy(EXAMPLES_DIR / '20251226F.sxiva', tmp_path / '20251226F.sxiva')
+
+    assert import_history.load_payloads(tmp_path, jobs=1)[1] == 3
+    stats = subprocess.run(
+        [sys.executable, '-m', 'tools.sxiva.cli', 'stats', '--jobs', '1'],
+        cwd=REPO_ROOT, env=dict(os.environ, SXIVA_DATA=str(tmp_path)),
+        capture_output=True, text=True,
+    )
+    assert stats.returncode == 0, stats.stderr
+    assert len(stats.stdout.splitlines()) == 3  # Header and one row per date
+
+    # Neither run evicted the other's rows
+    assert import_history.load_payloads(tmp_path, jobs=1)[1] == 0
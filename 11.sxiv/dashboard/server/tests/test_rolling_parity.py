@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Parity tests for /api/category-rolling-sum against its original SQL.
+
+The endpoint now computes the rolling sums with the shared NumPy engine
+(tools/sxiva/rolling.py). These tests seed the scratch schema (see
+conftest.py) with seeded random history, then check that the endpoint
+returns exactly what the SQL query it replaced returns, for several
+groupings, windows and decay parameters.
+
+Usage:
+    # Uses the same DB_* environment variables as app.py
+    DB_HOST=localhost DB_PASSWORD=... pytest dashboard/server/tests/test_rolling_parity.py -v
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+from conftest import dashboard
+
+SEED = 20261018
+NUM_DAYS = 1500
+CATEGORIES = ['wf', 'wr', 'bkc', 'sp', 'jnl', 'life', 'ex', 'wr.x']
+
+# The query /api/category-rolling-sum ran before the NumPy engine
+REFERENCE_SQL = """
+    WITH category_breakdowns AS (
+        -- Split category minutes into hobby, work, and other
+        SELECT
+            ds.date,
+            COALESCE(
+                SUM(cm.minutes) FILTER (WHERE cm.category = ANY(%(hobby_categories)s)),
+                0
+            ) AS hobby_minutes,
+            COALESCE(
+                SUM(cm.minutes) FILTER (WHERE cm.category = ANY(%(work_categories)s)),
+                0
+            ) + COALESCE(ds.meet, 0) AS work_minutes,
+            COALESCE(
+                SUM(cm.minutes) FILTER (WHERE cm.category != ALL(%(all_specified)s)),
+                0
+            ) AS other_minutes,
+            COALESCE(SUM(cm.minutes), 0) + COALESCE(ds.meet, 0) AS total_minutes
+        FROM daily_summary ds
+        LEFT JOIN daily_category_minutes cm ON cm.date = ds.date
+        GROUP BY ds.date, ds.meet
+    ),
+    weekday_work AS (
+        -- Work over each weekday and the 4 weekdays before it, in one pass
+        -- over the weekday series (weekends don't count toward work)
+        SELECT
+            date,
+            SUM(work_minutes) OVER last_5_weekdays AS work_raw,
+            ARRAY_AGG(work_minutes) OVER last_5_weekdays AS work_window,
+            ARRAY_AGG(date) OVER last_5_weekdays AS date_window
+        FROM category_breakdowns
+        WHERE EXTRACT(DOW FROM date) BETWEEN 1 AND 5  -- Monday to Friday
+        WINDOW last_5_weekdays AS (ORDER BY date ROWS BETWEEN 4 PRECEDING AND CURRENT ROW)
+    ),
+    rolling_calcs AS (
+        -- Calculate raw sums using window functions
+        SELECT
+            cb.date,
+            SUM(cb.hobby_minutes) OVER (
+                ORDER BY cb.date
+                ROWS BETWEEN %(window_days)s - 1 PRECEDING AND CURRENT ROW
+            ) AS hobby_raw,
+            -- Hobby minutes and dates within the last window_days calendar days
+            ARRAY_AGG(cb.hobby_minutes) OVER hobby_days AS hobby_window,
+            ARRAY_AGG(cb.date) OVER hobby_days AS hobby_date_window,
+            SUM(cb.other_minutes) OVER (
+                ORDER BY cb.date
+                ROWS BETWEEN %(window_days)s - 1 PRECEDING AND CURRENT ROW
+            ) AS other_raw,
+            SUM(cb.total_minutes) OVER (
+                ORDER BY cb.date
+                ROWS BETWEEN %(window_days)s - 1 PRECEDING AND CURRENT ROW
+            ) AS total_raw,
+            ww.work_raw,
+            ww.work_window,
+            ww.date_window,
+            -- Days after the same weekday share a group (weekends use the preceding weekday)
+            COUNT(ww.date) OVER (ORDER BY cb.date) AS weekday_group
+        FROM category_breakdowns cb
+        LEFT JOIN weekday_work ww ON ww.date = cb.date
+        WINDOW hobby_days AS (
+            ORDER BY cb.date
+            RANGE BETWEEN INTERVAL '1 day' * (%(window_days)s - 1) PRECEDING AND CURRENT ROW
+        )
+    ),
+    weighted_calcs AS (
+        SELECT
+            rc.date,
+            rc.hobby_raw,
+            (
+                -- Calculate weighted sum for hobby categories
+                SELECT
+                    SUM(minutes * EXP(-%(decay_lambda)s * (rc.date - day))) *
+                    (%(window_days)s::float / SUM(EXP(-%(decay_lambda)s * (rc.date - day))))
+                FROM UNNEST(rc.hobby_window, rc.hobby_date_window) AS hobby_days(minutes, day)
+            ) AS hobby_weighted,
+            rc.work_raw,
+            (
+                -- Calculate weighted sum for work categories (weekdays only, last 5).
+                -- Relative to the weekday itself: the extra decay to a following
+                -- weekend day cancels out in the normalization.
+                SELECT
+                    SUM(minutes * EXP(-%(decay_lambda)s * (rc.date - day))) *
+                    (5.0 / NULLIF(SUM(EXP(-%(decay_lambda)s * (rc.date - day))), 0))
+                FROM UNNEST(rc.work_window, rc.date_window) AS last_5_weekdays(minutes, day)
+            ) AS work_weighted,
+            rc.other_raw,
+            rc.total_raw,
+            rc.weekday_group
+        FROM rolling_calcs rc
+    )
+    SELECT
+        date,
+        hobby_raw,
+        ROUND(hobby_weighted::numeric, 1) AS hobby_weighted,
+        COALESCE(
+            FIRST_VALUE(work_raw) OVER (PARTITION BY weekday_group ORDER BY date),
+            0
+        ) AS work_raw,
+        ROUND(
+            COALESCE(
+                FIRST_VALUE(work_weighted) OVER (PARTITION BY weekday_group ORDER BY date),
+                0
+            )::numeric,
+            1
+        ) AS work_weighted,
+        other_raw,
+        total_raw
+    FROM weighted_calcs
+    ORDER BY date DESC
+    LIMIT %(limit)s
+"""
+
+# hobby, work, days, lambda
+PARAMETERS = [
+    ('wf,wr,bkc', 'sp', 7, 0.2),
+    ('wr', 'sp,jnl', 14, 0.05),
+    ('ex', '', 3, 1.0),
+    ('', 'sp', 1, 0.2),
+    ('wf,sp', 'sp', 30, 0.3),
+    ('life,wr.x', 'bkc', 400, 0.0),
+]
+
+
+def synthetic_days(rng):
+    """NUM_DAYS sync payloads with gaps, empty days and meetings"""
+    days = []
+    day = date(2021, 3, 1)
+    for _ in range(NUM_DAYS):
+        day += timedelta(days=rng.choice([1, 1, 1, 1, 2, 3]))
+        categories = rng.sample(CATEGORIES, rng.randrange(0, 6))
+        days.append({
+            'date': day.isoformat(),
+            'day_of_week': 'MTWRFSU'[day.weekday()],
+            'category_minutes': {cat: rng.choice([0, 5, 12, 24, 36, 48, 60, 73]) for cat in categories},
+            'meet': rng.choice([None, None, 0, 15, 30]),
+        })
+    return days
+
+
+@pytest.fixture(scope='module')
+def client(scratch_db):
+    """Flask test client over the seeded scratch schema"""
+    with dashboard.db_connection() as conn:
+        cur = conn.cursor()
+        dashboard.upsert_daily_summaries(cur, synthetic_days(random.Random(SEED)))
+        conn.commit()
+
+    return dashboard.app.test_client()
+
+
+def reference_rows(hobby, work, window_days, decay_lambda, limit):
+    """Rows of the original SQL, formatted as the endpoint formatted them"""
+    hobby_categories = [cat for cat in hobby.split(',') if cat]
+    work_categories = [cat for cat in work.split(',') if cat]
+    with dashboard.db_connection() as conn:
+        cur = conn.cursor()
+        cur.execute(REFERENCE_SQL, {
+            'hobby_categories': hobby_categories,
+            'work_categories': work_categories,
+            'all_specified': hobby_categories + work_categories,
+            'window_days': window_days,
+            'limit': limit,
+            'decay_lambda': decay_lambda
+        })
+        rows = cur.fetchall()
+    return [
+        {
+            'date': row[0].isoformat(),
+            'hobby_raw': int(row[1]) if row[1] is not None else 0,
+            'hobby_weighted': float(row[2]) if row[2] is not None else 0.0,
+            'work_raw': int(row[3]) if row[3] is not None else 0,
+            'work_weighted': float(row[4]) if row[4] is not None else 0.0,
+            'other_raw': int(row[5]) if row[5] is not None else 0,
+            'total_raw': int(row[6]) if row[6] is not None else 0
+        }
+        for row in reversed(rows)
+    ]
+
+
+@pytest.mark.parametrize('hobby,work,window_days,decay_lambda', PARAMETERS)
+def test_rolling_sum_matches_sql(client, hobby, work, window_days, decay_lambda):
+    """Every day of history matches the original SQL"""
+    response = client.get('/api/category-rolling-sum', query_string={
+        'hobby': hobby, 'work': work, 'days': window_days, 'lambda': decay_lambda, 'limit': NUM_DAYS,
+    })
+    assert response.status_code == 200, response.get_data(as_text=True)
+
+    data = response.get_json()['data']
+    assert len(data) == NUM_DAYS
+    assert data == reference_rows(hobby, work, window_days, decay_lambda, NUM_DAYS)
+
+
+def test_rolling_sum_limit_matches_sql(client):
+    """A limited response is the tail of the full series"""
+    response = client.get('/api/category-rolling-sum', query_string={
+        'hobby': 'wf,wr,bkc', 'work': 'sp', 'days': 7, 'limit': 30,
+    })
+    assert response.status_code == 200
+    assert response.get_json()['data'] == reference_rows('wf,wr,bkc', 'sp', 7, 0.2, 30)
+
+
+def test_rolling_sum_category_lists(client):
+    """Categories are split into hobby/work/other as before"""
+    response = client.get('/api/category-rolling-sum', query_string={'hobby': 'wf,wr', 'work': 'sp'})
+    result = response.get_json()
+    assert result['hobby_categories'] == ['wf', 'wr']
+    assert result['work_categories'] == ['sp']
+    assert result['other_categories'] == ['bkc', 'ex', 'jnl', 'life', 'wr.x']
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-date payload hashes behind delta sync.
+
+Every synced day stores payload_digest() of its payload; /api/sync/hashes
+serves them so the client uploads only days whose payload changed. Runs in
+the scratch schema (see conftest.py).
+
+Usage:
+    # Uses the same DB_* environment variables as app.py
+    DB_HOST=localhost DB_PASSWORD=... pytest dashboard/server/tests/test_sync_hashes.py -v
+"""
+
+import pytest
+
+from conftest import dashboard
+from sxiva.manifest import payload_digest
+
+DAYS = [
+    {'date': '2025-01-17', 'day_of_week': 'F', 'category_minutes': {'bkc': 40, 'jnl': 32}, 'sleep_hours': 7.0},
+    {'date': '2025-01-18', 'day_of_week': 'S', 'category_minutes': {'wr': 12}, 'alc': 1.5},
+    {'date': '2025-01-20', 'day_of_week': 'M', 'category_minutes': {}, 'meet': 30},
+]
+
+
+@pytest.fixture(scope='module')
+def client(scratch_db):
+    return dashboard.app.test_client()
+
+
+@pytest.fixture
+def api_headers():
+    return {'Authorization': f'Bearer {dashboard.API_TOKEN}'}
+
+
+def test_hashes_require_auth(client):
+    assert client.get('/api/sync/hashes').status_code == 401
+
+
+def test_hashes_of_synced_days(client, api_headers):
+    """Each synced day is served with its payload's hash, within the requested range"""
+    response = client.post('/api/sync/batch', json={'days': DAYS}, headers=api_headers)
+    assert response.status_code == 200
+
+    response = client.get('/api/sync/hashes', headers=api_headers)
+    assert response.status_code == 200
+    assert response.get_json()['hashes'] == {day['date']: payload_digest(day) for day in DAYS}
+
+    response = client.get('/api/sync/hashes', query_string={'start': '2025-01-18', 'end': '2025-01-19'},
+                          headers=api_headers)
+    assert response.get_json()['hashes'] == {'2025-01-18': payload_digest(DAYS[1])}
+
+    response = client.get('/api/sync/hashes', query_string={'start': '01/18/2025'}, headers=api_headers)
+    assert response.status_code == 400
+
+
+def test_hash_follows_payload(client, api_headers):
+    """Rewriting a day replaces its hash; equivalent payloads hash the same"""
+    changed = dict(DAYS[0], category_minutes={'bkc': 41, 'jnl': 32})
+    response = client.post('/api/sync/daily', json=changed, headers=api_headers)
+    assert response.status_code == 200
+
+    hashes = client.get('/api/sync/hashes', headers=api_headers).get_json()['hashes']
+    assert hashes['2025-01-17'] == payload_digest(changed) != payload_digest(DAYS[0])
+
+    # 7 vs 7.0 and a missing field vs null are stored identically
+    assert payload_digest(dict(changed, sleep_hours=7, dist=None)) == hashes['2025-01-17']
@@ -0,0 +1,11 @@
+; SXIVA Extraction Queries
+; Used by the sync extractor (tools/sxiva/parser_extractor.py) to read the
+; {summary} and {attributes} sections of a calculated file.
+
+(summary_section) @summary
+(summary_section
+  (summary_line) @summary.line)
+
+(attributes_section) @attributes
+(attributes_section
+  (attributes_line) @attributes.line)
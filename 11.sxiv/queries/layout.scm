@@ -0,0 +1,22 @@
+; SXIVA Line Layout Queries
+; Used by the calculator (tools/sxiva/calculator.py) to find the node that
+; determines how each line is reformatted, without walking the tree in Python.
+; Captures are returned in document order; nested nodes are included.
+
+[
+  (focus_declaration)
+  (date_header_section)
+  (date_header_line)
+  (date_header)
+  (freeform_section)
+  (freeform_line)
+  (c_section)
+  (c_line)
+  (summary_section)
+  (time_block)
+  (continuation_block)
+  (rest_block)
+  (break_marker)
+  (end_marker)
+  (ERROR)
+] @line
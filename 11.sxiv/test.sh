@@ -9,6 +9,22 @@ echo "Running SXIVA tests..."
 echo ""
 
 python3 tests/test_examples.py
+python3 tests/test_incremental.py
+python3 tests/test_daemon.py
+python3 tests/test_batch.py
+python3 tests/test_manifest.py
+python3 tests/test_analysis.py
+python3 tests/test_block_index.py
+python3 tests/test_queries.py
+python3 tests/test_parser.py
+python3 tests/test_startup.py
+python3 tests/test_malformed_lines.py
+python3 tests/test_stats.py
+python3 tests/test_day_cache.py
+python3 tests/test_time_parser.py
+python3 tests/test_sync.py
+python3 tests/test_journal.py
+python3 tests/test_watch.py
 
 echo ""
 echo "Done!"
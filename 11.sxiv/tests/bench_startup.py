@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark CLI startup and parser setup.
+
+Times fresh `sxiva --help` and `sxiva calculate <example>` processes (median
+of several runs, daemon bypassed), then, in this process, the first
+SxivaParser() against later ones and parsing from several threads. Parser
+setup should be paid once per process: later SxivaParser() calls and other
+threads' first parses should cost microseconds, not a reload of parser.so.
+
+Usage:
+    python3 tests/bench_startup.py
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+RUNS = 7
+THREADS = 4
+EXAMPLE = repo_root / "examples" / "full-day.sxiva"
+
+COMMANDS = [
+    ['--help'],
+    ['calculate', str(EXAMPLE)],
+]
+
+
+def time_command(args):
+    """Median wall time in ms of a fresh `sxiva <args>` process"""
+    env = os.environ.copy()
+    env['SXIVA_NO_DAEMON'] = '1'
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-m", "tools.sxiva.cli", *args],
+            cwd=str(repo_root),
+            env=env,
+            capture_output=True,
+            check=True
+        )
+        times.append((time.perf_counter() - start) * 1000)
+    return statistics.median(times)
+
+
+def time_ms(fn):
+    start = time.perf_counter()
+    fn()
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    print(f"{'command':<50} {'ms':>9}")
+    for args in COMMANDS:
+        label = ' '.join(['sxiva', *args]).replace(str(repo_root) + '/', '')
+        print(f"{label:<50} {time_command(args):>9.1f}")
+
+    from tools.sxiva.parser import SxivaParser
+
+    source = EXAMPLE.read_bytes()
+    print()
+    print(f"{'in-process':<50} {'ms':>9}")
+    print(f"{'first SxivaParser() (loads parser.so)':<50} {time_ms(SxivaParser):>9.3f}")
+    print(f"{'later SxivaParser()':<50} {time_ms(SxivaParser):>9.3f}")
+    print(f"{'parse example':<50} {time_ms(lambda: SxivaParser().parse(source)):>9.3f}")
+
+    # Each thread's first parse creates that thread's Parser
+    results = [None] * THREADS
+
+    def parse_in_thread(i):
+        results[i] = time_ms(lambda: SxivaParser().parse(source))
+
+    threads = [threading.Thread(target=parse_in_thread, args=(i,)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    label = f"first parse in a new thread (max of {THREADS})"
+    print(f"{label:<50} {max(results):>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
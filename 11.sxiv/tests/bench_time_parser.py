@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Benchmark time and duration parsing over the examples/ corpus.
+
+Records the strings the calculator passes to the time and duration parsers
+while analyzing examples/*.sxiva (repeats included), then reports the
+per-call cost over them of:
+
+- parse_duration as it was (a cascade of regular expressions)
+- the single-pass tokenizer without its cache (parse_duration.__wrapped__)
+- parse_duration as called (tokenizer + LRU cache)
+- parse_time_to_minutes_since_midnight without and with its cache
+
+Usage:
+    python3 tests/bench_time_parser.py
+"""
+
+import re
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva import calculator
+from tools.sxiva.time_parser import parse_duration, parse_time_to_minutes_since_midnight
+
+ROUNDS = 20
+
+
+def regex_parse_duration(duration_str):
+    """parse_duration before the tokenizer, for comparison"""
+    duration_str = duration_str.strip()
+    if duration_str == '0':
+        return 0
+    if ':' in duration_str:
+        match = re.match(r'^(\d+):(\d{2})$', duration_str)
+        if match:
+            return int(match.group(1)) * 60 + int(match.group(2))
+        return None
+    match = re.match(r'^(\d+(?:\.\d+)?)h$', duration_str)
+    if match:
+        return round(float(match.group(1)) * 60)
+    match = re.match(r'^(\d+)h(\d+)m$', duration_str)
+    if match:
+        return int(match.group(1)) * 60 + int(match.group(2))
+    match = re.match(r'^(\d+)m$', duration_str)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def corpus():
+    """(times, durations) the calculator parses for the examples, in call order"""
+    times, durations = [], []
+
+    def recording(parser, calls):
+        def record(text):
+            calls.append(text)
+            return parser(text)
+        return record
+
+    calculator.parse_time_to_minutes_since_midnight = recording(parse_time_to_minutes_since_midnight, times)
+    calculator.parse_duration = recording(parse_duration, durations)
+    try:
+        point_calculator = calculator.PointCalculator()
+        for path in sorted((repo_root / "examples").glob("*.sxiva")):
+            point_calculator.analyze_file(str(path), dry_run=True)
+    finally:
+        calculator.parse_time_to_minutes_since_midnight = parse_time_to_minutes_since_midnight
+        calculator.parse_duration = parse_duration
+    return times, durations
+
+
+def per_call_ns(fn, args):
+    """Best per-call time in ns over ROUNDS passes"""
+    best = float('inf')
+    for _ in range(ROUNDS):
+        start = time.perf_counter_ns()
+        for arg in args:
+            fn(arg)
+        best = min(best, (time.perf_counter_ns() - start) / len(args))
+    return best
+
+
+def main():
+    times, durations = corpus()
+    print(f"{len(times)} times ({len(set(times))} distinct), "
+          f"{len(durations)} durations ({len(set(durations))} distinct)\n")
+
+    rows = [
+        ('parse_duration: regex cascade (before)', regex_parse_duration, durations),
+        ('parse_duration: tokenizer, uncached', parse_duration.__wrapped__, durations),
+        ('parse_duration: tokenizer + LRU', parse_duration, durations),
+        ('parse_time: uncached (before)', parse_time_to_minutes_since_midnight.__wrapped__, times),
+        ('parse_time: LRU', parse_time_to_minutes_since_midnight, times),
+    ]
+    print(f"{'parser':<45} {'ns/call':>9}")
+    for label, fn, args in rows:
+        print(f"{label:<45} {per_call_ns(fn, args):>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
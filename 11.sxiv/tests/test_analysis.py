@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Test the single-parse analysis shared by the calculator and the sync client."""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.batch import recalculate_files
+from tools.sxiva.calculator import PointCalculator
+from tools.sxiva.parser_extractor import SxivaDataExtractor
+from tools.sxiva.sync import SxivaSyncClient
+
+examples_dir = repo_root / "examples"
+
+
+class CountingExtractor(SxivaDataExtractor):
+    """Extractor that counts the files it has to parse."""
+
+    def __init__(self):
+        super().__init__()
+        self.parsed = []
+
+    def extract_from_file(self, file_path):
+        self.parsed.append(file_path.name)
+        return super().extract_from_file(file_path)
+
+
+def copy_as_dated(examples, dest):
+    """Copy examples into dest under YYYYMMDD names (sync only takes dated files)."""
+    paths = []
+    for i, example in enumerate(examples):
+        path = dest / f"202501{i + 1:02d}.sxiva"
+        shutil.copy(example, path)
+        paths.append(path)
+    return paths
+
+
+def test_analysis_matches_extraction():
+    """The payload built from analyze_file equals parsing the fixed file (also with [ERROR]s)."""
+    print("=" * 70)
+    print("TEST: analysis payload matches re-parsing the fixed file")
+    print("=" * 70)
+
+    calculator = PointCalculator()
+    extractor = SxivaDataExtractor()
+    examples = sorted(examples_dir.glob("*.sxiva"))
+
+    all_passed = True
+    checked = 0
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = []
+        # YYYYMMDD names, a month of examples per directory
+        for start in range(0, len(examples), 28):
+            month_dir = Path(tmpdir) / str(start)
+            month_dir.mkdir()
+            paths += copy_as_dated(examples[start:start + 28], month_dir)
+
+        for example, path in zip(examples, paths):
+            analysis = calculator.analyze_file(str(path))
+            if analysis.content != path.read_text(encoding='utf-8'):
+                print(f"✗ FAIL  - {example.name}: analysis content differs from written file")
+                all_passed = False
+            expected = extractor.extract_from_file(path)
+            actual = extractor.extract_from_analysis(analysis)
+            checked += 1
+            if actual != expected:
+                diff = {k: (actual.get(k), v) for k, v in expected.items() if actual.get(k) != v}
+                print(f"✗ FAIL  - {example.name}: {diff}")
+                all_passed = False
+
+    if all_passed:
+        print(f"✓ PASS: {checked} files\n")
+    return all_passed
+
+
+def test_attributes_after_checkmarks():
+    """Attributes after a ✓ are extracted (node offsets are bytes, not characters)."""
+    print("=" * 70)
+    print("TEST: attributes after multi-byte characters are extracted")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path, = copy_as_dated([examples_dir / "attributes-full.sxiva"], Path(tmpdir))
+        PointCalculator().fix_file(str(path))
+        data = SxivaDataExtractor().extract_from_file(path)
+
+    expected = {'sleep_score': 72, 'out': 1, 'exe': 3, 'dep_avg': 0.5, 'alc': 0.0}
+    actual = {key: data[key] for key in expected}
+    if actual != expected:
+        print(f"✗ FAIL: expected {expected}, got {actual}")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def test_sync_reuses_recalculation():
+    """Sync takes payloads from recalculation and parses only files changed since."""
+    print("=" * 70)
+    print("TEST: sync reuses the recalculation's parse")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        examples = [examples_dir / name for name in
+                    ("attributes-full.sxiva", "full-day.sxiva", "end-marker.sxiva")]
+        paths = copy_as_dated(examples, Path(tmpdir))
+        results = list(recalculate_files(paths, jobs=1))
+
+        client = SxivaSyncClient(api_url='http://test.invalid')
+        client.extractor = CountingExtractor()
+        client.use_recalculated(results)
+
+        # Edited after recalculation: the prepared payload is stale
+        edited = paths[0]
+        edited.write_text(edited.read_text(encoding='utf-8') + "\n", encoding='utf-8')
+
+        payloads = [client.extract(path) for path in paths]
+        if client.extractor.parsed != [edited.name]:
+            print(f"✗ FAIL: expected only {edited.name} parsed, got {client.extractor.parsed}")
+            all_passed = False
+        if payloads[1:] != [result.data for result in results[1:]] or not all(payloads):
+            print("✗ FAIL: payloads don't match recalculation results")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_analysis_matches_extraction():
+        all_passed = False
+
+    if not test_attributes_after_checkmarks():
+        all_passed = False
+
+    if not test_sync_reuses_recalculation():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL ANALYSIS TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME ANALYSIS TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
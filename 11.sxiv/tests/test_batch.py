@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Test parallel recalculation of many files (`sxiva --all --jobs N`)."""
+
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.batch import recalculate_files, resolve_jobs
+
+examples_dir = repo_root / "examples"
+
+
+def copy_examples(dest):
+    """Copy every example into dest and return the copied paths in name order."""
+    paths = []
+    for example in sorted(examples_dir.glob("*.sxiva")):
+        shutil.copy(example, dest / example.name)
+        paths.append(dest / example.name)
+    return paths
+
+
+def test_parallel_matches_serial():
+    """A process pool produces the same files and statuses as a serial run."""
+    print("=" * 70)
+    print("TEST: --jobs 4 matches --jobs 1")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        serial_dir = Path(tmpdir) / "serial"
+        parallel_dir = Path(tmpdir) / "parallel"
+        serial_dir.mkdir()
+        parallel_dir.mkdir()
+
+        serial_paths = copy_examples(serial_dir)
+        parallel_paths = copy_examples(parallel_dir)
+
+        if resolve_jobs(4, len(parallel_paths)) < 2:
+            print("✗ FAIL: expected more than one worker for the examples")
+            return False
+
+        serial = list(recalculate_files(serial_paths, jobs=1))
+        parallel = list(recalculate_files(parallel_paths, jobs=4))
+
+        all_passed = True
+        if [r.name for r in parallel] != [p.name for p in parallel_paths]:
+            print("✗ FAIL: results not in input order")
+            all_passed = False
+
+        for s, p in zip(serial, parallel):
+            same_file = (Path(s.path).read_text(encoding='utf-8') ==
+                         Path(p.path).read_text(encoding='utf-8'))
+            if (s.status, s.num_fixes) != (p.status, p.num_fixes) or not same_file:
+                print(f"✗ FAIL  - {s.name}: serial {s.status}/{s.num_fixes}, "
+                      f"parallel {p.status}/{p.num_fixes}, same output: {same_file}")
+                all_passed = False
+
+        # A second run finds nothing left to change
+        again = list(recalculate_files(parallel_paths, jobs=4))
+        changed = [r.name for r in again if r.status == 'changed']
+        if changed:
+            print(f"✗ FAIL: files changed on second run: {changed}")
+            all_passed = False
+
+    if all_passed:
+        counts = {status: sum(1 for r in parallel if r.status == status)
+                  for status in ('changed', 'unchanged', 'errored')}
+        print(f"✓ PASS: {len(parallel)} files {counts}\n")
+    return all_passed
+
+
+def test_errored_file_reported():
+    """A file that can't be processed is reported, not raised."""
+    print("=" * 70)
+    print("TEST: unreadable file is reported as errored")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        missing = Path(tmpdir) / "20250101W.sxiva"
+        results = list(recalculate_files([missing], jobs=1))
+
+    if len(results) != 1 or results[0].status != 'errored' or not results[0].error:
+        print(f"✗ FAIL: got {results}")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_parallel_matches_serial():
+        all_passed = False
+
+    if not test_errored_file_reported():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL BATCH TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME BATCH TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
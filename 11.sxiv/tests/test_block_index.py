@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""Test the per-block index and the CLI commands that query it."""
+
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.block_index import BlockIndex, CONTINUES, ERROR_CHILD, IS_X
+from tools.sxiva.calculator import PointCalculator
+
+# Multi-byte text before the blocks shifts byte offsets away from character offsets
+SAMPLE = """Friday, February 15th, 2025 ✓✓
+{focus: [wr]}
+08:44 - [wr] initial work ~ --- 09:02 (-6,+1f,+1a=-4)
+x09:00 - [err] debugging issue [3] +
+09:12 + [wr] document fix [6], [sys] cleanup [3] --- 09:26
+09:24 - [wr] more --- junk
+"""
+
+
+def build_index(text):
+    source_bytes = text.encode('utf-8')
+    tree = PointCalculator().parser.parse(source_bytes)
+    return tree, BlockIndex.build(tree.root_node, source_bytes)
+
+
+def block_fields(calculator, index, row):
+    """Everything the calculator reads from a block's row."""
+    return (
+        index.start_time(row), index.end_time(row), index.points(row), index.error_text(row),
+        index.has_flag(row, IS_X), index.has_flag(row, CONTINUES), index.has_flag(row, ERROR_CHILD),
+        calculator.count_blicks(index, row), calculator.extract_categories(index, row),
+    )
+
+
+def run_cli(*args):
+    env = os.environ.copy()
+    env['SXIVA_NO_DAEMON'] = '1'
+    return subprocess.run(
+        [sys.executable, "-m", "tools.sxiva.cli", *args],
+        cwd=str(repo_root),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+
+
+def test_index_rows():
+    """Rows hold each block's times, points, flags and blicks."""
+    print("=" * 70)
+    print("TEST: block index rows")
+    print("=" * 70)
+
+    _, index = build_index(SAMPLE)
+    expected = [
+        ('time_block', 2, '08:44', '09:02', '(-6,+1f,+1a=-4)', 0, [('wr', 0)]),
+        ('time_block', 3, '09:00', None, None, IS_X | CONTINUES, [('err', 3)]),
+        ('continuation_block', 4, '09:12', '09:26', None, 0, [('wr', 6), ('sys', 3)]),
+        ('entry', 5, None, None, None, 0, []),
+    ]
+    actual = [
+        (index.type(row), index.line[row], index.start_time(row), index.end_time(row),
+         index.points(row), index.flags[row], index.blicks(row))
+        for row in index.rows()
+    ]
+
+    if actual != expected:
+        print("✗ FAIL:")
+        for row in actual:
+            print(f"    {row}")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def test_lazy_rows_match_build():
+    """Indexing blocks as they are looked up gives the same rows as building up front."""
+    print("=" * 70)
+    print("TEST: lazy lookup matches a full build")
+    print("=" * 70)
+
+    calculator = PointCalculator()
+    all_passed = True
+    for example in sorted((repo_root / "examples").glob("*.sxiva")):
+        source_bytes = example.read_bytes()
+        tree, index = build_index(example.read_text(encoding='utf-8'))
+        lazy = BlockIndex(source_bytes)
+
+        for node in tree.root_node.children:
+            if node.type not in ('time_block', 'continuation_block'):
+                continue
+            if block_fields(calculator, index, index.row(node)) != block_fields(calculator, lazy, lazy.row(node)):
+                print(f"✗ FAIL  - {example.name} line {node.start_point[0] + 1}")
+                all_passed = False
+                break
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_source_lines():
+    """source_line() returns the same lines as splitting the decoded source."""
+    print("=" * 70)
+    print("TEST: line index matches split lines")
+    print("=" * 70)
+
+    all_passed = True
+    for text in (SAMPLE, SAMPLE.rstrip('\n'), "", "\n\n", "✓\r\nx"):
+        index = BlockIndex(text.encode('utf-8'))
+        lines = text.split('\n')
+        actual = [index.source_line(n) for n in range(-1, len(lines) + 1)]
+        if actual != [None, *lines, None]:
+            print(f"✗ FAIL: {text!r} -> {actual}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_cli_commands():
+    """log-now, log-end and repeat-entry edit the right line after multi-byte text."""
+    print("=" * 70)
+    print("TEST: CLI commands find entries through the index")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "20250215.sxiva"
+
+        # log-now replaces the last end time (node offsets are bytes)
+        path.write_text(SAMPLE, encoding='utf-8')
+        result = run_cli("log-now", str(path))
+        line = path.read_text(encoding='utf-8').split('\n')[4]
+        if result.returncode != 0 or not line.startswith("09:12 + [wr] document fix [6], [sys] cleanup [3] --- ") \
+                or "09:26" in line:
+            print(f"✗ FAIL: log-now wrote {line!r}\n{result.stdout}{result.stderr}")
+            all_passed = False
+
+        # log-end cleans up the incomplete entry and logs the time
+        path.write_text(SAMPLE, encoding='utf-8')
+        result = run_cli("log-end", str(path))
+        line = path.read_text(encoding='utf-8').split('\n')[5]
+        if result.returncode != 0 or not line.startswith("09:24 - [wr] more --- ") or "junk" in line:
+            print(f"✗ FAIL: log-end wrote {line!r}\n{result.stdout}{result.stderr}")
+            all_passed = False
+
+        # repeat-entry duplicates the last entry, incomplete or not
+        path.write_text(SAMPLE, encoding='utf-8')
+        result = run_cli("repeat-entry", str(path))
+        line = path.read_text(encoding='utf-8').split('\n')[6]
+        if result.returncode != 0 or line != "09:36 - [wr] more ---":
+            print(f"✗ FAIL: repeat-entry wrote {line!r}\n{result.stdout}{result.stderr}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_index_rows():
+        all_passed = False
+
+    if not test_lazy_rows_match_build():
+        all_passed = False
+
+    if not test_source_lines():
+        all_passed = False
+
+    if not test_cli_commands():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL BLOCK INDEX TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME BLOCK INDEX TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -260,6 +260,49 @@ def test_empty_directory():
         return True
 
 
+def test_open_recalculation_opt_in():
+    """Opening a day recalculates the other files only with SXIVA_RECALC=1."""
+    print("=" * 70)
+    print("TEST: recalculation on open is opt-in (SXIVA_RECALC)")
+    print("=" * 70)
+
+    example = (repo_root / "examples" / "attributes-floating-point.sxiva").read_text()
+
+    for recalc, expect_fixed in ((None, False), ('1', True)):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmppath = Path(tmpdir)
+            other = tmppath / "20250301S.sxiva"
+            other.write_text(example)
+            (tmppath / "20250302U.sxiva").write_text(example)
+
+            env = os.environ.copy()
+            env.update({'SXIVA_DATA': str(tmppath), 'SXIVA_NO_SYNC': '1', 'SXIVA_NO_DAEMON': '1', 'EDITOR': 'true'})
+            env.pop('SXIVA_NO_RECALC', None)
+            env.pop('SXIVA_RECALC', None)
+            if recalc:
+                env['SXIVA_RECALC'] = recalc
+
+            result = subprocess.run(
+                [sys.executable, "-m", "tools.sxiva.cli", "-d", "20250302"],
+                cwd=str(repo_root),
+                env=env,
+                capture_output=True,
+                text=True
+            )
+
+            if result.returncode != 0:
+                print(f"✗ FAIL: open failed: {result.stderr}")
+                return False
+
+            fixed = other.read_text() != example
+            if fixed != expect_fixed:
+                print(f"✗ FAIL: SXIVA_RECALC={recalc}: other file {'rewritten' if fixed else 'untouched'}")
+                return False
+
+    print("✓ PASS: other files are only recalculated with SXIVA_RECALC=1\n")
+    return True
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 70)
@@ -276,6 +319,10 @@ def main():
     if not test_empty_directory():
         all_passed = False
 
+    # Test 3: Recalculation on open
+    if not test_open_recalculation_opt_in():
+        all_passed = False
+
     # Summary
     print("=" * 70)
     print("SUMMARY")
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""Test the `sxiva serve` daemon and the CLI's forwarding to it."""
+
+import io
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva import daemon
+from tools.sxiva.daemon import SxivaServer, forward
+from tools.sxiva.journal import SyncJournal
+
+examples_dir = repo_root / "examples"
+
+
+def run_forwarded(args, socket_path):
+    """Forward a command to the daemon, returning (exit_code, stdout, stderr)."""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        exit_code = forward(args, socket_path)
+    return exit_code, stdout.getvalue(), stderr.getvalue()
+
+
+def test_no_daemon_falls_back():
+    """forward() returns None when no daemon is listening."""
+    print("=" * 70)
+    print("TEST: no daemon -> in-process fallback")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        missing = Path(tmpdir) / "missing.sock"
+        if forward(['calculate', 'x.sxiva'], missing) is not None:
+            print("✗ FAIL: expected None without a socket")
+            return False
+
+        # A stale socket file with nobody listening also falls back
+        stale = Path(tmpdir) / "stale.sock"
+        server = SxivaServer(stale)
+        server.socket.close()
+        if forward(['calculate', 'x.sxiva'], stale) is not None:
+            print("✗ FAIL: expected None for a stale socket")
+            return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def test_no_answer_is_not_rerun():
+    """Once the request is sent, a daemon that doesn't answer is an error, not a fallback."""
+    print("=" * 70)
+    print("TEST: busy daemon -> error, command not run again")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = Path(tmpdir) / "busy.sock"
+        # Accepts connections but never answers (like a daemon busy with another request)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(str(socket_path))
+        listener.listen(1)
+
+        timeout = daemon.CLIENT_TIMEOUT
+        daemon.CLIENT_TIMEOUT = 0.2
+        try:
+            exit_code, _, stderr = run_forwarded(['repeat-entry', 'x.sxiva'], socket_path)
+        finally:
+            daemon.CLIENT_TIMEOUT = timeout
+            listener.close()
+
+    if exit_code != 1 or 'may or may not have run' not in stderr:
+        print(f"✗ FAIL: expected exit 1 with an error, got {exit_code} ({stderr.strip()!r})")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def test_socket_ownership():
+    """The socket is private from the start, and other users' sockets are refused."""
+    print("=" * 70)
+    print("TEST: socket permissions and ownership")
+    print("=" * 70)
+
+    all_passed = True
+    saved = {name: os.environ.pop(name, None) for name in ('SXIVA_SOCKET', 'XDG_RUNTIME_DIR')}
+    try:
+        default = daemon.default_socket_path()
+        if default.parent.name != f"sxiva-{os.getuid()}":
+            print(f"✗ FAIL: without XDG_RUNTIME_DIR the socket isn't in a private directory: {default}")
+            all_passed = False
+    finally:
+        for name, value in saved.items():
+            if value is not None:
+                os.environ[name] = value
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        socket_path = Path(tmpdir) / "sxiva.sock"
+        server = SxivaServer(socket_path)
+        mode = socket_path.stat().st_mode & 0o777
+        if mode != 0o600:
+            print(f"✗ FAIL: socket created with mode {oct(mode)}")
+            all_passed = False
+
+        if os.getuid() == 0:
+            # Someone else's socket (as root, hand this one to nobody)
+            os.chown(socket_path, 65534, -1)
+            exit_code, _, stderr = run_forwarded(['calculate', 'x.sxiva'], socket_path)
+            if exit_code is not None or 'another user' not in stderr:
+                print(f"✗ FAIL: forwarded to another user's socket (exit {exit_code})")
+                all_passed = False
+            try:
+                daemon.serve(socket_path)
+                print("✗ FAIL: serve used another user's socket")
+                all_passed = False
+            except RuntimeError:
+                pass
+        else:
+            print("  (not root: another user's socket not tested)")
+        server.server_close()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_client_environment():
+    """Forwarded commands run with the client's SXIVA_DATA/SXIVA_NO_SYNC/TZ."""
+    print("=" * 70)
+    print("TEST: forwarded commands use the client's environment")
+    print("=" * 70)
+
+    all_passed = True
+    saved = {name: os.environ.pop(name, None) for name in daemon.FORWARDED_ENV}
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir) / "data"
+            data_dir.mkdir()
+            day = data_dir / "20250301S.sxiva"
+            day.write_text((examples_dir / "attributes-floating-point.sxiva").read_text())
+
+            socket_path = Path(tmpdir) / "sxiva.sock"
+            server = SxivaServer(socket_path)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                # The daemon was started without SXIVA_DATA; the client has it
+                with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                    sock.connect(str(socket_path))
+                    sock.sendall((json.dumps({
+                        'args': ['calculate', '--fix', day.name],
+                        'cwd': str(data_dir),
+                        'env': {'SXIVA_DATA': str(data_dir), 'TZ': 'Asia/Tokyo'},
+                    }) + '\n').encode('utf-8'))
+                    sock.shutdown(socket.SHUT_WR)
+                    response = json.loads(sock.makefile().read())
+            finally:
+                server.shutdown()
+                server.server_close()
+
+            with SyncJournal(data_dir) as journal:
+                pending = [entry.date for entry in journal.pending()]
+            if response['exit_code'] != 0 or pending != ['2025-03-01']:
+                print(f"✗ FAIL: exit {response['exit_code']}, journaled {pending} ({response['stderr'].strip()})")
+                all_passed = False
+            leaked = {name: os.environ[name] for name in daemon.FORWARDED_ENV if name in os.environ}
+            if leaked:
+                print(f"✗ FAIL: daemon environment changed: {leaked}")
+                all_passed = False
+
+        # Times come from the client's TZ, without touching the daemon's
+        import click
+        from datetime import datetime, timezone
+        from tools.sxiva.cli import _now, cli
+
+        for tz, offset in (('UTC', 0), ('Asia/Tokyo', 9)):
+            with click.Context(cli, obj={'env': {'TZ': tz}}):
+                hours = (_now() - datetime.now(timezone.utc).replace(tzinfo=None)).total_seconds() / 3600
+            if round(hours) != offset:
+                print(f"✗ FAIL: TZ={tz} gave UTC{hours:+.1f}")
+                all_passed = False
+    finally:
+        for name, value in saved.items():
+            if value is not None:
+                os.environ[name] = value
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_daemon_matches_in_process():
+    """Fixing files through the daemon gives the same output as in-process."""
+    print("=" * 70)
+    print("TEST: daemon output matches in-process calculation")
+    print("=" * 70)
+
+    from tools.sxiva.calculator import PointCalculator
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        socket_path = tmppath / "sxiva.sock"
+        server = SxivaServer(socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+
+        try:
+            for example in sorted(examples_dir.glob("*.sxiva"))[:10]:
+                daemon_out = tmppath / f"daemon-{example.name}"
+                local_out = tmppath / f"local-{example.name}"
+
+                # Run twice so the second request goes through the tree cache
+                for _ in range(2):
+                    exit_code, _, stderr = run_forwarded(
+                        ['calculate', str(example), '-o', str(daemon_out)], socket_path
+                    )
+                    if exit_code != 0:
+                        break
+                PointCalculator().fix_file(str(example), output_path=str(local_out))
+
+                if exit_code != 0:
+                    print(f"✗ FAIL  - {example.name} (exit {exit_code}: {stderr.strip()})")
+                    all_passed = False
+                elif daemon_out.read_text(encoding='utf-8') != local_out.read_text(encoding='utf-8'):
+                    print(f"✗ FAIL  - {example.name} (output differs)")
+                    all_passed = False
+                else:
+                    print(f"✓ PASS  - {example.name}")
+
+            # Relative paths resolve against the client's working directory
+            exit_code, stdout, _ = run_forwarded(['calculate', 'no-such-file.sxiva'], socket_path)
+            if exit_code != 2 or stdout:
+                print(f"✗ FAIL  - missing file should be a usage error, got exit {exit_code}")
+                all_passed = False
+
+            # Commands the daemon doesn't serve are rejected
+            exit_code, _, stderr = run_forwarded(['serve'], socket_path)
+            if exit_code != 2 or 'not served' not in stderr:
+                print(f"✗ FAIL  - 'serve' should not be forwarded, got exit {exit_code}")
+                all_passed = False
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        if socket_path.exists():
+            print("✗ FAIL  - socket not removed on shutdown")
+            all_passed = False
+
+    if all_passed:
+        print()
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_no_daemon_falls_back():
+        all_passed = False
+
+    if not test_no_answer_is_not_rerun():
+        all_passed = False
+
+    if not test_socket_ownership():
+        all_passed = False
+
+    if not test_client_environment():
+        all_passed = False
+
+    if not test_daemon_matches_in_process():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL DAEMON TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME DAEMON TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""Test the columnar day cache and its use by sync."""
+
+import json
+import shutil
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.day_cache import DayCache
+from tools.sxiva.manifest import file_digest
+from tools.sxiva.parser_extractor import SxivaDataExtractor
+from tools.sxiva.stats import cache_stats
+from tools.sxiva.sync import SxivaSyncClient
+
+examples_dir = repo_root / "examples"
+
+
+def make_data_dir(tmpdir, count=None):
+    """Copy the examples into tmpdir as consecutive dated files (newest first)."""
+    examples = sorted(examples_dir.glob("*.sxiva"))[:count]
+    paths = []
+    start = date(2025, 3, 1)
+    for i, example in enumerate(examples):
+        day = start + timedelta(days=len(examples) - i)
+        path = Path(tmpdir) / f"{day:%Y%m%d}{'MTWRFSU'[day.weekday()]}.sxiva"
+        shutil.copy(example, path)
+        paths.append(path)
+    return paths
+
+
+def test_round_trip():
+    """Payloads come back from disk exactly as the extractor built them."""
+    print("=" * 70)
+    print("TEST: cached payloads match extracted payloads")
+    print("=" * 70)
+
+    extractor = SxivaDataExtractor()
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_data_dir(tmpdir)
+        expected = {path.name: extractor.extract_from_file(path) for path in paths}
+
+        cache = DayCache.load(tmpdir)
+        for path in paths:
+            cache.put(path.name, file_digest(path), expected[path.name])
+        cache.save()
+
+        loaded = DayCache.load(tmpdir)
+        if len(loaded) != len(paths):
+            print(f"✗ FAIL: {len(loaded)} rows loaded, expected {len(paths)}")
+            all_passed = False
+        for path in paths:
+            if loaded.get(path.name, file_digest(path)) != expected[path.name]:
+                print(f"✗ FAIL  - {path.name}")
+                all_passed = False
+
+        dates = [day['date'] for day in loaded.payloads()]
+        if dates != sorted(dates):
+            print("✗ FAIL: payloads not in date order")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_incremental_update():
+    """Only new and changed files are extracted; removed files are dropped."""
+    print("=" * 70)
+    print("TEST: incremental update")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_data_dir(tmpdir, count=12)
+
+        def update(file_paths):
+            cache = DayCache.load(tmpdir)
+            extracted = cache.update(file_paths, jobs=1)
+            cache.save()
+            return extracted, cache
+
+        checks = []
+        checks.append(('first run', update(paths)[0], len(paths)))
+        checks.append(('unchanged', update(paths)[0], 0))
+
+        paths[3].write_text(paths[3].read_text(encoding='utf-8') + "\n", encoding='utf-8')
+        checks.append(('one file edited', update(paths)[0], 1))
+
+        extracted, cache = update(paths[1:])
+        checks.append(('one file left out', extracted, 0))
+        checks.append(('rows of files left out', len(cache), len(paths)))
+
+        cache.retain(p.name for p in paths[1:])
+        cache.save()
+        checks.append(('rows after removal', len(DayCache.load(tmpdir)), len(paths) - 1))
+
+        # Another extractor version invalidates the whole cache
+        cache_path = Path(tmpdir) / ".sxiva-days.bin"
+        header, _, body = cache_path.read_bytes().partition(b'\n')
+        header = json.loads(header)
+        header['extractor_version'] = 'old'
+        cache_path.write_bytes(json.dumps(header).encode('utf-8') + b'\n' + body)
+        checks.append(('extractor changed', update(paths[1:])[0], len(paths) - 1))
+
+        for label, actual, expected in checks:
+            if actual != expected:
+                print(f"✗ FAIL: {label}: {actual}, expected {expected}")
+                all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_uncacheable_change_drops_row():
+    """A file whose new content can't be cached loses its row instead of keeping the old payload."""
+    print("=" * 70)
+    print("TEST: uncacheable new content drops the row")
+    print("=" * 70)
+
+    extractor = SxivaDataExtractor()
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_data_dir(tmpdir, count=3)
+        cache = DayCache.load(tmpdir)
+        cache.update(paths, jobs=1)
+        edited = paths[1]
+        stale = extractor.extract_from_file(edited)
+
+        # Unextractable (None) and uncacheable (fractional minutes) new content
+        for label, data in (('unextractable', None), ('uncacheable', dict(stale, category_minutes={'wr': 1.5}))):
+            edited.write_text(edited.read_text(encoding='utf-8') + "\n", encoding='utf-8')
+            cache.put(edited.name, file_digest(edited), data)
+            cache.save()
+
+            loaded = DayCache.load(tmpdir)
+            dates = [row['date'] for row in cache_stats(loaded)]
+            if edited.name in loaded.names or stale['date'] in dates:
+                print(f"✗ FAIL: {label}: stale payload of {edited.name} still served")
+                all_passed = False
+            elif len(loaded) != len(paths) - 1:
+                print(f"✗ FAIL: {label}: {len(loaded)} rows, expected {len(paths) - 1}")
+                all_passed = False
+
+            # Valid again: cached again
+            cache.update(paths, jobs=1)
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_selection_keeps_other_rows():
+    """Caching one selection of files doesn't evict the rows of another."""
+    print("=" * 70)
+    print("TEST: one selection doesn't evict another")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_data_dir(tmpdir, count=6)
+        cache = DayCache.load(tmpdir)
+        cache.update(paths, jobs=1)
+
+        # e.g. `sxiva stats` caching the last file per date after a bulk import
+        selected = paths[::2]
+        if cache.update(selected, jobs=1) != 0 or len(cache) != len(paths):
+            print(f"✗ FAIL: updating {len(selected)} files left {len(cache)} of {len(paths)} rows")
+            all_passed = False
+
+        names = [p.name for p in selected]
+        expected = sorted(SxivaDataExtractor().extract_from_file(p)['date'] for p in selected)
+        dates = [row['date'] for row in cache_stats(cache, names=names)]
+        if dates != expected:
+            print(f"✗ FAIL: stats over the selection gave {dates}, expected {expected}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_sync_reads_cache():
+    """The sync client takes cached payloads without loading the parser."""
+    print("=" * 70)
+    print("TEST: sync extracts from the day cache")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        paths = make_data_dir(tmpdir, count=3)
+        cache = DayCache.load(tmpdir)
+        cache.update(paths, jobs=1)
+
+        client = SxivaSyncClient(api_url='http://localhost:1')
+        client.cache = cache
+        expected = SxivaDataExtractor().extract_from_file(paths[0])
+        if client.extract(paths[0]) != expected:
+            print("✗ FAIL: cached payload differs")
+            all_passed = False
+        if client.extractor._parser is not None:
+            print("✗ FAIL: parser loaded for a cached file")
+            all_passed = False
+
+        # A changed file is parsed again, and the cache takes the new payload
+        paths[0].write_text(paths[1].read_text(encoding='utf-8'), encoding='utf-8')
+        data = client.extract(paths[0])
+        if data is None or not cache.has(paths[0].name, file_digest(paths[0])):
+            print("✗ FAIL: changed file not re-extracted into the cache")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_round_trip():
+        all_passed = False
+
+    if not test_incremental_update():
+        all_passed = False
+
+    if not test_uncacheable_change_drops_row():
+        all_passed = False
+
+    if not test_selection_keeps_other_rows():
+        all_passed = False
+
+    if not test_sync_reads_cache():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL DAY CACHE TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME DAY CACHE TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
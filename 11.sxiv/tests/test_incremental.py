@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""Test that incremental fix_file produces the same output as a full recalculation."""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva import calculator as calculator_module
+from tools.sxiva.block_index import BlockIndex
+from tools.sxiva.calculator import PointCalculator
+
+examples_dir = repo_root / "examples"
+
+
+def edits_for(lines):
+    """Yield a sequence of edited versions of a file's lines.
+
+    Covers edits at the start, middle and end of the file: changing a time
+    digit, deleting a line, duplicating a line and appending a new block.
+    """
+    n = len(lines)
+    positions = sorted({1, n // 3, n // 2, (2 * n) // 3, max(n - 2, 0)})
+    current = list(lines)
+    for pos in positions:
+        if pos >= len(current):
+            continue
+        line = current[pos]
+        # Change the last digit on the line (e.g. an end time)
+        digits = [i for i, ch in enumerate(line) if ch.isdigit()]
+        if digits:
+            i = digits[-1]
+            current[pos] = line[:i] + str((int(line[i]) + 1) % 10) + line[i + 1:]
+            yield list(current)
+        # Duplicate the line, then delete the duplicate again
+        current.insert(pos, current[pos])
+        yield list(current)
+        del current[pos]
+        yield list(current)
+    current.append("23:00 - [wr] late block ~--- 23:12")
+    yield list(current)
+
+
+def index_columns(index):
+    """Every column of a BlockIndex, for comparing two indexes."""
+    return {name: list(value) if hasattr(value, 'typecode') else value
+            for name, value in vars(index).items() if name != '_line_starts'}
+
+
+def test_incremental_matches_full():
+    """Every edit of every example fixes identically in incremental and full mode."""
+    print("=" * 70)
+    print("TEST: incremental fix_file matches full recalculation")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmppath = Path(tmpdir)
+        for example in sorted(examples_dir.glob("*.sxiva")):
+            source_file = tmppath / example.name
+            incremental_out = tmppath / f"incremental-{example.name}"
+            full_out = tmppath / f"full-{example.name}"
+
+            lines = example.read_text(encoding='utf-8').split('\n')
+            incremental = PointCalculator(incremental=True)
+
+            for step, edited in enumerate([lines] + list(edits_for(lines))):
+                source_file.write_text('\n'.join(edited), encoding='utf-8')
+                incremental.fix_file(str(source_file), output_path=str(incremental_out))
+                PointCalculator().fix_file(str(source_file), output_path=str(full_out))
+
+                if incremental_out.read_text(encoding='utf-8') != full_out.read_text(encoding='utf-8'):
+                    print(f"✗ FAIL  - {example.name} (edit {step})")
+                    all_passed = False
+                    break
+
+                # Rows carried over from the last edit match a fresh index
+                cache = incremental._parse_cache[str(source_file.resolve())]
+                fresh = BlockIndex.build(cache.tree.root_node, cache.source_bytes)
+                if index_columns(cache.index) != index_columns(fresh):
+                    print(f"✗ FAIL  - {example.name} (edit {step}): block index differs from a full build")
+                    all_passed = False
+                    break
+            else:
+                print(f"✓ PASS  - {example.name}")
+
+    return all_passed
+
+
+def test_resumes_after_unchanged_prefix():
+    """An edit near the end of a file resumes calculation from a late checkpoint."""
+    print("=" * 70)
+    print("TEST: incremental calculation resumes after the unchanged prefix")
+    print("=" * 70)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source_file = Path(tmpdir) / "20251226F.sxiva"
+        content = (examples_dir / "full-day.sxiva").read_text(encoding='utf-8')
+        source_file.write_text(content, encoding='utf-8')
+
+        calculator = PointCalculator(incremental=True)
+        calculator.fix_file(str(source_file), dry_run=True)
+        cache = calculator._parse_cache[str(source_file.resolve())]
+        total = len(cache.checkpoints)
+
+        # Append to the cleaned source: everything before it can be reused
+        _, _, resume, _, _ = calculator.incremental_parse(
+            str(source_file.resolve()), cache.source_bytes + b'\n\n'
+        )
+
+        if resume is None or resume[0].index < total // 2:
+            print(f"✗ FAIL: expected to resume past node {total // 2}, got {resume and resume[0].index}")
+            return False
+
+    print(f"✓ PASS: resumed at node {resume[0].index} of {total}\n")
+    return True
+
+
+def test_parse_cache_is_bounded():
+    """Only the most recently fixed files keep their parse."""
+    print("=" * 70)
+    print("TEST: parse cache keeps the most recent files")
+    print("=" * 70)
+
+    saved = calculator_module.PARSE_CACHE_SIZE
+    calculator_module.PARSE_CACHE_SIZE = 3
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            content = (examples_dir / "full-day.sxiva").read_text(encoding='utf-8')
+            paths = []
+            for day in range(1, 6):
+                path = Path(tmpdir) / f"202510{day:02d}.sxiva"
+                path.write_text(content, encoding='utf-8')
+                paths.append(path)
+
+            calculator = PointCalculator(incremental=True)
+            for path in paths[:4] + paths[:1] + paths[4:]:
+                calculator.fix_file(str(path), dry_run=True)
+
+            cached = [Path(key).name for key in calculator._parse_cache]
+            expected = [paths[i].name for i in (3, 0, 4)]
+            if cached != expected:
+                print(f"✗ FAIL: cached {cached}, expected {expected}")
+                return False
+    finally:
+        calculator_module.PARSE_CACHE_SIZE = saved
+
+    print("✓ PASS\n")
+    return True
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_incremental_matches_full():
+        all_passed = False
+
+    if not test_resumes_after_unchanged_prefix():
+        all_passed = False
+
+    if not test_parse_cache_is_bounded():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL INCREMENTAL TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME INCREMENTAL TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
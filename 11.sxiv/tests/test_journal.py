@@ -0,0 +1,304 @@
+#!/usr/bin/env python3
+"""Test the offline sync journal: journaling edits, coalescing, and flushing."""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.journal import JOURNAL_FILENAME, SyncJournal, flush, start_flusher, stop_flusher
+from tools.sxiva.manifest import Manifest, file_digest
+from tools.sxiva.sync import SxivaSyncClient
+
+from test_sync import FakeDashboard
+
+examples_dir = repo_root / "examples"
+
+
+def day(date_str, minutes):
+    """A minimal day payload"""
+    return {'date': date_str, 'day_of_week': 'M', 'category_minutes': {'bkc': minutes}}
+
+
+def client_for(url, **kwargs):
+    return SxivaSyncClient(api_url=url, api_token='t', batch_size=2, backoff=0, **kwargs)
+
+
+def pending_dates(data_dir):
+    with SyncJournal(data_dir) as journal:
+        return len(journal)
+
+
+def run_cli(args, data_dir):
+    """Run the CLI in-process (no daemon) with $SXIVA_DATA set to data_dir."""
+    env = os.environ.copy()
+    env['SXIVA_DATA'] = str(data_dir)
+    env['SXIVA_SOCKET'] = str(Path(data_dir) / 'no-daemon.sock')
+    env.pop('SXIVA_NO_SYNC', None)
+    return subprocess.run([sys.executable, "-m", "tools.sxiva.cli"] + args,
+                          cwd=str(repo_root), env=env, capture_output=True, text=True)
+
+
+def test_coalescing():
+    """Only the latest edit of each date is pending; newer edits survive a discard."""
+    print("=" * 70)
+    print("TEST: edits to the same date coalesce")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        with SyncJournal(tmpdir) as journal:
+            for minutes in (10, 20, 30):
+                journal.append('20250302U.sxiva', 'a', day('2025-03-02', minutes))
+            journal.append('20250301S.sxiva', 'b', day('2025-03-01', 5))
+
+            entries = journal.pending()
+            if len(journal) != 2 or [(e.date, e.data['category_minutes']['bkc']) for e in entries] != \
+                    [('2025-03-01', 5), ('2025-03-02', 30)]:
+                print(f"✗ FAIL: pending {entries}")
+                all_passed = False
+
+            # An edit journaled while the batch was uploading is kept
+            journal.append('20250302U.sxiva', 'c', day('2025-03-02', 40))
+            journal.discard(entries)
+            remaining = journal.pending()
+            if [(e.digest, e.data['category_minutes']['bkc']) for e in remaining] != [('c', 40)]:
+                print(f"✗ FAIL: after discard {remaining}")
+                all_passed = False
+
+        # The journal persists across opens
+        with SyncJournal(tmpdir) as journal:
+            if len(journal) != 1:
+                print(f"✗ FAIL: reopened journal has {len(journal)} dates")
+                all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_cli_journals_edits():
+    """calculate --fix journals files in $SXIVA_DATA only."""
+    print("=" * 70)
+    print("TEST: calculate --fix writes the journal")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir, tempfile.TemporaryDirectory() as elsewhere:
+        data_dir = Path(tmpdir)
+        example = sorted(examples_dir.glob("*.sxiva"))[0]
+        target = data_dir / "20250301S.sxiva"
+        shutil.copy(example, target)
+        shutil.copy(example, Path(elsewhere) / "20250302U.sxiva")
+
+        for _ in range(2):
+            result = run_cli(["calculate", str(target), "--fix"], data_dir)
+            if result.returncode != 0:
+                print(f"✗ FAIL: calculate --fix exited {result.returncode}: {result.stderr}")
+                return False
+        run_cli(["calculate", str(Path(elsewhere) / "20250302U.sxiva"), "--fix"], data_dir)
+
+        with SyncJournal(data_dir) as journal:
+            entries = journal.pending()
+        if [(e.file_name, e.digest) for e in entries] != [(target.name, file_digest(target))]:
+            print(f"✗ FAIL: journal holds {entries}")
+            all_passed = False
+        elif entries[0].data['date'] != '2025-03-01' or not entries[0].data['category_minutes']:
+            print(f"✗ FAIL: payload {entries[0].data}")
+            all_passed = False
+        if (Path(elsewhere) / JOURNAL_FILENAME).exists():
+            print("✗ FAIL: journaled a file outside $SXIVA_DATA")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_flush():
+    """Offline flushes keep the journal; online ones upload each date once and mark it synced."""
+    print("=" * 70)
+    print("TEST: flush uploads pending days once")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        names = []
+        with SyncJournal(data_dir) as journal:
+            for i in range(5):
+                name = f"2025030{i + 1}.sxiva"
+                (data_dir / name).write_text(f"edit {i}\n")
+                names.append(name)
+                for minutes in (10, 20):
+                    journal.append(name, file_digest(data_dir / name), day(f"2025-03-0{i + 1}", minutes))
+
+        # Offline: nothing flushed, nothing lost
+        server = FakeDashboard()
+        url = server.url
+        server.stop()
+        if flush(data_dir, client_for(url, retries=0)) != 0 or pending_dates(data_dir) != 5:
+            print("✗ FAIL: offline flush lost entries")
+            all_passed = False
+
+        server = FakeDashboard(delay=0)
+        try:
+            client = client_for(server.url)
+            flushed = flush(data_dir, client)
+            if flushed != 5 or sorted(server.days) != [f"2025-03-0{i + 1}" for i in range(5)]:
+                print(f"✗ FAIL: flushed {flushed}, server got {server.days}")
+                all_passed = False
+            if server.batch_requests != 3 or pending_dates(data_dir) != 0:
+                print(f"✗ FAIL: {server.batch_requests} requests, journal not drained")
+                all_passed = False
+
+            # Flushed files are up to date for sync_all
+            manifest = Manifest.load(data_dir)
+            if not all(manifest.is_synced(server.url, name, file_digest(data_dir / name)) for name in names):
+                print("✗ FAIL: flushed files not marked synced")
+                all_passed = False
+            if flush(data_dir, client) != 0 or server.batch_requests != 3:
+                print("✗ FAIL: empty journal was flushed again")
+                all_passed = False
+        finally:
+            server.stop()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_background_flusher():
+    """The flusher drains a journal as soon as it's woken."""
+    print("=" * 70)
+    print("TEST: background flusher")
+    print("=" * 70)
+
+    all_passed = True
+    server = FakeDashboard(delay=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            flusher = start_flusher(client_for(server.url), interval=60)
+            try:
+                with SyncJournal(data_dir) as journal:
+                    journal.append('20250301.sxiva', None, day('2025-03-01', 10))
+                flusher.wake(data_dir)
+
+                deadline = time.time() + 5
+                while server.days != ['2025-03-01'] and time.time() < deadline:
+                    time.sleep(0.01)
+                if server.days != ['2025-03-01']:
+                    print(f"✗ FAIL: server got {server.days}")
+                    all_passed = False
+            finally:
+                stop_flusher()
+            if flusher.is_alive():
+                print("✗ FAIL: flusher still running after stop")
+                all_passed = False
+    finally:
+        server.stop()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+class FailingOnceClient(SxivaSyncClient):
+    """Sync client whose first upload fails with an unexpected error."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.failed = False
+
+    def upload(self, days, verbose=False):
+        if not self.failed:
+            self.failed = True
+            raise ValueError("unexpected response")
+        return super().upload(days, verbose=verbose)
+
+
+def test_flusher_survives_errors():
+    """An unexpected error in one flush doesn't stop the background flusher."""
+    print("=" * 70)
+    print("TEST: background flusher survives unexpected errors")
+    print("=" * 70)
+
+    all_passed = True
+    server = FakeDashboard(delay=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            client = FailingOnceClient(api_url=server.url, api_token='t', batch_size=2, backoff=0)
+            flusher = start_flusher(client, interval=60)
+            try:
+                with SyncJournal(data_dir) as journal:
+                    journal.append('20250301.sxiva', None, day('2025-03-01', 10))
+                flusher.wake(data_dir)
+
+                deadline = time.time() + 5
+                while not client.failed and time.time() < deadline:
+                    time.sleep(0.01)
+                time.sleep(0.05)
+                if not flusher.is_alive():
+                    print("✗ FAIL: flusher died on an unexpected error")
+                    all_passed = False
+
+                # The next wake flushes what the failed attempt left journaled
+                flusher.wake(data_dir)
+                deadline = time.time() + 5
+                while server.days != ['2025-03-01'] and time.time() < deadline:
+                    time.sleep(0.01)
+                if server.days != ['2025-03-01']:
+                    print(f"✗ FAIL: server got {server.days}")
+                    all_passed = False
+            finally:
+                stop_flusher()
+    finally:
+        server.stop()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_coalescing():
+        all_passed = False
+
+    if not test_cli_journals_edits():
+        all_passed = False
+
+    if not test_flush():
+        all_passed = False
+
+    if not test_background_flusher():
+        all_passed = False
+
+    if not test_flusher_survives_errors():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL JOURNAL TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME JOURNAL TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test that files full of syntax errors are processed in linear time."""
+
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.calculator import PointCalculator
+
+NUM_LINES = 500
+RUNS = 3
+
+# Twice the lines should take about twice as long; a rescan of the whole file
+# per ERROR node takes about four times as long
+MAX_RATIO = 3.0
+
+
+def malformed_file(num_lines):
+    """A day of blocks that each hold an ERROR node (a doubled ~)."""
+    lines = ["Saturday, February 15th, 2025", ""]
+    for k in range(num_lines):
+        hour, minute = (k // 5) % 24, (k % 5) * 12
+        # Long lines make a per-error rescan of the file stand out
+        subject = "notes " * 200
+        lines.append(f"{hour:02d}:{minute:02d} - [wr] task {k} {subject}~ ~ --- {hour:02d}:{minute + 12:02d}")
+    return "\n".join(lines) + "\n"
+
+
+def best_time(calculator, file_path):
+    """Fastest of RUNS dry-run analyses, in seconds."""
+    times = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        calculator.analyze_file(str(file_path), dry_run=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def test_errors_reported():
+    """Every malformed line but the last is reported as a syntax error.
+
+    The last one is followed by a blank line, so it counts as being edited.
+    """
+    print("=" * 70)
+    print(f"TEST: {NUM_LINES} malformed lines are each reported")
+    print("=" * 70)
+
+    calculator = PointCalculator()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "20250215S.sxiva"
+        path.write_text(malformed_file(NUM_LINES), encoding='utf-8')
+        issues = calculator.calculate_file(str(path))
+
+    errors = [issue for issue in issues if issue[2].startswith("[ERROR] syntax error")]
+    if len(errors) != NUM_LINES - 1:
+        print(f"✗ FAIL: {len(errors)} syntax errors reported, expected {NUM_LINES - 1}")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def test_linear_runtime():
+    """Doubling the number of malformed lines roughly doubles the runtime."""
+    print("=" * 70)
+    print(f"TEST: runtime with {NUM_LINES // 2} vs {NUM_LINES} malformed lines")
+    print("=" * 70)
+
+    calculator = PointCalculator()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        half = Path(tmpdir) / "20250215S.sxiva"
+        full = Path(tmpdir) / "20250216U.sxiva"
+        half.write_text(malformed_file(NUM_LINES // 2), encoding='utf-8')
+        full.write_text(malformed_file(NUM_LINES), encoding='utf-8')
+
+        calculator.analyze_file(str(half), dry_run=True)  # Warm up
+        half_time = best_time(calculator, half)
+        full_time = best_time(calculator, full)
+
+    ratio = full_time / half_time
+    print(f"  {NUM_LINES // 2} lines: {half_time * 1000:.1f} ms")
+    print(f"  {NUM_LINES} lines: {full_time * 1000:.1f} ms ({ratio:.2f}x)")
+
+    if ratio > MAX_RATIO:
+        print(f"✗ FAIL: runtime grew {ratio:.2f}x for 2x the lines (max {MAX_RATIO}x)")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_errors_reported():
+        all_passed = False
+
+    if not test_linear_runtime():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL MALFORMED LINE TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME MALFORMED LINE TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
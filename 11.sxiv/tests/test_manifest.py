@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Test the content-hash manifest used to skip unchanged files."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.batch import recalculate_files
+from tools.sxiva.manifest import MANIFEST_FILENAME, Manifest
+from tools.sxiva.sync import SxivaSyncClient
+
+examples_dir = repo_root / "examples"
+
+# Dated examples (sync only considers YYYYMMDD-named files)
+DATED_EXAMPLES = ["20251129S.sxiva", "20251226F.sxiva"]
+
+
+class RecordingSyncClient(SxivaSyncClient):
+    """Sync client that records uploads instead of sending them."""
+
+    def __init__(self):
+        super().__init__(api_url='http://test.invalid')
+        self.uploaded = []
+
+    def sync_batch(self, file_paths, verbose=False):
+        self.uploaded.extend(p.name for p in file_paths)
+        return list(file_paths)
+
+
+def statuses(results):
+    return {r.name: r.status for r in results}
+
+
+def test_recalculation_skips_unchanged():
+    """Only files whose bytes changed since the last recalculation are processed."""
+    print("=" * 70)
+    print("TEST: recalculation skips files with unchanged content")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        for example in sorted(examples_dir.glob("*.sxiva"))[:12]:
+            shutil.copy(example, data_dir / example.name)
+        files = sorted(data_dir.glob("*.sxiva"))
+
+        manifest = Manifest.load(data_dir)
+        first = statuses(recalculate_files(files, jobs=1, manifest=manifest))
+        manifest.save()
+        if 'skipped' in first.values():
+            print(f"✗ FAIL: first run skipped files: {first}")
+            all_passed = False
+
+        # Second run: nothing changed
+        manifest = Manifest.load(data_dir)
+        second = statuses(recalculate_files(files, jobs=1, manifest=manifest))
+        manifest.save()
+        if set(second.values()) != {'skipped'}:
+            print(f"✗ FAIL: second run processed files: {second}")
+            all_passed = False
+
+        # A touched-but-identical file stays skipped; an edited one is processed
+        os.utime(files[0])
+        edited = files[1]
+        edited.write_text(edited.read_text(encoding='utf-8') + "\n\n", encoding='utf-8')
+        manifest = Manifest.load(data_dir)
+        third = statuses(recalculate_files(files, jobs=1, manifest=manifest))
+        manifest.save()
+        processed = sorted(name for name, status in third.items() if status != 'skipped')
+        if processed != [edited.name]:
+            print(f"✗ FAIL: expected only {edited.name} processed, got {processed}")
+            all_passed = False
+
+        # A different calculator version invalidates everything
+        manifest_path = data_dir / MANIFEST_FILENAME
+        data = json.loads(manifest_path.read_text(encoding='utf-8'))
+        data['calculator_version'] = 'old'
+        manifest_path.write_text(json.dumps(data), encoding='utf-8')
+        manifest = Manifest.load(data_dir)
+        fourth = statuses(recalculate_files(files, jobs=1, manifest=manifest))
+        if 'skipped' in fourth.values():
+            print(f"✗ FAIL: version change did not invalidate: {fourth}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_sync_skips_unchanged():
+    """Sync uploads files by content change, not by mtime."""
+    print("=" * 70)
+    print("TEST: sync skips files with unchanged content")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        for name in DATED_EXAMPLES:
+            shutil.copy(examples_dir / name, data_dir / name)
+        first, second = [data_dir / name for name in DATED_EXAMPLES]
+        last_sync = datetime.now() + timedelta(hours=1)
+
+        # First run: no hashes for this server yet, seeded from mtime
+        client = RecordingSyncClient()
+        client.sync_all(data_dir, last_sync)
+        if client.uploaded:
+            print(f"✗ FAIL: seeding run uploaded {client.uploaded}")
+            all_passed = False
+
+        # mtime bump without a content change: nothing to upload
+        os.utime(first, (first.stat().st_atime, last_sync.timestamp() + 60))
+        # content change with an old mtime: uploaded anyway
+        second.write_text(second.read_text(encoding='utf-8') + "\n", encoding='utf-8')
+        os.utime(second, (second.stat().st_atime, 0))
+
+        client = RecordingSyncClient()
+        result = client.sync_all(data_dir, last_sync)
+        if client.uploaded != [second.name] or result['skipped'] != 1:
+            print(f"✗ FAIL: expected only {second.name}, got {client.uploaded} ({result})")
+            all_passed = False
+
+        # Server without any previous sync gets everything
+        client = RecordingSyncClient()
+        client.sync_all(data_dir, None)
+        if sorted(client.uploaded) != sorted(DATED_EXAMPLES):
+            print(f"✗ FAIL: expected a full sync, got {client.uploaded}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_recalculation_skips_unchanged():
+        all_passed = False
+
+    if not test_sync_skips_unchanged():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL MANIFEST TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME MANIFEST TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
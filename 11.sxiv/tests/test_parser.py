@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test that parser setup is shared per process and parsers are per thread."""
+
+import sys
+import threading
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.parser import SxivaParser, get_language, get_query
+
+examples_dir = repo_root / "examples"
+
+
+def test_language_shared():
+    """Every SxivaParser uses the one Language and compiled queries."""
+    print("=" * 70)
+    print("TEST: Language and queries are loaded once per process")
+    print("=" * 70)
+
+    first, second = SxivaParser(), SxivaParser()
+    if not (first.language is second.language is get_language()):
+        print("✗ FAIL: parsers have different Language objects")
+        return False
+    if not (first.query('layout') is second.query('layout') is get_query('layout')):
+        print("✗ FAIL: query compiled more than once")
+        return False
+    if first.parser is not second.parser:
+        print("✗ FAIL: parsers in the same thread don't share a tree-sitter Parser")
+        return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def test_parsers_per_thread():
+    """Threads parsing at the same time each get their own Parser and the same trees."""
+    print("=" * 70)
+    print("TEST: concurrent parsing uses one Parser per thread")
+    print("=" * 70)
+
+    sources = [path.read_bytes() for path in sorted(examples_dir.glob("*.sxiva"))]
+    expected = [str(SxivaParser().parse(source).root_node) for source in sources]
+
+    num_threads = 4
+    parsers = [None] * num_threads
+    results = [None] * num_threads
+    start = threading.Barrier(num_threads)
+
+    def parse_all(i):
+        parser = SxivaParser()
+        start.wait()
+        results[i] = [str(parser.parse(source).root_node) for source in sources]
+        parsers[i] = parser.parser
+
+    threads = [threading.Thread(target=parse_all, args=(i,)) for i in range(num_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    all_passed = True
+    if len({id(parser) for parser in parsers}) != num_threads:
+        print("✗ FAIL: threads shared a tree-sitter Parser")
+        all_passed = False
+    if any(result != expected for result in results):
+        print("✗ FAIL: concurrent parses differ from serial parses")
+        all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_language_shared():
+        all_passed = False
+
+    if not test_parsers_per_thread():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL PARSER TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME PARSER TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test the tree-sitter queries used by the calculator and extractor."""
+
+import sys
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.parser import SxivaParser, in_tree_order
+from tools.sxiva.parser_extractor import SxivaDataExtractor
+
+examples_dir = repo_root / "examples"
+
+
+def walk(node, node_types, found):
+    """Collect nodes of the given types in depth-first order (the old way)."""
+    if node.type in node_types:
+        found.append(node)
+    for child in node.children:
+        walk(child, node_types, found)
+    return found
+
+
+def test_layout_captures_in_tree_order():
+    """Layout captures, sorted, visit the same nodes in the same order as a walk."""
+    print("=" * 70)
+    print("TEST: layout captures match a depth-first walk")
+    print("=" * 70)
+
+    parser = SxivaParser()
+    all_passed = True
+    for example in sorted(examples_dir.rglob("*.sxiva")):
+        tree = parser.parse(example.read_bytes())
+        root = tree.root_node
+        captured = [n for n in parser.captures('layout', root).get('line', []) if n != root]
+        node_types = {n.type for n in captured}
+
+        expected = [n for child in root.children for n in walk(child, node_types, [])]
+        if in_tree_order(captured) != expected:
+            print(f"✗ FAIL  - {example.relative_to(examples_dir)}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_extract_first_sections():
+    """Only the first {summary} and {attributes} sections are extracted."""
+    print("=" * 70)
+    print("TEST: extraction reads the first summary and attributes sections")
+    print("=" * 70)
+
+    content = (
+        "{summary}\n    [wr] - 00:40\n    [sys] - 01:05\n\n"
+        "{attributes}\n    [sleep] 72 5.5 ✓\n    [alc] 1 ✓\n\n"
+        "{summary}\n    [wr] - 09:00\n\n"
+        "{attributes}\n    [alc] 9 ✓\n"
+    )
+    extractor = SxivaDataExtractor()
+    sections = extractor.parser.captures('extract', extractor.parser.parse(content).root_node)
+
+    summary = extractor._extract_summary(sections, content)
+    attributes = extractor._extract_attributes(sections, content)
+
+    all_passed = True
+    if summary != {'wr': 40, 'sys': 65}:
+        print(f"✗ FAIL: summary {summary}")
+        all_passed = False
+    if (attributes['sleep_score'], attributes['alc']) != (72, 1.0):
+        print(f"✗ FAIL: attributes {attributes}")
+        all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_layout_captures_in_tree_order():
+        all_passed = False
+
+    if not test_extract_first_sections():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL QUERY TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME QUERY TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
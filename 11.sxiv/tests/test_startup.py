@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""Test that quick CLI paths start without tree-sitter or requests.
+
+Runs the CLI under `python -X importtime` and checks which modules each path
+imported. The CLI's import time is only reported, since wall-clock times
+vary on loaded machines; set SXIVA_IMPORT_BUDGET_MS to also enforce a budget.
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+examples_dir = repo_root / "examples"
+
+# Modules the quick paths must not import
+HEAVY_MODULES = {
+    'tree_sitter',
+    'requests',
+    'tools.sxiva.parser',
+    'tools.sxiva.parser_extractor',
+    'tools.sxiva.calculator',
+    'tools.sxiva.sync',
+    'tools.sxiva.daemon',
+}
+
+# Optional budget for the cumulative import time of tools.sxiva.cli (about
+# 50 ms without .pyc files; requests alone adds about 90 ms)
+IMPORT_BUDGET_MS = os.environ.get('SXIVA_IMPORT_BUDGET_MS')
+
+
+def import_profile(*python_args, data_dir=None, recalc=False):
+    """Run python -X importtime; return {module: cumulative microseconds}."""
+    env = os.environ.copy()
+    env['EDITOR'] = 'true'
+    env['SXIVA_NO_SYNC'] = '1'
+    env.pop('SXIVA_RECALC', None)
+    if recalc:
+        env['SXIVA_RECALC'] = '1'
+    if data_dir is not None:
+        env['SXIVA_DATA'] = str(data_dir)
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", *python_args],
+        cwd=str(repo_root),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"exit {result.returncode}: {result.stderr[-500:]}")
+
+    # Lines look like "import time:  self [us] | cumulative | imported package"
+    profile = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        profile[name.strip()] = int(cumulative)
+    return profile
+
+
+def test_quick_paths():
+    """--list, --open N and --help don't import the calculator, parser or sync client."""
+    print("=" * 70)
+    print("TEST: quick paths skip tree-sitter and requests")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        shutil.copy(examples_dir / "full-day.sxiva", Path(tmpdir) / "20250215a.sxiva")
+
+        for args in (['--list'], ['--open', '1'], ['--help']):
+            profile = import_profile("-m", "tools.sxiva.cli", *args, data_dir=tmpdir)
+            heavy = sorted(HEAVY_MODULES & profile.keys())
+            label = ' '.join(['sxiva', *args])
+            if heavy:
+                print(f"✗ FAIL  - {label} imported {', '.join(heavy)}")
+                all_passed = False
+            else:
+                print(f"✓ {label}")
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_unchanged_files_skip_parser():
+    """Opening today's file loads tree-sitter only if a file needs recalculating."""
+    print("=" * 70)
+    print("TEST: sxiva skips tree-sitter when no file changed")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        shutil.copy(examples_dir / "full-day.sxiva", Path(tmpdir) / "20250215a.sxiva")
+
+        # Without SXIVA_RECALC nothing is recalculated
+        default = import_profile("-m", "tools.sxiva.cli", data_dir=tmpdir)
+        if 'tree_sitter' in default:
+            print("✗ FAIL: recalculated without SXIVA_RECALC")
+            all_passed = False
+
+        first = import_profile("-m", "tools.sxiva.cli", data_dir=tmpdir, recalc=True)
+        if 'tree_sitter' not in first:
+            print("✗ FAIL: first run didn't recalculate")
+            all_passed = False
+
+        second = import_profile("-m", "tools.sxiva.cli", data_dir=tmpdir, recalc=True)
+        heavy = sorted({'tree_sitter', 'requests'} & second.keys())
+        if heavy:
+            print(f"✗ FAIL: unchanged files still imported {', '.join(heavy)}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_import_budget():
+    """Report the CLI's import time (checked against SXIVA_IMPORT_BUDGET_MS if set)."""
+    print("=" * 70)
+    print("TEST: CLI import time")
+    print("=" * 70)
+
+    # Best of three, to ride out a busy machine
+    elapsed_ms = min(
+        import_profile("-c", "import tools.sxiva.cli")['tools.sxiva.cli'] / 1000
+        for _ in range(3)
+    )
+    if IMPORT_BUDGET_MS is None:
+        print(f"  tools.sxiva.cli: {elapsed_ms:.1f} ms (report only)")
+    else:
+        print(f"  tools.sxiva.cli: {elapsed_ms:.1f} ms (budget {float(IMPORT_BUDGET_MS):.0f} ms)")
+        if elapsed_ms > float(IMPORT_BUDGET_MS):
+            print("✗ FAIL: CLI import is over budget")
+            return False
+
+    print("✓ PASS\n")
+    return True
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_quick_paths():
+        all_passed = False
+
+    if not test_unchanged_files_skip_parser():
+        all_passed = False
+
+    if not test_import_budget():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL STARTUP TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME STARTUP TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
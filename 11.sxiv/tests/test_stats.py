@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Test `sxiva stats` and the category rolling sums engine behind it."""
+
+import csv
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.rolling import category_rolling_sums, round_numeric
+from tools.sxiva.stats import FIELDS
+
+examples_dir = repo_root / "examples"
+
+# Friday, Saturday, then Monday (no Sunday file)
+DATES = ['2025-01-03', '2025-01-04', '2025-01-06']
+MINUTES = {'wr': [30, 10, 0], 'sp': [60, 0, 20], 'jnl': [0, 0, 5]}
+MEET = [15, 0, 0]
+
+SERIES = ['hobby_raw', 'hobby_weighted', 'work_raw', 'work_weighted', 'other_raw', 'total_raw']
+
+
+def rolling(**kwargs):
+    """Engine output for DATES as one tuple per day"""
+    sums = category_rolling_sums(
+        DATES, {cat: np.array(m) for cat, m in MINUTES.items()}, np.array(MEET),
+        hobby=['wr'], work=['sp'], **kwargs
+    )
+    return sums, [tuple(values) for values in zip(*(sums[name].tolist() for name in SERIES))]
+
+
+def run_stats(data_dir, *args):
+    env = os.environ.copy()
+    env['SXIVA_DATA'] = str(data_dir)
+    return subprocess.run(
+        [sys.executable, "-m", "tools.sxiva.cli", "stats", *args],
+        cwd=str(repo_root),
+        env=env,
+        capture_output=True,
+        text=True
+    )
+
+
+def test_rolling_sums():
+    """Rolling series follow the dashboard's windows and weekday rules."""
+    print("=" * 70)
+    print("TEST: rolling category sums")
+    print("=" * 70)
+
+    all_passed = True
+
+    # Without decay the weighted sums are the window mean times its length
+    sums, actual = rolling(window_days=7, decay_lambda=0.0)
+    expected = [
+        # Meetings count as work; work is carried over the weekend
+        (30, 210.0, 75, 375.0, 0, 105),
+        (40, 140.0, 75, 375.0, 0, 115),
+        (40, 93.3, 95, 237.5, 5, 140),
+    ]
+    if actual != expected:
+        print(f"✗ FAIL: 7-day series {actual}")
+        all_passed = False
+    daily = list(zip(*(sums[name].tolist() for name in ('hobby', 'work', 'other', 'total'))))
+    if daily != [(30, 75, 0, 105), (10, 0, 0, 10), (0, 20, 5, 25)]:
+        print(f"✗ FAIL: daily totals {daily}")
+        all_passed = False
+
+    # Raw sums cover the last 2 rows; weighted sums the last 2 calendar days
+    _, actual = rolling(window_days=2, decay_lambda=0.0)
+    if actual[-1][:2] != (10, 0.0):
+        print(f"✗ FAIL: 2-day window {actual[-1]}")
+        all_passed = False
+
+    # limit keeps the tail, with earlier days still in its windows
+    _, tail = rolling(window_days=7, decay_lambda=0.2, limit=1)
+    if tail != rolling(window_days=7, decay_lambda=0.2)[1][-1:]:
+        print(f"✗ FAIL: limited series {tail}")
+        all_passed = False
+
+    # Rounding matches PostgreSQL's numeric ROUND (halves away from zero)
+    if (round_numeric(0.25), round_numeric(-0.25), round_numeric(2.675, 2)) != (0.3, -0.3, 2.68):
+        print("✗ FAIL: round_numeric")
+        all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_cli_output():
+    """Rows come out in date order, the same serially and in parallel."""
+    print("=" * 70)
+    print("TEST: sxiva stats output")
+    print("=" * 70)
+
+    all_passed = True
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        examples = sorted(examples_dir.glob("*.sxiva"))
+        start = date(2025, 1, 1)
+        dates = []
+        for i, example in enumerate(reversed(examples)):
+            day = start + timedelta(days=2 * i)
+            dates.append(day.isoformat())
+            shutil.copy(example, data_dir / f"{day:%Y%m%d}{'MTWRFSU'[day.weekday()]}.sxiva")
+        shutil.copy(examples[0], data_dir / "notes.sxiva")  # Not dated: ignored
+
+        serial = run_stats(data_dir, "--format", "jsonl", "--hobby", "wr,wf", "--work", "sys", "-j", "1")
+        parallel = run_stats(data_dir, "--format", "jsonl", "--hobby", "wr,wf", "--work", "sys", "-j", "4")
+        if serial.returncode != 0 or parallel.returncode != 0:
+            print(f"✗ FAIL: exit codes {serial.returncode}, {parallel.returncode}\n{serial.stderr}{parallel.stderr}")
+            return False
+
+        rows = [json.loads(line) for line in serial.stdout.splitlines()]
+        if [row['date'] for row in rows] != dates:
+            print("✗ FAIL: rows are not one per dated file in date order")
+            all_passed = False
+        if parallel.stdout != serial.stdout:
+            print("✗ FAIL: parallel output differs from serial output")
+            all_passed = False
+        if not any(row['category_minutes'] for row in rows):
+            print("✗ FAIL: no category minutes extracted")
+            all_passed = False
+
+        result = run_stats(data_dir, "--hobby", "wr,wf", "--work", "sys")
+        table = list(csv.reader(io.StringIO(result.stdout)))
+        if table[0] != FIELDS or [r[0] for r in table[1:]] != dates:
+            print(f"✗ FAIL: CSV output {table[:2]}")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_rolling_sums():
+        all_passed = False
+
+    if not test_cli_output():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL STATS TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME STATS TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
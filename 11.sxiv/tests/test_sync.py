@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""Test concurrent sync uploads, keep-alive connections, retries and delta sync against a local server."""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.manifest import payload_digest
+from tools.sxiva.sync import SxivaSyncClient
+
+examples_dir = repo_root / "examples"
+
+NUM_FILES = 12
+BATCH_SIZE = 2
+PARALLELISM = 3
+
+
+class FakeDashboard(ThreadingHTTPServer):
+    """Dashboard API stand-in that records what the sync client does."""
+
+    daemon_threads = True
+
+    def __init__(self, failures=0, delay=0.05, hashes=False):
+        super().__init__(('127.0.0.1', 0), FakeDashboardHandler)
+        self.failures = failures  # Batch requests to answer with 503 first
+        self.delay = delay
+        self.hashes = {} if hashes else None  # date -> payload hash (None: no /api/sync/hashes)
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.batch_requests = 0
+        self.connections = set()
+        self.days = []
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self.server_address[1]}'
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+class FakeDashboardHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, body):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path != '/api/sync/hashes':
+            self.reply(200, {'last_sync_timestamp': None})
+        elif self.server.hashes is None:
+            self.reply(404, {'error': 'Not found'})
+        else:
+            query = {key: values[0] for key, values in parse_qs(url.query).items()}
+            with self.server.lock:
+                hashes = {date: digest for date, digest in self.server.hashes.items()
+                          if query.get('start', '') <= date <= query.get('end', '9999')}
+            self.reply(200, {'hashes': hashes})
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        with server.lock:
+            server.connections.add(self.client_address)
+            server.batch_requests += 1
+            fail = server.failures > 0
+            server.failures -= fail
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        with server.lock:
+            server.in_flight -= 1
+            if not fail:
+                server.days.extend(day['date'] for day in body['days'])
+                if server.hashes is not None:
+                    server.hashes.update((day['date'], payload_digest(day)) for day in body['days'])
+        if fail:
+            self.reply(503, {'error': 'unavailable'})
+        else:
+            self.reply(200, {'status': 'success'})
+
+
+def make_data_dir(tmpdir):
+    """NUM_FILES dated copies of the examples"""
+    examples = sorted(examples_dir.glob("*.sxiva"))
+    for i in range(NUM_FILES):
+        day = date(2025, 3, 1) + timedelta(days=i)
+        shutil.copy(examples[i % len(examples)], Path(tmpdir) / f"{day:%Y%m%d}{'MTWRFSU'[day.weekday()]}.sxiva")
+    return Path(tmpdir)
+
+
+def sync(server, tmpdir, **kwargs):
+    # One GET /api/sync/hashes (404 here: no delta sync), then the batches
+    client = SxivaSyncClient(api_url=server.url, api_token='t', batch_size=BATCH_SIZE,
+                             parallelism=PARALLELISM, backoff=0.01, **kwargs)
+    return client.sync_all(make_data_dir(tmpdir), None, use_manifest=False)
+
+
+def test_concurrent_uploads():
+    """Batches go up in parallel, bounded by parallelism, over reused connections."""
+    print("=" * 70)
+    print("TEST: concurrent uploads over a keep-alive session")
+    print("=" * 70)
+
+    all_passed = True
+    server = FakeDashboard()
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = sync(server, tmpdir)
+
+        batches = NUM_FILES // BATCH_SIZE
+        if (result['synced'], result['failed'], len(server.days)) != (NUM_FILES, 0, NUM_FILES):
+            print(f"✗ FAIL: {result}, server got {len(server.days)} days")
+            all_passed = False
+        if not 1 < server.max_in_flight <= PARALLELISM:
+            print(f"✗ FAIL: {server.max_in_flight} requests in flight at once")
+            all_passed = False
+        if len(server.connections) > PARALLELISM:
+            print(f"✗ FAIL: {len(server.connections)} connections for {batches} requests")
+            all_passed = False
+        if result['requests'] != batches + 1 or not 0 < result['p50_ms'] <= result['p95_ms']:
+            print(f"✗ FAIL: summary {result}")
+            all_passed = False
+    finally:
+        server.stop()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_retries():
+    """5xx responses and connection errors are retried, then given up on."""
+    print("=" * 70)
+    print("TEST: retry with backoff")
+    print("=" * 70)
+
+    all_passed = True
+    batches = NUM_FILES // BATCH_SIZE
+
+    # Two 503s are retried and everything arrives
+    server = FakeDashboard(failures=2)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = sync(server, tmpdir)
+        if (result['synced'], result['requests'], server.batch_requests) != (NUM_FILES, batches + 3, batches + 2):
+            print(f"✗ FAIL: transient errors: {result}")
+            all_passed = False
+    finally:
+        server.stop()
+
+    # A server that keeps failing gets retries + 1 attempts per batch
+    server = FakeDashboard(failures=10 ** 6, delay=0)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            result = sync(server, tmpdir, retries=2)
+        if (result['synced'], result['failed'], server.batch_requests) != (0, NUM_FILES, batches * 3):
+            print(f"✗ FAIL: persistent errors: {result}, {server.batch_requests} requests")
+            all_passed = False
+    finally:
+        server.stop()
+
+    # Nothing listening: connection errors are retried too
+    server = FakeDashboard()
+    url = server.url
+    server.stop()
+    with tempfile.TemporaryDirectory() as tmpdir:
+        client = SxivaSyncClient(api_url=url, batch_size=BATCH_SIZE, retries=1, backoff=0)
+        result = client.sync_all(make_data_dir(tmpdir), None, use_manifest=False)
+        if (result['failed'], result['requests']) != (NUM_FILES, batches * 2 + 1):
+            print(f"✗ FAIL: unreachable server: {result}")
+            all_passed = False
+        # Checking the last sync doesn't retry (offline should be detected quickly)
+        client.latencies = []
+        if client.get_last_sync_timestamp() != (False, None) or len(client.latencies) != 1:
+            print("✗ FAIL: last-sync check retried")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_delta_sync():
+    """Only days whose payload hash differs from the server's are uploaded."""
+    print("=" * 70)
+    print("TEST: delta sync with per-date payload hashes")
+    print("=" * 70)
+
+    all_passed = True
+    server = FakeDashboard(delay=0, hashes=True)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = make_data_dir(tmpdir)
+            files = sorted(data_dir.glob("*.sxiva"))
+
+            def resync(expected, label):
+                client = SxivaSyncClient(api_url=server.url, api_token='t', batch_size=BATCH_SIZE)
+                before = len(server.days)
+                result = client.sync_all(data_dir, None)
+                uploaded = sorted(server.days[before:])
+                if result['synced'] != len(expected) or uploaded != sorted(expected):
+                    print(f"✗ FAIL: {label}: uploaded {uploaded}, expected {sorted(expected)}")
+                    return False
+                return True
+
+            def date_of(file_path):
+                name = file_path.name
+                return f"{name[:4]}-{name[4:6]}-{name[6:8]}"
+
+            all_passed &= resync([date_of(f) for f in files], "first sync")
+            all_passed &= resync([], "unchanged resync")
+
+            # Touched but unchanged: not uploaded
+            os.utime(files[0], (time.time() + 3600,) * 2)
+            all_passed &= resync([], "touched file")
+
+            # Changed with an older mtime: uploaded
+            stat = files[1].stat()
+            files[1].write_text((examples_dir / "attributes-floating-point.sxiva").read_text() + "\n")
+            os.utime(files[1], (stat.st_atime - 86400 * 365, stat.st_mtime - 86400 * 365))
+            all_passed &= resync([date_of(files[1])], "edit with an old mtime")
+
+            # Lost on the server: uploaded again
+            with server.lock:
+                del server.hashes[date_of(files[3])]
+            all_passed &= resync([date_of(files[3])], "day missing on the server")
+    finally:
+        server.stop()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_concurrent_uploads():
+        all_passed = False
+
+    if not test_retries():
+        all_passed = False
+
+    if not test_delta_sync():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL SYNC TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME SYNC TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""Test the time/duration parsers against the regular expressions they replaced."""
+
+import doctest
+import random
+import re
+import sys
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva import time_parser
+from tools.sxiva.time_parser import (
+    PARSE_CACHE_SIZE, parse_duration, parse_time_to_minutes_since_midnight,
+)
+
+
+def regex_parse_duration(duration_str):
+    """parse_duration as it was: a cascade of regular expressions."""
+    duration_str = duration_str.strip()
+    if duration_str == '0':
+        return 0
+    if ':' in duration_str:
+        match = re.match(r'^(\d+):(\d{2})$', duration_str)
+        if match:
+            return int(match.group(1)) * 60 + int(match.group(2))
+        return None
+    match = re.match(r'^(\d+(?:\.\d+)?)h$', duration_str)
+    if match:
+        return round(float(match.group(1)) * 60)
+    match = re.match(r'^(\d+)h(\d+)m$', duration_str)
+    if match:
+        return int(match.group(1)) * 60 + int(match.group(2))
+    match = re.match(r'^(\d+)m$', duration_str)
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def random_duration(rng):
+    """A string that is often, but not always, a valid duration."""
+    pieces = ['0', '1', '7', '12', '05', '99', '١٢', ':', '.', 'h', 'm', ' ', '\n', 'x', '-', '+']
+    text = ''.join(rng.choice(pieces) for _ in range(rng.randrange(0, 7)))
+    if rng.random() < 0.3:
+        text = rng.choice(['', ' ', '\t']) + text + rng.choice(['', ' ', '\n'])
+    return text
+
+
+def test_doctests():
+    """The examples in the module's docstrings still hold."""
+    print("=" * 70)
+    print("TEST: time_parser doctests")
+    print("=" * 70)
+
+    failures, tests = doctest.testmod(time_parser)
+    if failures:
+        print(f"✗ FAIL: {failures} of {tests} examples")
+        return False
+
+    print(f"✓ PASS ({tests} examples)\n")
+    return True
+
+
+def test_duration_parity():
+    """The tokenizer accepts and rejects exactly what the regexes did."""
+    print("=" * 70)
+    print("TEST: parse_duration matches the regex implementation")
+    print("=" * 70)
+
+    rng = random.Random(20)
+    cases = [random_duration(rng) for _ in range(50000)]
+    cases += ['0', '00', '0m', '0h', '1:34', '01:34', '1:3', '1:345', ':34', '1.75h', '.5h', '1.h',
+              '1h34m', '1h', '1hm', 'h', 'm', '75m', ' 5m\n', '1h:30', '1.5:30', '1e3h', '١:٣٠']
+
+    mismatches = [case for case in cases if parse_duration(case) != regex_parse_duration(case)]
+    for case in mismatches[:5]:
+        print(f"✗ FAIL  - {case!r}: {parse_duration(case)} != {regex_parse_duration(case)}")
+    if mismatches:
+        return False
+
+    valid = sum(regex_parse_duration(case) is not None for case in cases)
+    print(f"✓ PASS ({len(cases)} strings, {valid} valid)\n")
+    return True
+
+
+def test_memoization():
+    """Results are memoized in a bounded cache; invalid times still raise."""
+    print("=" * 70)
+    print("TEST: bounded memoization")
+    print("=" * 70)
+
+    all_passed = True
+    for parser in (parse_duration, parse_time_to_minutes_since_midnight):
+        if parser.cache_info().maxsize != PARSE_CACHE_SIZE:
+            print(f"✗ FAIL: {parser.__name__} cache is not bounded")
+            all_passed = False
+
+    parse_time_to_minutes_since_midnight.cache_clear()
+    for _ in range(3):
+        if parse_time_to_minutes_since_midnight("14:30") != 870:
+            print("✗ FAIL: 14:30")
+            all_passed = False
+    if parse_time_to_minutes_since_midnight.cache_info().hits != 2:
+        print("✗ FAIL: repeated time not served from the cache")
+        all_passed = False
+
+    for bad in ["1430", "14:30:00", "ab:cd"]:
+        try:
+            parse_time_to_minutes_since_midnight(bad)
+            print(f"✗ FAIL: {bad!r} did not raise")
+            all_passed = False
+        except ValueError:
+            pass
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_doctests():
+        all_passed = False
+
+    if not test_duration_parity():
+        all_passed = False
+
+    if not test_memoization():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL TIME PARSER TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME TIME PARSER TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
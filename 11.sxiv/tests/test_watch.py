@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""Test `sxiva watch`: change detection, debouncing, and fixing + syncing settled files."""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Add project root to path
+repo_root = Path(__file__).parent.parent
+sys.path.insert(0, str(repo_root))
+
+from tools.sxiva.journal import SyncJournal
+from tools.sxiva.sync import SxivaSyncClient
+from tools.sxiva.watch import AutoSync, InotifyWatcher, PollingWatcher, watch
+
+from test_sync import FakeDashboard
+
+examples_dir = repo_root / "examples"
+EXAMPLE = (examples_dir / "attributes-floating-point.sxiva").read_text()
+DEBOUNCE = 0.3
+
+
+def inotify_available():
+    try:
+        InotifyWatcher(tempfile.gettempdir()).close()
+        return True
+    except (OSError, AttributeError):
+        return False
+
+
+def wait_for(condition, seconds=5):
+    deadline = time.time() + seconds
+    while not condition() and time.time() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+class Watching:
+    """watch() running in a thread until the block ends"""
+
+    def __init__(self, data_dir, client, polling):
+        self.auto_sync = AutoSync(data_dir, client)
+        self.reports = []
+        self.stop = threading.Event()
+        self.thread = threading.Thread(target=watch, args=(data_dir, self.auto_sync), kwargs={
+            'debounce': DEBOUNCE, 'polling': polling, 'stop': self.stop, 'report': self.reports.append,
+        })
+
+    def __enter__(self):
+        self.thread.start()
+        time.sleep(0.1)  # Let the watcher subscribe (or take its first snapshot)
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop.set()
+        self.thread.join()
+
+
+def test_change_detection():
+    """Writes and renames of dated files are seen; other files are not."""
+    print("=" * 70)
+    print("TEST: change detection")
+    print("=" * 70)
+
+    all_passed = True
+    watchers = [('polling', lambda d: PollingWatcher(d, interval=0.05))]
+    if inotify_available():
+        watchers.append(('inotify', InotifyWatcher))
+    else:
+        print("  (inotify not available, only polling tested)")
+
+    for label, make_watcher in watchers:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            watcher = make_watcher(data_dir)
+            try:
+                (data_dir / "20250301S.sxiva").write_text("a")
+                (data_dir / "notes.sxiva").write_text("a")
+                (data_dir / ".20250302U.sxiva.swp").write_text("a")
+                # Editors that save by renaming a temporary file into place
+                (data_dir / "tmp").write_text("b")
+                os.replace(data_dir / "tmp", data_dir / "20250302U.sxiva")
+
+                names = set()
+                deadline = time.time() + 2
+                while names != {"20250301S.sxiva", "20250302U.sxiva"} and time.time() < deadline:
+                    names |= watcher.changes(0.1)
+                if names != {"20250301S.sxiva", "20250302U.sxiva"}:
+                    print(f"✗ FAIL: {label} saw {sorted(names)}")
+                    all_passed = False
+                elif watcher.changes(0.1):
+                    print(f"✗ FAIL: {label} reported changes with nothing written")
+                    all_passed = False
+                else:
+                    print(f"  ✓ {label}")
+            finally:
+                watcher.close()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_fix_and_sync(polling):
+    """A burst of saves is fixed and uploaded once, after it settles."""
+    print("=" * 70)
+    print(f"TEST: debounced fix + sync ({'polling' if polling else 'inotify'})")
+    print("=" * 70)
+
+    all_passed = True
+    server = FakeDashboard(delay=0, hashes=True)
+    try:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            data_dir = Path(tmpdir)
+            target = data_dir / "20250301S.sxiva"
+            client = SxivaSyncClient(api_url=server.url, api_token='t')
+
+            with Watching(data_dir, client, polling) as watching:
+                # Five saves in quick succession
+                for i in range(5):
+                    if i:
+                        time.sleep(0.05)
+                    target.write_text(EXAMPLE + "\n" * (i + 1))
+                saved = time.time()
+
+                if not wait_for(lambda: server.days):
+                    print("✗ FAIL: nothing uploaded")
+                    return False
+                lag = time.time() - saved
+
+                # Our own fix being written doesn't trigger another upload
+                time.sleep(DEBOUNCE + (1.5 if polling else 0.5))
+                if server.days != ['2025-03-01'] or len(watching.reports) != 1:
+                    print(f"✗ FAIL: uploads {server.days}, reports {watching.reports}")
+                    all_passed = False
+                # Fixing rewrites the date line for the file name
+                if not target.read_text().startswith("Saturday, March 1st, 2025\n"):
+                    print("✗ FAIL: file was not fixed")
+                    all_passed = False
+
+                # A later edit is synced again
+                target.write_text(target.read_text().replace('[sleep] 72', '[sleep] 80'))
+                if not wait_for(lambda: len(server.days) == 2):
+                    print(f"✗ FAIL: second edit not uploaded ({watching.reports})")
+                    all_passed = False
+
+            print(f"  lag after last save: {lag:.2f}s (debounce {DEBOUNCE}s)")
+            if lag > DEBOUNCE + (1.5 if polling else 0.5):
+                print("✗ FAIL: lag too long")
+                all_passed = False
+    finally:
+        server.stop()
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def test_offline():
+    """Saves made while the server is unreachable are journaled."""
+    print("=" * 70)
+    print("TEST: offline saves are journaled")
+    print("=" * 70)
+
+    all_passed = True
+    server = FakeDashboard()
+    url = server.url
+    server.stop()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        data_dir = Path(tmpdir)
+        (data_dir / "20250301S.sxiva").write_text(EXAMPLE)
+        auto_sync = AutoSync(data_dir, SxivaSyncClient(api_url=url, api_token='t', retries=0))
+        status = auto_sync.handle("20250301S.sxiva")
+        with SyncJournal(data_dir) as journal:
+            pending = journal.pending()
+        if 'journaled' not in (status or '') or [entry.date for entry in pending] != ['2025-03-01']:
+            print(f"✗ FAIL: status {status!r}, journal {pending}")
+            all_passed = False
+        if auto_sync.handle("20250301S.sxiva") is not None:
+            print("✗ FAIL: unchanged file handled again")
+            all_passed = False
+
+    if all_passed:
+        print("✓ PASS\n")
+    return all_passed
+
+
+def main():
+    """Run all tests."""
+    all_passed = True
+
+    if not test_change_detection():
+        all_passed = False
+
+    if inotify_available() and not test_fix_and_sync(polling=False):
+        all_passed = False
+
+    if not test_fix_and_sync(polling=True):
+        all_passed = False
+
+    if not test_offline():
+        all_passed = False
+
+    print("=" * 70)
+    print("SUMMARY")
+    print("=" * 70)
+
+    if all_passed:
+        print("\n✓ ALL WATCH TESTS PASS!")
+        return 0
+    else:
+        print("\n✗ SOME WATCH TESTS FAILED")
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,136 @@
+"""Recalculate many .sxiva files, optionally across a process pool."""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .manifest import Manifest, content_digest, file_digest
+
+
+# Don't start a worker for fewer files than this; pool startup would dominate
+MIN_FILES_PER_WORKER = 8
+
+# Per-process calculator: each worker loads its own parser once. They are
+# imported on first use, so a run where the manifest skips every file never
+# loads tree-sitter.
+_worker_calculator = None
+_worker_extractor = None
+
+
+@dataclass
+class FileResult:
+    """Outcome of recalculating one file."""
+    path: str
+    status: str              # 'changed', 'unchanged', 'errored' or 'skipped'
+    num_fixes: int = 0
+    seconds: float = 0.0
+    error: Optional[str] = None  # Exception message, or None if only [ERROR] markers
+    digest: Optional[str] = None  # Content hash after recalculation (None on exception)
+    data: Optional[dict] = None  # Sync payload for that content (None if not a dated file)
+
+    @property
+    def name(self) -> str:
+        return Path(self.path).name
+
+
+def _init_worker():
+    global _worker_calculator, _worker_extractor
+    from .calculator import PointCalculator
+    from .parser_extractor import SxivaDataExtractor
+
+    _worker_calculator = PointCalculator()
+    _worker_extractor = SxivaDataExtractor()
+
+
+def recalculate_file(file_path: str) -> FileResult:
+    """Fix one file in place and report what happened.
+
+    A file is 'errored' if recalculation raised or left [ERROR] markers in it.
+    The sync payload is built from the same parse, so syncing the file
+    afterwards doesn't parse it again.
+    """
+    global _worker_calculator
+    if _worker_calculator is None:
+        _init_worker()
+
+    start = time.perf_counter()
+    try:
+        with open(file_path, 'r', encoding='utf-8') as f:
+            original_content = f.read()
+
+        analysis = _worker_calculator.analyze_file(str(file_path), output_path=None, dry_run=False)
+        new_content = analysis.content  # What is now on disk
+        data = _worker_extractor.extract_from_analysis(analysis)
+    except Exception as e:
+        return FileResult(str(file_path), 'errored', seconds=time.perf_counter() - start, error=str(e))
+
+    if '[ERROR]' in new_content:
+        status = 'errored'
+    elif new_content != original_content:
+        status = 'changed'
+    else:
+        status = 'unchanged'
+
+    return FileResult(str(file_path), status, num_fixes=analysis.num_fixes, seconds=time.perf_counter() - start,
+                      digest=content_digest(new_content.encode('utf-8')), data=data)
+
+
+def resolve_jobs(jobs: Optional[int], num_files: int) -> int:
+    """Get the number of worker processes to use.
+
+    Args:
+        jobs: Requested workers (None or 0 = one per CPU)
+        num_files: Number of files to process
+
+    Returns:
+        int: Workers to start, 1 meaning run in this process
+    """
+    if not jobs:
+        jobs = os.cpu_count() or 1
+    return max(1, min(jobs, -(-num_files // MIN_FILES_PER_WORKER)))
+
+
+def recalculate_files(file_paths: List[Path], jobs: Optional[int] = None,
+                      manifest: Optional[Manifest] = None) -> Iterator[FileResult]:
+    """Recalculate files, yielding one FileResult per file in input order.
+
+    Args:
+        file_paths: Files to fix in place
+        jobs: Worker processes (None or 0 = one per CPU, 1 = serial in-process)
+        manifest: If given, files whose content matches their last recorded
+                  recalculation are skipped, and new results are recorded
+                  (the caller saves the manifest)
+    """
+    file_paths = [str(p) for p in file_paths]
+
+    skipped = set()
+    if manifest is not None:
+        skipped = {p for p in file_paths if manifest.is_recalculated(Path(p).name, file_digest(p))}
+    pending = [p for p in file_paths if p not in skipped]
+
+    results = _recalculate(pending, jobs)
+    for file_path in file_paths:
+        if file_path in skipped:
+            yield FileResult(file_path, 'skipped')
+            continue
+
+        result = next(results)
+        if manifest is not None and result.error is None:
+            manifest.mark_recalculated(result.name, result.digest)
+        yield result
+
+
+def _recalculate(file_paths: List[str], jobs: Optional[int]) -> Iterator[FileResult]:
+    workers = resolve_jobs(jobs, len(file_paths))
+
+    if workers == 1:
+        for file_path in file_paths:
+            yield recalculate_file(file_path)
+        return
+
+    chunksize = max(1, len(file_paths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        yield from executor.map(recalculate_file, file_paths, chunksize=chunksize)
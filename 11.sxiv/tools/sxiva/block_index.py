@@ -0,0 +1,330 @@
+"""Compact table of the timesheet blocks in a parse tree, built in one walk.
+
+Each time_block and continuation_block becomes a row of integer columns
+(line, byte ranges of its start time, end time, end_term time, points and
+first ERROR, and flags), with its blicks in flat side arrays. Incomplete entry lines that
+didn't parse as blocks (a time with a --- sibling, usually inside an ERROR
+node) become 'entry' rows, so commands like log-end can find them too.
+
+Rows are filled by walking each subtree once with a TreeCursor; callers
+query the table instead of re-descending into the tree. The index also keeps
+the byte offset of every source line, so looking up a line near a node
+doesn't split the whole file.
+"""
+
+from array import array
+from bisect import bisect_left
+from typing import List, Optional, Tuple
+
+
+BLOCK_TYPES = ('time_block', 'continuation_block', 'entry')
+_TYPE_CODES = {name: code for code, name in enumerate(BLOCK_TYPES)}
+
+# Row flags
+IS_X = 1  # Has the 'x' shortening marker
+CONTINUES = 2  # Terminator is a continuation marker (+)
+ERROR_CHILD = 4  # Has an ERROR node as a direct child
+
+_DASHES = ('triple_dash', '---')
+
+# Largest minutes notation stored; larger (typo-sized) values are clamped
+# rather than overflowing the column, and still fail the blick count checks
+MAX_BLICK_MINUTES = 2 ** 31 - 1
+
+
+def _set_range(ranges: array, row: int, node):
+    ranges[2 * row] = node.start_byte
+    ranges[2 * row + 1] = node.end_byte
+
+
+class BlockIndex:
+    """Array-backed table of blocks in a parse tree.
+
+    Use BlockIndex.build() to index a whole tree up front, or row() to index
+    block nodes lazily the first time they are looked up.
+    """
+
+    def __init__(self, source_bytes: bytes):
+        self.source_bytes = source_bytes
+
+        # One entry per row; byte columns are -1 where the field is absent
+        self.type_code = array('b')
+        self.line = array('i')
+        self.start_byte = array('i')
+        self.end_byte = array('i')
+        self.start_time_range = array('i')  # start, end pairs
+        self.end_time_range = array('i')  # Second time in the block
+        self.end_term_range = array('i')  # First time under an end_term (may be in a nested block)
+        self.points_range = array('i')
+        self.points_line = array('i')
+        self.error_range = array('i')
+        self.flags = array('b')
+        self.blick_lists = array('h')  # Number of blick_list nodes in the block
+        self.direct_list = array('h')  # Number of the block's own (direct child) blick_list, -1 if none
+
+        # One entry per blick, in source order
+        self.blick_row = array('i')
+        self.blick_list_no = array('h')  # Which of the row's blick lists it belongs to
+        self.blick_minutes = array('i')  # Explicit minutes notation, 0 if implicit
+        self.blick_category = []  # Category name without brackets, or None
+
+        self._rows_by_start = {}  # block start byte -> row
+        self._blick_span = {}  # row -> (first, last + 1) blick index
+        self._line_starts = None  # Start byte of each source line, built on first use
+
+    @classmethod
+    def build(cls, node, source_bytes: bytes) -> 'BlockIndex':
+        """Index every block in node's subtree (e.g. tree.root_node)."""
+        index = cls(source_bytes)
+        index.add(node)
+        return index
+
+    def prefix(self, source_bytes: bytes, end_byte: int) -> 'BlockIndex':
+        """A new index of source_bytes with this index's rows of blocks before end_byte.
+
+        For incremental recalculation: source_bytes must equal this index's
+        source before end_byte, and end_byte must be the start of a root-level
+        node (rows are kept in node order, as build() and add() of root-level
+        nodes in order leave them). add() the nodes from end_byte on.
+        """
+        index = BlockIndex(source_bytes)
+        # Rows (and their blicks) of earlier nodes come first, so bisection
+        # finds the split even where rows of one node aren't in byte order
+        rows = bisect_left(self.start_byte, end_byte)
+        blicks = bisect_left(self.blick_row, rows)
+
+        for name in ('type_code', 'line', 'start_byte', 'end_byte', 'points_line',
+                     'flags', 'blick_lists', 'direct_list'):
+            setattr(index, name, getattr(self, name)[:rows])
+        for name in ('start_time_range', 'end_time_range', 'end_term_range',
+                     'points_range', 'error_range'):
+            setattr(index, name, getattr(self, name)[:2 * rows])
+        for name in ('blick_row', 'blick_list_no', 'blick_minutes', 'blick_category'):
+            setattr(index, name, getattr(self, name)[:blicks])
+
+        index._rows_by_start = {start: row for start, row in self._rows_by_start.items() if row < rows}
+        index._blick_span = {row: span for row, span in self._blick_span.items() if row < rows}
+        return index
+
+    def __len__(self) -> int:
+        return len(self.type_code)
+
+    def row(self, node) -> int:
+        """Get the row of a time_block or continuation_block node (-1 if none).
+
+        The node's subtree is indexed on first lookup.
+        """
+        row = self._rows_by_start.get(node.start_byte)
+        if row is None:
+            self.add(node)
+            row = self._rows_by_start.get(node.start_byte, -1)
+        return row
+
+    def rows(self, *types: str) -> List[int]:
+        """Rows of the given types (all rows if none given), in line order."""
+        codes = {_TYPE_CODES[t] for t in types} if types else None
+        rows = [r for r in range(len(self)) if codes is None or self.type_code[r] in codes]
+        rows.sort(key=lambda r: (self.line[r], self.start_byte[r]))
+        return rows
+
+    # --- Column accessors ---
+
+    def type(self, row: int) -> str:
+        return BLOCK_TYPES[self.type_code[row]]
+
+    def has_flag(self, row: int, flag: int) -> bool:
+        return bool(self.flags[row] & flag)
+
+    def _text(self, ranges: array, row: int) -> Optional[str]:
+        start = ranges[2 * row]
+        if start < 0:
+            return None
+        return self.source_bytes[start:ranges[2 * row + 1]].decode('utf-8')
+
+    def start_time(self, row: int) -> Optional[str]:
+        """Text of the block's start time, or None."""
+        return self._text(self.start_time_range, row)
+
+    def end_time(self, row: int) -> Optional[str]:
+        """Text of the block's end time (may be empty if missing), or None."""
+        return self._text(self.end_time_range, row)
+
+    def end_term_time(self, row: int) -> Optional[str]:
+        """Text of the time in the block's end_term (after ---), or None."""
+        return self._text(self.end_term_range, row)
+
+    def end_term_span(self, row: int) -> Optional[Tuple[int, int]]:
+        """Byte range of the time in the block's end_term, or None."""
+        start = self.end_term_range[2 * row]
+        return None if start < 0 else (start, self.end_term_range[2 * row + 1])
+
+    def points(self, row: int) -> Optional[str]:
+        """Text of the block's points notation, or None."""
+        return self._text(self.points_range, row)
+
+    def points_start(self, row: int) -> int:
+        """Start byte of the block's points notation (-1 if none)."""
+        return self.points_range[2 * row]
+
+    def error_text(self, row: int) -> Optional[str]:
+        """Text of the first ERROR node inside the block, or None."""
+        return self._text(self.error_range, row)
+
+    def blicks(self, row: int, list_no: Optional[int] = None) -> List[Tuple[Optional[str], int]]:
+        """(category, minutes notation or 0) per blick of the block.
+
+        Args:
+            row: Block row
+            list_no: Only blicks of the row's nth blick_list (None = all)
+        """
+        first, last = self._blick_span.get(row, (0, 0))
+        return [
+            (self.blick_category[i], self.blick_minutes[i])
+            for i in range(first, last)
+            if self.blick_row[i] == row and (list_no is None or self.blick_list_no[i] == list_no)
+        ]
+
+    def source_line(self, line: int) -> Optional[str]:
+        """Text of a source line (0-based, without the newline), or None past the end."""
+        if self._line_starts is None:
+            self._line_starts = self._index_lines()
+        starts = self._line_starts
+        if line < 0 or line >= len(starts):
+            return None
+        end = starts[line + 1] - 1 if line + 1 < len(starts) else len(self.source_bytes)
+        return self.source_bytes[starts[line]:end].decode('utf-8')
+
+    def _index_lines(self) -> array:
+        source_bytes = self.source_bytes
+        starts = array('i', [0])
+        newline = source_bytes.find(b'\n')
+        while newline >= 0:
+            starts.append(newline + 1)
+            newline = source_bytes.find(b'\n', newline + 1)
+        return starts
+
+    # --- Indexing ---
+
+    def _new_row(self, type_name: str, node) -> int:
+        row = len(self.type_code)
+        self.type_code.append(_TYPE_CODES[type_name])
+        self.line.append(node.start_point[0])
+        self.start_byte.append(node.start_byte)
+        self.end_byte.append(node.end_byte)
+        for ranges in (self.start_time_range, self.end_time_range, self.end_term_range,
+                       self.points_range, self.error_range):
+            ranges.extend((-1, -1))
+        self.points_line.append(-1)
+        self.flags.append(0)
+        self.blick_lists.append(0)
+        self.direct_list.append(-1)
+        return row
+
+    def add(self, node):
+        """Index the blocks and incomplete entries in node's subtree (one walk)."""
+        source_bytes = self.source_bytes
+        cursor = node.walk()
+
+        # Per ancestor: [type, block row or -1, blick list no, saw a dash, loose time nodes, blick]
+        stack = []
+        block_rows = []  # Rows of blocks currently being walked, innermost last
+
+        while True:
+            n = cursor.node
+            t = n.type
+            parent = stack[-1] if stack else None
+            frame = [t, -1, -1, False, None, None]
+
+            descend = True
+            if t == 'time_block' or t == 'continuation_block':
+                if n.start_byte in self._rows_by_start:
+                    descend = False  # Already indexed
+                else:
+                    row = self._new_row(t, n)
+                    self._rows_by_start[n.start_byte] = row
+                    frame[1] = row
+                    block_rows.append(row)
+
+            elif block_rows:
+                row = block_rows[-1]
+                at_block = parent is not None and parent[1] == row
+
+                if t == 'time':
+                    if self.start_time_range[2 * row] < 0:
+                        _set_range(self.start_time_range, row, n)
+                    elif self.end_time_range[2 * row] < 0:
+                        _set_range(self.end_time_range, row, n)
+                    if parent is not None and parent[0] == 'end_term':
+                        # Enclosing blocks see it too, as a search of their subtree would
+                        for block_row in block_rows:
+                            if self.end_term_range[2 * block_row] < 0:
+                                _set_range(self.end_term_range, block_row, n)
+                elif t == 'points':
+                    if self.points_range[2 * row] < 0:
+                        _set_range(self.points_range, row, n)
+                        self.points_line[row] = n.start_point[0]
+                elif t == 'x' and at_block:
+                    self.flags[row] |= IS_X
+                elif t == 'terminator' and at_block:
+                    if source_bytes[n.start_byte:n.end_byte].strip().endswith(b'+'):
+                        self.flags[row] |= CONTINUES
+                elif t == 'ERROR':
+                    if at_block:
+                        self.flags[row] |= ERROR_CHILD
+                    if self.error_range[2 * row] < 0:
+                        _set_range(self.error_range, row, n)
+                elif t == 'blick_list':
+                    frame[2] = self.blick_lists[row]
+                    self.blick_lists[row] += 1
+                    if at_block and self.direct_list[row] < 0:
+                        self.direct_list[row] = frame[2]
+                elif t == 'blick' and parent is not None and parent[0] == 'blick_list':
+                    frame[5] = [None, 0, parent[2]]
+                elif parent is not None and parent[5] is not None:
+                    blick = parent[5]
+                    if t == 'category':
+                        text = source_bytes[n.start_byte:n.end_byte].decode('utf-8')
+                        blick[0] = text.strip().strip('[]').strip()
+                    elif t == 'minutes':
+                        text = source_bytes[n.start_byte:n.end_byte].decode('utf-8')
+                        blick[1] = min(int(text.strip('[]')), MAX_BLICK_MINUTES)
+
+            elif parent is not None:
+                # Outside blocks: remember times next to a --- (incomplete entries)
+                if t == 'time':
+                    if parent[4] is None:
+                        parent[4] = []
+                    parent[4].append(n)
+                elif t in _DASHES:
+                    parent[3] = True
+
+            stack.append(frame)
+            if descend and cursor.goto_first_child():
+                continue
+
+            # Leave nodes until one has a next sibling
+            while True:
+                self._leave(stack.pop(), block_rows)
+                if cursor.goto_next_sibling():
+                    break
+                if not cursor.goto_parent():
+                    return
+
+    def _leave(self, frame, block_rows):
+        t, row, _, saw_dash, loose_times, blick = frame
+
+        if row >= 0:
+            block_rows.pop()
+        elif blick is not None:
+            category, minutes, list_no = blick
+            owner = block_rows[-1]
+            i = len(self.blick_row)
+            self.blick_row.append(owner)
+            self.blick_list_no.append(list_no)
+            self.blick_minutes.append(minutes)
+            self.blick_category.append(category)
+            first, _ = self._blick_span.get(owner, (i, i))
+            self._blick_span[owner] = (first, i + 1)
+        elif saw_dash and loose_times:
+            for time_node in loose_times:
+                self._new_row('entry', time_node)
@@ -1,13 +1,63 @@
 """Point calculation engine for SXIVA files."""
 
 import re
-from dataclasses import dataclass
-from typing import List, Optional, Set, Tuple
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 
+from .block_index import BlockIndex, CONTINUES, ERROR_CHILD, IS_X
 from .time_parser import parse_duration, parse_time_to_minutes_since_midnight, format_duration
 
+# Version of the calculation rules. Files recorded in the data directory
+# manifest (manifest.py) under another version are recalculated again.
+CALCULATOR_VERSION = 1
+
+# Files an incremental calculator keeps the last parse of (least recently
+# used first out), so a long-running daemon or watcher stays bounded
+PARSE_CACHE_SIZE = 64
+
+# Patterns the calculator matches lines and ERROR text against, compiled once
+_TIME_FORMAT = re.compile(r'^\d{1,2}:\d{2}$')  # HH:MM or H:MM
+_INVALID_TIME = re.compile(r'\d{1,2}:\d(?:\s|$)')  # Single-digit minutes
+_MISSING_WORK_MARKER = re.compile(r'\[\w+\]\s+[^~\[]+(?:---|\+|$)')  # [cat] subject without ~ or [minutes]
+_METADATA_LINE = re.compile(r'^\s*\[[^\]]+\]\s+(.+\s+)?-\s+\d{1,2}:\d{2}\s*$')  # [cat] [subject] - HH:MM
+_METADATA_ENTRY = re.compile(r'^\s*\[[^\]]+\]\s+.+\s+-\s+\d{1,2}:\d{2}\s*$')  # [cat] subject - HH:MM
+_SUMMARY_LINE = re.compile(r'^\s*\[[^\]]+\]\s+-\s+')  # [cat] - ...
+_C_LINE = re.compile(r'^\s*([0-1][0-9]|2[0-3]):[0-5][0-9]\s+-\s+')  # HH:MM - amount
+_DECLARATION = re.compile(r'^\s*\{')
+_INTEGER = re.compile(r'^-?\d+$')
+_POINTS_NOTATION = re.compile(r'\s*\([^)]*=[^)]*\)')  # (anything with =number)
+_ERROR_MESSAGE = re.compile(r'\s*\[ERROR\][^\n]*')
+
+# Freeform time: ranges, then durations (most specific first, to avoid double-counting)
+_TIME_RANGE = re.compile(r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})')  # HH:MM-HH:MM
+_DURATIONS = tuple(re.compile(pattern) for pattern in (
+    r'\b(\d+h\d+m)\b',                         # Hours and minutes: 1h34m (most specific, check first)
+    r'\b(\d+(?:\.\d+)?h)(?!\d)',               # Decimal/whole hours: 1.75h, 0.5h, 1h (but not if followed by digit like in 1h34m)
+    r'(?<![:\d-])(\d{1,2}:\d{2})(?![-:])',    # H:MM not part of a range (no dash before or after, no : after)
+    r'\b(\d+m)\b',                             # Minutes only: 5m, 75m
+))
+_FREEFORM_CATEGORY = re.compile(r'\s*\[([^\]]+)\]')
+_FREEFORM_TOTAL = re.compile(r'\s+-\s+\d{1,2}:\d{2}\s*$')  # Trailing " - HH:MM"
+_FREEFORM_DASH = re.compile(r'\s+-\s*$')  # Trailing " -" without a time
+
+# Attributes
+_ATTRIBUTE_CATEGORY = re.compile(r'^\[(\w+)\]')
+_ATTRIBUTE_CATEGORY_ONLY = re.compile(r'^\[(\w+)\]$')
+_ATTRIBUTE_LINE = re.compile(r'^\[(\w+)\]\s+(.+?)(?:\s*✓)?$')
+_DEP_AVERAGE = re.compile(r'\s+=\s+-?\d+\.\d+\s*✓?\s*$')  # " = X.X ✓" suffix
+_DOLLARS = re.compile(r'^-?\$\d+$')  # $4500 or -$1500
+
+# Dates
+_DATE_PREFIX = re.compile(r'^(\d{8})')  # YYYYMMDD
+_DATE_HEADER = re.compile(
+    r'^(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+'
+    r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+'
+    r'\d{1,2}(st|nd|rd|th),\s+\d{4}$'
+)
+
 
 @dataclass
 class CalculationState:
@@ -39,6 +89,45 @@ class BlockPoints:
     expected: str  # Expected points notation (e.g., "-2,+2f,+1a=1")
 
 
+@dataclass
+class Checkpoint:
+    """Calculation progress saved before a root-level node is processed."""
+    index: int  # Index of the node in the root-level node list
+    state: CalculationState  # Copy of the state before processing the node
+    num_issues: int  # Number of issues found before the node
+    category_minutes: dict  # Copy of category minutes before the node
+
+
+@dataclass
+class ParseCache:
+    """Parse and calculation results kept between incremental fix_file calls."""
+    source_bytes: bytes  # Cleaned source the tree was parsed from
+    tree: object  # Tree-sitter tree for source_bytes
+    spans: list  # (type, start_byte, end_byte, end_row) per root-level node
+    checkpoints: List[Checkpoint]  # One per root-level node the calculation visited
+    issues: list  # Issues from process_nodes
+    block_points: dict  # Root-level node index -> (BlockPoints or error, end_time)
+    index: BlockIndex  # Blocks of source_bytes
+    layout: list  # Layout kind per root-level node (see layout_nodes)
+    stripped_lines: dict  # Source line -> line without points, as cleaned for source_bytes
+
+
+@dataclass
+class FileAnalysis:
+    """Everything derived from one parse of a .sxiva file by analyze_file.
+
+    The fixer writes `content`; the sync client builds its payload from
+    `category_minutes` and `attributes` instead of parsing the written file.
+    """
+    path: str  # File that was analyzed
+    content: str  # Fixed file content (what was, or would be, written)
+    num_fixes: int  # Number of fixes applied
+    tree: object  # Tree-sitter tree of the cleaned source the points were calculated from
+    block_points: dict  # Root-level node index -> (BlockPoints or error, end_time)
+    category_minutes: Dict[str, int]  # Non-zero minutes per base category, as written to {summary}
+    attributes: Dict[str, Any]  # Values as written to {attributes} (see parse_attribute_lines)
+
+
 class PointCalculator:
     """Calculates points for SXIVA time blocks."""
 
@@ -46,8 +135,19 @@ class PointCalculator:
     STANDARD_BOUNDARIES = [0, 12, 24, 36, 48]
     START_BOUNDARIES = [8, 20, 32, 44, 56]
 
-    def __init__(self):
+    def __init__(self, incremental: bool = False):
+        """Create a calculator.
+
+        Args:
+            incremental: If True, fix_file keeps the previous tree, block
+                         index and calculation checkpoints per file (for the
+                         PARSE_CACHE_SIZE most recent files), re-parses only
+                         the edited byte range and re-indexes and recalculates
+                         from the first affected block onward.
+        """
         self._parser = None
+        self.incremental = incremental
+        self._parse_cache = OrderedDict()  # resolved file path -> ParseCache, most recent last
 
     @property
     def parser(self):
@@ -66,8 +166,7 @@ class PointCalculator:
         Returns:
             int: Minutes since midnight
         """
-        hours, minutes = map(int, time_str.split(':'))
-        return hours * 60 + minutes
+        return parse_time_to_minutes_since_midnight(time_str)
 
     def validate_time_format(self, time_str: str) -> bool:
         """Validate that time is in proper HH:MM format.
@@ -79,7 +178,7 @@ class PointCalculator:
             bool: True if valid format (HH:MM with 2-digit minutes)
         """
         # Must be HH:MM or H:MM format, where MM is exactly 2 digits
-        return bool(re.match(r'^\d{1,2}:\d{2}$', time_str))
+        return bool(_TIME_FORMAT.match(time_str))
 
     def validate_start_time_boundary(self, time_str: str) -> tuple[bool, str]:
         """Validate that start time is on a valid SXIVA boundary.
@@ -196,100 +295,45 @@ class PointCalculator:
 
         return end_mins - start_mins
 
-    def count_blicks(self, blick_list_node, source_bytes) -> int:
-        """Count total number of 3-minute blicks in a blick_list.
-
-        A "blick" is a 3-minute chunk, so:
-        - [3] = 1 blick
-        - [6] = 2 blicks
-        - [10] (representing 9 min) = 3 blicks
-        - [13] (representing 12 min) = 4 blicks
-
-        Args:
-            blick_list_node: Tree-sitter blick_list node
-            source_bytes: Source code as bytes
-
-        Returns:
-            int: Total number of 3-minute blicks
-        """
-        from .parser import node_text
-
-        total_minutes = 0
-        for child in blick_list_node.children:
-            if child.type == 'blick':
-                # Check if this blick has explicit minutes
-                has_minutes = any(c.type == 'minutes' for c in child.children)
-                has_tilde = any(c.type == '~' for c in child.children)
-
-                if has_minutes:
-                    # Find and parse the minutes node
-                    for blick_child in child.children:
-                        if blick_child.type == 'minutes':
-                            minutes_text = node_text(blick_child, source_bytes)
-                            # Parse [3], [6], [10], [13]
-                            minutes_notation = int(minutes_text.strip('[]'))
-                            # Convert notation to actual minutes ([10]->9, [13]->12)
-                            total_minutes += self.convert_blick_notation_to_minutes(minutes_notation)
-                            break
-                elif has_tilde:
-                    # Tilde-only case (implicit [10] = 9 minutes)
-                    total_minutes += 9
-                else:
-                    # No minutes, no tilde: implicit [10] = 9 minutes
-                    total_minutes += 9
-
-        # Total blicks = total minutes / 3
-        return total_minutes // 3
+    def blick_minutes(self, index: BlockIndex, row: int, list_no: int) -> int:
+        """Sum the work minutes of one of a block's blick lists.
 
-    def find_all_times(self, node):
-        """Recursively find all time nodes within a block.
+        Blicks without explicit minutes (tilde only, or nothing) are an
+        implicit [10] = 9 minutes.
 
         Args:
-            node: Tree-sitter time_block or continuation_block node
+            index: BlockIndex of the file
+            row: Block row in the index
+            list_no: Which of the block's blick lists (0 = first in the block)
 
         Returns:
-            list: All time nodes found
+            int: Total work minutes
         """
-        times = []
-        if node.type == 'time':
-            times.append(node)
-        for child in node.children:
-            times.extend(self.find_all_times(child))
-        return times
-
-    def find_points_node(self, node):
-        """Recursively find the points node within a block.
-
-        Args:
-            node: Tree-sitter time_block or continuation_block node
+        return sum(
+            self.convert_blick_notation_to_minutes(notation) if notation else 9
+            for _, notation in index.blicks(row, list_no)
+        )
 
-        Returns:
-            points node if found, None otherwise
-        """
-        if node.type == 'points':
-            return node
-        for child in node.children:
-            result = self.find_points_node(child)
-            if result:
-                return result
-        return None
+    def count_blicks(self, index: BlockIndex, row: int, list_no: Optional[int] = None) -> int:
+        """Count total number of 3-minute blicks in a block's blick list(s).
 
-    def detect_x_block(self, node, source_bytes) -> bool:
-        """Check if a time_block or continuation_block has 'x' marker.
+        A "blick" is a 3-minute chunk, so:
+        - [3] = 1 blick
+        - [6] = 2 blicks
+        - [10] (representing 9 min) = 3 blicks
+        - [13] (representing 12 min) = 4 blicks
 
         Args:
-            node: Tree-sitter time_block or continuation_block node
-            source_bytes: Source code as bytes
+            index: BlockIndex of the file
+            row: Block row in the index
+            list_no: Which of the block's blick lists to count (None = all,
+                     each counted separately and summed)
 
         Returns:
-            bool: True if has 'x' shortening marker
+            int: Total number of 3-minute blicks
         """
-        from .parser import node_text
-
-        for child in node.children:
-            if child.type == 'x':
-                return True
-        return False
+        list_nos = range(index.blick_lists[row]) if list_no is None else [list_no]
+        return sum(self.blick_minutes(index, row, n) // 3 for n in list_nos)
 
     def minutes_to_blick_count(self, minutes_str: str) -> int:
         """Convert minute notation to number of blicks.
@@ -316,76 +360,43 @@ class PointCalculator:
             # Fallback: approximate
             return max(1, mins // 3)
 
-    def extract_categories(self, blick_list_node, source_bytes) -> List[str]:
-        """Extract category names from a blick list.
+    def extract_categories(self, index: BlockIndex, row: int, list_no: Optional[int] = None) -> List[str]:
+        """Extract category names from a block's blick list(s).
 
         Args:
-            blick_list_node: Tree-sitter blick_list node
-            source_bytes: Source code as bytes
+            index: BlockIndex of the file
+            row: Block row in the index
+            list_no: Which of the block's blick lists (None = all)
 
         Returns:
             List[str]: Category names (without brackets), one per blick
             For example, [wr] work [10] returns ['wr', 'wr', 'wr'] (3 blicks)
         """
-        from .parser import node_text
-
         categories = []
 
-        for child in blick_list_node.children:
-            if child.type == 'blick':
-                cat_name = None
-                num_blicks = 3  # Default when only tilde (no explicit minutes): tilde alone = [10] = 3 blicks
-                has_explicit_minutes = False
-
-                for blick_child in child.children:
-                    if blick_child.type == 'category':
-                        cat_text = node_text(blick_child, source_bytes)
-                        # Remove brackets and whitespace: [wr] -> wr,  [err] -> err
-                        cat_name = cat_text.strip().strip('[]').strip()
-                    elif blick_child.type == 'minutes':
-                        # Explicit minutes override tilde default
-                        # e.g., ~[6] uses [6] (2 blicks), tilde is decorative
-                        minutes_text = node_text(blick_child, source_bytes)
-                        num_blicks = self.minutes_to_blick_count(minutes_text)
-                        has_explicit_minutes = True
-
-                # Note: Grammar allows tilde, explicit minutes, or neither
-                # If only tilde (~) or nothing, num_blicks stays at default (3 = implicit [10])
-                # If explicit minutes (~[6] or [6]), num_blicks is set from minutes
-
-                # Add category once per blick
-                if cat_name:
-                    categories.extend([cat_name] * num_blicks)
-
-        return categories
+        for category, notation in index.blicks(row, list_no):
+            # Tilde alone or nothing = implicit [10] = 3 blicks; explicit
+            # minutes override it (e.g., ~[6] is 2 blicks, tilde is decorative)
+            num_blicks = self.minutes_to_blick_count(str(notation)) if notation else 3
 
-    def is_continuation_start(self, node, source_bytes) -> bool:
-        """Check if a block starts a continuation (ends with +).
+            # Add category once per blick
+            if category:
+                categories.extend([category] * num_blicks)
 
-        Args:
-            node: Tree-sitter time_block or continuation_block node
-            source_bytes: Source code as bytes
-
-        Returns:
-            bool: True if block ends with continuation marker
-        """
-        from .parser import node_text
+        return categories
 
-        # Look for terminator that's a continuation (+)
-        for child in node.children:
-            if child.type == 'terminator':
-                term_text = node_text(child, source_bytes).strip()
-                if term_text.endswith('+'):
-                    return True
-        return False
+    def block_categories(self, index: BlockIndex, row: int) -> List[str]:
+        """Extract categories from the block's own (direct child) blick list."""
+        list_no = index.direct_list[row]
+        return self.extract_categories(index, row, list_no) if list_no >= 0 else []
 
-    def collect_continuation_chain(self, nodes, start_idx, source_bytes) -> List[int]:
+    def collect_continuation_chain(self, nodes, start_idx, index: BlockIndex) -> List[int]:
         """Collect indices of all blocks in a continuation chain.
 
         Args:
             nodes: List of all root-level nodes
             start_idx: Index of the first block in potential chain
-            source_bytes: Source code as bytes
+            index: BlockIndex of the file
 
         Returns:
             List[int]: Indices of all blocks in the chain (including start_idx)
@@ -398,7 +409,7 @@ class PointCalculator:
             if node.type == 'continuation_block':
                 chain.append(idx)
                 # Check if this continues further
-                if not self.is_continuation_start(node, source_bytes):
+                if not index.has_flag(index.row(node), CONTINUES):
                     # This is the last block in the chain
                     break
                 idx += 1
@@ -412,7 +423,8 @@ class PointCalculator:
         self,
         chain_nodes: List,
         state: CalculationState,
-        source_bytes: bytes
+        source_bytes: bytes,
+        index: BlockIndex
     ) -> Tuple[BlockPoints, str]:
         """Calculate points for an entire continuation chain.
 
@@ -420,6 +432,7 @@ class PointCalculator:
             chain_nodes: List of nodes in the continuation chain
             state: Current calculation state
             source_bytes: Source code as bytes
+            index: BlockIndex of the file
 
         Returns:
             Tuple of (BlockPoints, final_end_time_str): Calculated points and final end time
@@ -438,8 +451,7 @@ class PointCalculator:
         error_node_index = None
         for i, node in enumerate(chain_nodes):
             # Check for ERROR children indicating parse failure
-            has_error_child = any(child.type == 'ERROR' for child in node.children)
-            if has_error_child:
+            if index.has_flag(index.row(node), ERROR_CHILD):
                 error_node_index = i
                 break
 
@@ -450,14 +462,13 @@ class PointCalculator:
             error_node = chain_nodes[error_node_index]
             error_text = node_text(error_node, source_bytes)
 
-            import re
             # Check for invalid time pattern
-            invalid_time_match = re.search(r'\d{1,2}:\d(?:\s|$)', error_text)
+            invalid_time_match = _INVALID_TIME.search(error_text)
             if invalid_time_match:
                 invalid_time = invalid_time_match.group().strip()
                 error_msg = f"[ERROR] invalid time format '{invalid_time}' - use HH:MM with 2-digit minutes"
             # Check for missing work marker
-            elif re.search(r'\[\w+\]\s+[^~\[]+(?:---|\+|$)', error_text):
+            elif _MISSING_WORK_MARKER.search(error_text):
                 error_msg = "[ERROR] missing work duration marker - use ~ or explicit [minutes]"
             else:
                 error_msg = "[ERROR] syntax error in continuation block"
@@ -467,9 +478,9 @@ class PointCalculator:
         for i, node in enumerate(chain_nodes):
 
             # Extract start time
-            time_nodes = self.find_all_times(node)
-            start_time = node_text(time_nodes[0], source_bytes) if len(time_nodes) > 0 else None
-            end_time = node_text(time_nodes[1], source_bytes) if len(time_nodes) > 1 else None
+            row = index.row(node)
+            start_time = index.start_time(row)
+            end_time = index.end_time(row)
 
             # Validate time formats
             if start_time and not self.validate_time_format(start_time):
@@ -487,23 +498,19 @@ class PointCalculator:
                 first_start_time = start_time
 
             # Check if this block is marked as x-block
-            if self.detect_x_block(node, source_bytes):
+            if index.has_flag(row, IS_X):
                 is_x_chain = True
 
             # Find blick_list
-            blick_list_node = None
-            for child in node.children:
-                if child.type == 'blick_list':
-                    blick_list_node = child
-                    break
+            list_no = index.direct_list[row]
 
-            if blick_list_node:
+            if list_no >= 0:
                 # Collect categories from this block
-                categories = self.extract_categories(blick_list_node, source_bytes)
+                categories = self.extract_categories(index, row, list_no)
                 all_categories.extend(categories)
 
                 # Calculate work duration for this block
-                num_blicks = self.count_blicks(blick_list_node, source_bytes)
+                num_blicks = self.count_blicks(index, row, list_no)
                 work_minutes = num_blicks * 3
 
                 # If this is not the final block (no end time), calculate imagined end
@@ -785,7 +792,7 @@ class PointCalculator:
         points_text = points_text.strip().strip('()')
 
         # Simple case: just a number
-        if re.match(r'^-?\d+$', points_text):
+        if _INTEGER.match(points_text):
             return int(points_text)
 
         # Complex case: -2,+2f,+1a=1
@@ -823,12 +830,23 @@ class PointCalculator:
             # No focus: reset to +1a
             state.accumulation = 1
 
-    def process_nodes(self, nodes, source_bytes):
+    def copy_state(self, state: CalculationState) -> CalculationState:
+        """Return an independent copy of a calculation state."""
+        return replace(state, focus_categories=set(state.focus_categories))
+
+    def process_nodes(self, nodes, source_bytes, checkpoints=None, resume=None, index=None):
         """Process nodes and calculate expected points.
 
         Args:
             nodes: List of root-level nodes
             source_bytes: Source code as bytes
+            checkpoints: Optional list to append a Checkpoint to before each
+                         root-level node is processed
+            resume: Optional (Checkpoint, ParseCache) pair. Processing starts at
+                    the checkpoint's node, with results for earlier nodes taken
+                    from the cache (their nodes must be unchanged).
+            index: Optional BlockIndex of source_bytes (blocks are indexed as
+                   they are reached if not given)
 
         Returns:
             Tuple of (issues_list, state_dict, block_points_map, category_minutes)
@@ -839,16 +857,34 @@ class PointCalculator:
         """
         from .parser import node_text
 
-        state = CalculationState()
-        issues = []
-        block_points_map = {}  # node -> (BlockPoints, end_time)
-        category_minutes = {}  # Track minutes per category (base category only)
+        if index is None:
+            index = BlockIndex(source_bytes)
+
+        if resume is None:
+            state = CalculationState()
+            issues = []
+            block_points_map = {}  # node -> (BlockPoints, end_time)
+            category_minutes = {}  # Track minutes per category (base category only)
+            i = 0
+        else:
+            checkpoint, cache = resume
+            state = self.copy_state(checkpoint.state)
+            issues = cache.issues[:checkpoint.num_issues]
+            block_points_map = {
+                id(nodes[idx]): value
+                for idx, value in cache.block_points.items()
+                if idx < checkpoint.index
+            }
+            category_minutes = dict(checkpoint.category_minutes)
+            i = checkpoint.index
 
-        i = 0
         # Walk through all blocks sequentially
         while i < len(nodes):
             node = nodes[i]
 
+            if checkpoints is not None:
+                checkpoints.append(Checkpoint(i, self.copy_state(state), len(issues), dict(category_minutes)))
+
             # Stop processing if we hit the end marker (===)
             if node.type == 'end_marker':
                 break
@@ -859,20 +895,18 @@ class PointCalculator:
                 error_text = node_text(node, source_bytes)
 
                 # Check if next line is blank (suppress errors on incomplete last line)
-                source_lines = source_bytes.decode('utf-8').split('\n')
-                if line_num < len(source_lines):
-                    next_line = source_lines[line_num].strip()  # line_num is 1-indexed, array is 0-indexed
-                    if not next_line:
-                        # Next line is blank - suppress this error (incomplete line being edited)
-                        i += 1
-                        continue
+                next_line = index.source_line(line_num)  # line_num is 1-indexed, lines are 0-indexed
+                if next_line is not None and not next_line.strip():
+                    # Next line is blank - suppress this error (incomplete line being edited)
+                    i += 1
+                    continue
 
                 # Check if this ERROR is actually metadata line(s): [category] [text] - HH:MM
                 # Subject is optional (for summary lines)
                 # ERROR nodes can span multiple lines, so check if ALL lines are metadata
                 error_lines = error_text.strip().split('\n')
                 all_metadata = all(
-                    re.match(r'^\s*\[[^\]]+\]\s+(.+\s+)?-\s+\d{1,2}:\d{2}\s*$', line.strip())
+                    _METADATA_LINE.match(line.strip())
                     for line in error_lines if line.strip()
                 )
                 if all_metadata:
@@ -888,7 +922,7 @@ class PointCalculator:
 
                 # Try to identify specific error patterns for better messages
                 # Look for invalid time pattern (digit(s):single-digit at end)
-                invalid_time_match = re.search(r'\d{1,2}:\d(?:\s|$)', error_text)
+                invalid_time_match = _INVALID_TIME.search(error_text)
                 if invalid_time_match:
                     invalid_time = invalid_time_match.group().strip()
                     error_msg = f"[ERROR] invalid time format '{invalid_time}' - use HH:MM with 2-digit minutes"
@@ -896,7 +930,7 @@ class PointCalculator:
                 elif error_text.rstrip().endswith('-') and any(child.type == 'blick_list' for child in node.children):
                     error_msg = f"[ERROR] syntax error: {error_text.strip()} (use ',' to separate blicks)"
                 # Check for missing work marker (category + subject without ~ or [minutes])
-                elif re.search(r'\[\w+\]\s+[^~\[]+(?:---|\+|$)', error_text):
+                elif _MISSING_WORK_MARKER.search(error_text):
                     error_msg = f"[ERROR] syntax error: {error_text.strip()} (missing ~ or [minutes])"
                 else:
                     # Show the actual invalid syntax
@@ -925,14 +959,15 @@ class PointCalculator:
 
             elif node.type in ['time_block', 'continuation_block']:
                 # Check if this starts a continuation chain
-                if self.is_continuation_start(node, source_bytes):
+                row = index.row(node)
+                if index.has_flag(row, CONTINUES):
                     # Collect the entire continuation chain
-                    chain_indices = self.collect_continuation_chain(nodes, i, source_bytes)
+                    chain_indices = self.collect_continuation_chain(nodes, i, index)
                     chain_nodes = [nodes[idx] for idx in chain_indices]
 
                     # Process the entire chain
                     result = self.calculate_continuation_chain_points(
-                        chain_nodes, state, source_bytes
+                        chain_nodes, state, source_bytes, index
                     )
 
                     # Check if result has 3 elements (error with node index) or 2 elements (normal)
@@ -969,26 +1004,14 @@ class PointCalculator:
                     # VALIDATION: Check each line in continuation chain has valid blick count
                     chain_error = False
                     for chain_node in chain_nodes:
-                        is_x_block = self.detect_x_block(chain_node, source_bytes)
-
-                        # Count ALL blick_lists in this node (recursively for ERROR nodes)
-                        def find_all_blick_lists(node):
-                            """Recursively find all blick_list nodes."""
-                            found = []
-                            if node.type == 'blick_list':
-                                found.append(node)
-                            for child in node.children:
-                                found.extend(find_all_blick_lists(child))
-                            return found
-
-                        total_blicks = 0
-                        blick_lists_found = find_all_blick_lists(chain_node)
-                        for blick_list_node in blick_lists_found:
-                            num_blicks = self.count_blicks(blick_list_node, source_bytes)
-                            total_blicks += num_blicks
+                        chain_row = index.row(chain_node)
+                        is_x_block = index.has_flag(chain_row, IS_X)
+
+                        # Count ALL blick_lists in this node (including those nested in ERROR nodes)
+                        total_blicks = self.count_blicks(index, chain_row)
 
                         # Only validate if we found blick_lists
-                        if blick_lists_found:
+                        if index.blick_lists[chain_row]:
                             # Standard blocks should have 3 blicks (9 min) or 4 blicks (12 min for start4)
                             # X-blocks can have 1 or 2 blicks
                             if not is_x_block and total_blicks not in [3, 4]:
@@ -1012,20 +1035,19 @@ class PointCalculator:
                         break
 
                     # Find points node in the final block
-                    final_node = chain_nodes[-1]
-                    points_node = self.find_points_node(final_node)
+                    final_row = index.row(chain_nodes[-1])
+                    actual_text = index.points(final_row)
 
                     # Check if actual points match expected
                     expected_running_total = state.running_total + expected_points.total
 
-                    if points_node:
-                        actual_text = node_text(points_node, source_bytes)
+                    if actual_text is not None:
                         actual_total = self.parse_points_notation(actual_text)
 
                         if actual_total != expected_running_total:
                             # Found a discrepancy
-                            line_num = points_node.start_point[0] + 1
-                            byte_offset = points_node.start_byte
+                            line_num = index.points_line[final_row] + 1
+                            byte_offset = index.points_start(final_row)
                             issues.append((
                                 line_num,
                                 byte_offset,
@@ -1040,24 +1062,14 @@ class PointCalculator:
                     # Update state
                     state.running_total = expected_running_total
 
-                    # Determine if chain has focus (for accumulation)
-                    # We need to extract all categories again (already done in calculate_continuation_chain_points)
-                    # For now, let's extract from final block to check focus
-                    final_blick_list = None
-                    for child in final_node.children:
-                        if child.type == 'blick_list':
-                            final_blick_list = child
-                            break
-
-                    # Actually, we need ALL categories from the chain
+                    # Determine if chain has focus (for accumulation) from ALL categories in the chain
                     all_cats = []
                     is_x_chain = False
                     for chain_node in chain_nodes:
-                        if self.detect_x_block(chain_node, source_bytes):
+                        chain_row = index.row(chain_node)
+                        if index.has_flag(chain_row, IS_X):
                             is_x_chain = True
-                        for child in chain_node.children:
-                            if child.type == 'blick_list':
-                                all_cats.extend(self.extract_categories(child, source_bytes))
+                        all_cats.extend(self.block_categories(index, chain_row))
 
                     # Track category minutes for continuation chains (each blick = 4 minutes)
                     for cat in all_cats:
@@ -1074,8 +1086,7 @@ class PointCalculator:
                     # Offset = how many minutes past the standard 12-minute block boundary
                     # For continuation chains, use the first block's start time
                     end_mins = self.parse_time(final_end_time)
-                    first_time_nodes = self.find_all_times(chain_nodes[0])
-                    first_start = node_text(first_time_nodes[0], source_bytes)
+                    first_start = index.start_time(index.row(chain_nodes[0]))
                     start_mins = self.parse_time(first_start)
 
                     # Standard block boundary = first block start + 12 minutes
@@ -1086,9 +1097,7 @@ class PointCalculator:
                     state.previous_end_time = final_end_time
                     # For continuation chains, use the LAST block's start time, not first
                     # This prevents incorrect "after start block" validation when chain extends past expected boundary
-                    final_start_nodes = self.find_all_times(chain_nodes[-1])
-                    final_start = node_text(final_start_nodes[0], source_bytes)
-                    state.previous_start_time = final_start
+                    state.previous_start_time = index.start_time(final_row)
                     state.is_first_block = False
                     # Clear before-break timing once we've processed the first block after a break
                     state.before_break_end_time = None
@@ -1100,9 +1109,8 @@ class PointCalculator:
 
                 # Not a continuation chain, process as single block
                 # Extract times (may be nested in terminator)
-                time_nodes = self.find_all_times(node)
-                start_time = node_text(time_nodes[0], source_bytes) if len(time_nodes) > 0 else None
-                end_time = node_text(time_nodes[1], source_bytes) if len(time_nodes) > 1 else None
+                start_time = index.start_time(row)
+                end_time = index.end_time(row)
 
                 # Validate time formats
                 if start_time and not self.validate_time_format(start_time):
@@ -1143,63 +1151,33 @@ class PointCalculator:
                         continue
 
                 # Check for ERROR nodes within this block (syntax errors)
-                def find_error_nodes(n):
-                    """Recursively find all ERROR nodes."""
-                    found = []
-                    if n.type == 'ERROR':
-                        found.append(n)
-                    for child in n.children:
-                        found.extend(find_error_nodes(child))
-                    return found
-
-                error_nodes = find_error_nodes(node)
-                if error_nodes:
+                error_text = index.error_text(row)
+                if error_text is not None:
                     # There's a syntax error in this block
                     line_num = node.start_point[0] + 1
 
                     # Check if next line is blank (suppress errors on incomplete last line)
-                    source_lines = source_bytes.decode('utf-8').split('\n')
-                    if line_num < len(source_lines):
-                        next_line = source_lines[line_num].strip()  # line_num is 1-indexed, array is 0-indexed
-                        if not next_line:
-                            # Next line is blank - suppress this error (incomplete line being edited)
-                            i += 1
-                            continue
+                    next_line = index.source_line(line_num)  # line_num is 1-indexed, lines are 0-indexed
+                    if next_line is not None and not next_line.strip():
+                        # Next line is blank - suppress this error (incomplete line being edited)
+                        i += 1
+                        continue
 
-                    error_text = node_text(error_nodes[0], source_bytes).strip()
-                    error_msg = f"[ERROR] syntax error: {error_text}"
+                    error_msg = f"[ERROR] syntax error: {error_text.strip()}"
                     issues.append((line_num, node.start_byte, error_msg, ""))
                     block_points_map[id(node)] = (error_msg, end_time)
                     i += 1
                     continue
 
-                # Find ALL blick_list nodes (recursively, important for ERROR nodes with multiple lists)
-                def find_all_blick_lists(n):
-                    """Recursively find all blick_list nodes."""
-                    found = []
-                    if n.type == 'blick_list':
-                        found.append(n)
-                    for child in n.children:
-                        found.extend(find_all_blick_lists(child))
-                    return found
-
-                blick_lists = find_all_blick_lists(node)
-                blick_list_node = blick_lists[0] if blick_lists else None
-
-                # Find points node (may be nested in terminator)
-                points_node = self.find_points_node(node)
-
                 # Calculate expected points
-                if start_time and end_time and blick_list_node:
+                if start_time and end_time and index.blick_lists[row]:
                     # For ERROR nodes with multiple blick_lists, collect categories from all
-                    categories = []
-                    for bl in blick_lists:
-                        categories.extend(self.extract_categories(bl, source_bytes))
+                    categories = self.extract_categories(index, row)
 
-                    is_x_block = self.detect_x_block(node, source_bytes)
+                    is_x_block = index.has_flag(row, IS_X)
 
                     # Count blicks from ALL blick_lists (important for ERROR nodes)
-                    num_blicks = sum(self.count_blicks(bl, source_bytes) for bl in blick_lists)
+                    num_blicks = self.count_blicks(index, row)
 
                     # Track category minutes (each blick = 4 minutes)
                     for cat in categories:
@@ -1213,23 +1191,8 @@ class PointCalculator:
                     end_mins = self.parse_time(end_time)
                     actual_duration = end_mins - start_mins
 
-                    # Calculate work minutes from blick list
-                    work_minutes = 0
-                    for child in blick_list_node.children:
-                        if child.type == 'blick':
-                            has_minutes = any(c.type == 'minutes' for c in child.children)
-                            has_tilde = any(c.type == '~' for c in child.children)
-
-                            if has_minutes:
-                                for subchild in child.children:
-                                    if subchild.type == 'minutes':
-                                        mins_text = node_text(subchild, source_bytes).strip('[]')
-                                        mins_notation = int(mins_text)
-                                        # Convert notation to actual minutes ([10]->9, [13]->12)
-                                        work_minutes += self.convert_blick_notation_to_minutes(mins_notation)
-                            elif has_tilde or not has_minutes:
-                                # Tilde-only or no minutes/tilde: implicit [10] = 9 minutes
-                                work_minutes += 9
+                    # Calculate work minutes from the first blick list
+                    work_minutes = self.blick_minutes(index, row, 0)
 
                     # VALIDATION: Check for time travel (current block ends before previous block ended)
                     # Use calculate_duration to handle midnight wraparound (6-hour threshold)
@@ -1342,14 +1305,14 @@ class PointCalculator:
                     expected_running_total = state.running_total + expected_points.total
 
                     # Check if actual points match expected
-                    if points_node:
-                        actual_text = node_text(points_node, source_bytes)
+                    actual_text = index.points(row)
+                    if actual_text is not None:
                         actual_total = self.parse_points_notation(actual_text)
 
                         if actual_total != expected_running_total:
                             # Found a discrepancy
-                            line_num = points_node.start_point[0] + 1
-                            byte_offset = points_node.start_byte
+                            line_num = index.points_line[row] + 1
+                            byte_offset = index.points_start(row)
                             issues.append((
                                 line_num,
                                 byte_offset,
@@ -1512,8 +1475,7 @@ class PointCalculator:
         total_minutes = 0
 
         # Match time ranges: HH:MM-HH:MM
-        time_range_pattern = r'(\d{1,2}):(\d{2})-(\d{1,2}):(\d{2})'
-        for match in re.finditer(time_range_pattern, text):
+        for match in _TIME_RANGE.finditer(text):
             start_hour, start_min, end_hour, end_min = map(int, match.groups())
             start_time = f"{start_hour:02d}:{start_min:02d}"
             end_time = f"{end_hour:02d}:{end_min:02d}"
@@ -1524,16 +1486,9 @@ class PointCalculator:
 
         # Match explicit durations using unified parser
         # Pattern covers: Xm, Xh, XhYm, X.Yh, H:MM (but not HH:MM-HH:MM ranges already matched)
-        # Order matters - check more specific patterns first to avoid double-counting
-        duration_patterns = [
-            r'\b(\d+h\d+m)\b',                         # Hours and minutes: 1h34m (most specific, check first)
-            r'\b(\d+(?:\.\d+)?h)(?!\d)',               # Decimal/whole hours: 1.75h, 0.5h, 1h (but not if followed by digit like in 1h34m)
-            r'(?<![:\d-])(\d{1,2}:\d{2})(?![-:])',    # H:MM not part of a range (no dash before or after, no : after)
-            r'\b(\d+m)\b',                             # Minutes only: 5m, 75m
-        ]
-
-        for pattern in duration_patterns:
-            for match in re.finditer(pattern, text):
+        # Order matters - more specific patterns come first to avoid double-counting
+        for pattern in _DURATIONS:
+            for match in pattern.finditer(text):
                 duration_str = match.group(1)
                 parsed = parse_duration(duration_str)
                 if parsed is not None:
@@ -1551,17 +1506,17 @@ class PointCalculator:
             tuple: (category, total_minutes, updated_line)
         """
         # Extract category
-        cat_match = re.match(r'\s*\[([^\]]+)\]', line)
+        cat_match = _FREEFORM_CATEGORY.match(line)
         if not cat_match:
             return None, 0, line
 
         category = cat_match.group(1)
 
         # Remove existing total if present (everything after last " - HH:MM")
-        line_without_total = re.sub(r'\s+-\s+\d{1,2}:\d{2}\s*$', '', line)
+        line_without_total = _FREEFORM_TOTAL.sub('', line)
 
         # Also strip trailing " -" without time (for incomplete lines)
-        line_without_total = re.sub(r'\s+-\s*$', '', line_without_total)
+        line_without_total = _FREEFORM_DASH.sub('', line_without_total)
 
         # Calculate total from time ranges and explicit minutes
         total_minutes = self.parse_freeform_time(line_without_total)
@@ -1727,13 +1682,13 @@ class PointCalculator:
         stripped = line.strip()
 
         # Check if line is just a category with no value
-        category_only_match = re.match(r'^\[(\w+)\]$', stripped)
+        category_only_match = _ATTRIBUTE_CATEGORY_ONLY.match(stripped)
         if category_only_match:
             # Valid but unfilled - return as-is with proper indentation
             return f"    {stripped}", None
 
         # Parse category and values
-        match = re.match(r'^\[(\w+)\]\s+(.+?)(?:\s*✓)?$', stripped)
+        match = _ATTRIBUTE_LINE.match(stripped)
         if not match:
             return line, "Invalid attribute line format"
 
@@ -1743,7 +1698,7 @@ class PointCalculator:
         # Remove any existing " = X.X ✓" suffix for [dep]
         # Match " = " followed by a number with decimal, then optional whitespace/checkmark, then end of string
         # The key is to ensure we match to the end ($) so we don't accidentally match values
-        values_str = re.sub(r'\s+=\s+-?\d+\.\d+\s*✓?\s*$', '', values_str)
+        values_str = _DEP_AVERAGE.sub('', values_str)
 
         # Split values
         values_parts = values_str.split()
@@ -1871,7 +1826,7 @@ class PointCalculator:
                 value_str = values_parts[0]
 
                 # Validate format: must be either $XXXX or -$XXXX (not $-XXXX)
-                if not re.match(r'^-?\$\d+$', value_str):
+                if not _DOLLARS.match(value_str):
                     return line, f"[save] invalid format: {value_str} (expected format: $4500 or -$1500)"
 
                 # Parse negative dollar amounts: -$1500 or positive: $4500
@@ -1925,7 +1880,7 @@ class PointCalculator:
                 break
 
             # Parse category from this line
-            cat_match = re.match(r'^\[(\w+)\]', stripped)
+            cat_match = _ATTRIBUTE_CATEGORY.match(stripped)
             if cat_match:
                 category = cat_match.group(1)
                 existing_attrs[category] = line
@@ -1960,9 +1915,9 @@ class PointCalculator:
             str: Line with points and errors stripped
         """
         # Remove point calculations: (anything with =number)
-        line = re.sub(r'\s*\([^)]*=[^)]*\)', '', line)
+        line = _POINTS_NOTATION.sub('', line)
         # Remove error messages
-        line = re.sub(r'\s*\[ERROR\][^\n]*', '', line)
+        line = _ERROR_MESSAGE.sub('', line)
         return line.rstrip()
 
     def get_ordinal_suffix(self, day: int) -> str:
@@ -1995,7 +1950,7 @@ class PointCalculator:
         filename = Path(file_path).stem  # Get filename without extension
 
         # Match YYYYMMDD pattern at start
-        match = re.match(r'^(\d{8})', filename)
+        match = _DATE_PREFIX.match(filename)
         if not match:
             return None
 
@@ -2023,19 +1978,11 @@ class PointCalculator:
         Returns:
             Optional[str]: Date header line (without newline), or None if not found
         """
-        lines = source_code.split('\n')
-        if not lines:
-            return None
-
-        first_line = lines[0].strip()
+        first_line = source_code.split('\n', 1)[0].strip()
 
         # Check if first line matches date header pattern
         # DayOfWeek, Month Day(st/nd/rd/th), Year
-        pattern = r'^(Monday|Tuesday|Wednesday|Thursday|Friday|Saturday|Sunday),\s+' \
-                  r'(January|February|March|April|May|June|July|August|September|October|November|December)\s+' \
-                  r'\d{1,2}(st|nd|rd|th),\s+\d{4}$'
-
-        if re.match(pattern, first_line):
+        if _DATE_HEADER.match(first_line):
             return first_line
 
         return None
@@ -2050,7 +1997,144 @@ class PointCalculator:
             bool: True if filename matches YYYYMMDD pattern
         """
         filename = Path(file_path).stem
-        return bool(re.match(r'^\d{8}', filename))
+        return bool(_DATE_PREFIX.match(filename))
+
+    def _node_span(self, node) -> tuple:
+        """Identify a root-level node by type and position for cache validation."""
+        return (node.type, node.start_byte, node.end_byte, node.end_point[0])
+
+    def _byte_to_point(self, source_bytes: bytes, offset: int) -> tuple:
+        """Convert a byte offset to a tree-sitter (row, column) point."""
+        row = source_bytes.count(b'\n', 0, offset)
+        line_start = source_bytes.rfind(b'\n', 0, offset) + 1
+        return (row, offset - line_start)
+
+    def _common_length(self, matches, limit: int) -> int:
+        """Binary search for the largest n <= limit where matches(n) holds.
+
+        matches must be monotonic (true up to some n, false after), like
+        comparing prefixes or suffixes of two byte strings.
+        """
+        low, high = 0, limit
+        while low < high:
+            mid = (low + high + 1) // 2
+            if matches(mid):
+                low = mid
+            else:
+                high = mid - 1
+        return low
+
+    def incremental_parse(self, cache_key: str, source_bytes: bytes):
+        """Parse cleaned source, reusing the cached tree and checkpoints for cache_key.
+
+        The changed byte range is found by trimming the common prefix and
+        suffix of the old and new source. The old tree is edited to match and
+        handed to tree-sitter so unchanged subtrees are reused. Calculation
+        resumes from the last checkpoint whose node (and the line after it)
+        lies before the edit, since earlier nodes can't see the change.
+
+        Args:
+            cache_key: Key identifying the file (its resolved path)
+            source_bytes: Cleaned source code as bytes
+
+        Returns:
+            Tuple of (tree, nodes, resume, checkpoints, unchanged):
+            - tree: The parsed syntax tree
+            - nodes: List of root-level nodes
+            - resume: (Checkpoint, ParseCache) to pass to process_nodes, or None
+            - checkpoints: List to collect checkpoints in (pre-filled when resuming)
+            - unchanged: Number of leading nodes that (with the line after
+              them) are the same as in the cached tree, so their block index
+              rows and layout can be reused
+        """
+        cache = self._parse_cache.get(cache_key)
+        if cache is None:
+            tree = self.parser.parse(source_bytes)
+            return tree, list(tree.root_node.children), None, [], 0
+
+        old_bytes = cache.source_bytes
+        edit_row = None
+        if old_bytes == source_bytes:
+            tree = cache.tree
+        else:
+            # Find the edited byte range: [start, old_end) in old became [start, new_end) in new
+            limit = min(len(old_bytes), len(source_bytes))
+            start = self._common_length(
+                lambda n: old_bytes[:n] == source_bytes[:n], limit
+            )
+            suffix = self._common_length(
+                lambda n: old_bytes[len(old_bytes) - n:] == source_bytes[len(source_bytes) - n:],
+                limit - start
+            )
+            old_end = len(old_bytes) - suffix
+            new_end = len(source_bytes) - suffix
+
+            start_point = self._byte_to_point(old_bytes, start)
+            cache.tree.edit(
+                start_byte=start,
+                old_end_byte=old_end,
+                new_end_byte=new_end,
+                start_point=start_point,
+                old_end_point=self._byte_to_point(old_bytes, old_end),
+                new_end_point=self._byte_to_point(source_bytes, new_end),
+            )
+            tree = self.parser.parse(source_bytes, old_tree=cache.tree)
+            edit_row = start_point[0]
+
+        nodes = list(tree.root_node.children)
+
+        # (Under an ERROR root, loose entries are indexed after every child,
+        # so rows can only be split between the nodes of a source_file)
+        unchanged = 0
+        if tree.root_node.type == cache.tree.root_node.type == 'source_file':
+            for node, span in zip(nodes, cache.spans):
+                if (edit_row is not None and span[3] + 1 >= edit_row) or self._node_span(node) != span:
+                    break
+                unchanged += 1
+
+        # Resume from the latest checkpoint whose node, and the line after it
+        # (peeked at by ERROR handling), are strictly before the edited line
+        for position in range(len(cache.checkpoints) - 1, 0, -1):
+            checkpoint = cache.checkpoints[position]
+            idx = checkpoint.index
+            if idx >= len(nodes) or idx >= len(cache.spans):
+                continue
+            if edit_row is not None and cache.spans[idx][3] + 1 >= edit_row:
+                continue
+            if any(self._node_span(nodes[j]) != cache.spans[j] for j in (idx - 1, idx)):
+                continue
+            return tree, nodes, (checkpoint, cache), cache.checkpoints[:position], unchanged
+
+        return tree, nodes, None, [], unchanged
+
+    def layout_nodes(self, nodes, known=()):
+        """Query the nodes that shape each line (queries/layout.scm), node by node.
+
+        Args:
+            nodes: Root-level nodes
+            known: Layout kinds (see below) of leading nodes unchanged since an
+                   earlier call; only those with nested line nodes are queried
+
+        Returns:
+            Tuple of (line nodes, kinds), with one kind per root-level node:
+            True if the node is the only line node in its subtree, False if
+            there is none, None if there are nested ones
+        """
+        line_nodes = []
+        kinds = []
+        for idx, node in enumerate(nodes):
+            kind = known[idx] if idx < len(known) else None
+            if kind is None:
+                captured = self.parser.captures('layout', node).get('line', [])
+                line_nodes.extend(captured)
+                if not captured:
+                    kind = False
+                elif len(captured) == 1 and captured[0] == node:
+                    kind = True
+            elif kind:
+                line_nodes.append(node)
+            kinds.append(kind)
+        return line_nodes, kinds
 
     def fix_file(self, file_path: str, output_path: str = None, dry_run: bool = False) -> int:
         """Fix point calculations, whitespace, and format in a file.
@@ -2063,8 +2147,22 @@ class PointCalculator:
         Returns:
             int: Number of fixes applied
         """
+        return self.analyze_file(file_path, output_path=output_path, dry_run=dry_run).num_fixes
+
+    def analyze_file(self, file_path: str, output_path: str = None, dry_run: bool = False) -> FileAnalysis:
+        """Fix a file like fix_file and return everything derived from its parse.
+
+        Args:
+            file_path: Path to .sxiva file to read
+            output_path: Path to write fixed file (file or directory). If None, write to file_path
+            dry_run: If True, don't actually write changes
+
+        Returns:
+            FileAnalysis: Fixed content, tree, block points, summary minutes and attributes
+        """
         from pathlib import Path
-        from .parser import node_text
+        from .parser import in_tree_order, node_text
+        from .parser_extractor import parse_attribute_lines
 
         # Read and pre-process: strip old calculations and errors BEFORE parsing
         with open(file_path, 'r', encoding='utf-8') as f:
@@ -2120,7 +2218,13 @@ class PointCalculator:
                 # No date header present - add error
                 date_header_error = "[ERROR] file not named with date format (YYYYMMDDd.sxiva)"
 
+        cache_key = str(Path(file_path).resolve()) if self.incremental else None
+        previous = self._parse_cache.get(cache_key) if self.incremental else None
+
         # Strip all old point calculations, error messages, block separators, and comments from the input
+        # (lines that were already there last time aren't stripped again)
+        known_lines = previous.stripped_lines if previous is not None else {}
+        stripped_lines = {}
         cleaned_lines = []
         for line in source_code.split('\n'):
             # Skip block separator lines (,,,)
@@ -2129,49 +2233,90 @@ class PointCalculator:
             # Skip comment lines (lines starting with #)
             if line.strip().startswith('#'):
                 continue
-            cleaned_lines.append(self.strip_points_from_line(line))
+            cleaned = known_lines.get(line)
+            if cleaned is None:
+                cleaned = self.strip_points_from_line(line)
+            stripped_lines[line] = cleaned
+            cleaned_lines.append(cleaned)
         cleaned_source = '\n'.join(cleaned_lines)
 
         # Now parse the clean source
-        tree = self.parser.parse(cleaned_source)
         source_bytes = cleaned_source.encode('utf-8')
 
-        root = tree.root_node
-        nodes = list(root.children)
+        if self.incremental:
+            # Reuse the previous tree and resume calculation after the unchanged prefix
+            tree, nodes, resume, checkpoints, unchanged = self.incremental_parse(cache_key, source_bytes)
+        else:
+            tree = self.parser.parse(source_bytes)
+            nodes = list(tree.root_node.children)
+            resume, checkpoints, unchanged = None, None, 0
+
+        # Index every block in one walk; calculation and formatting both query it.
+        # Rows of the unchanged leading nodes are taken from the previous index.
+        if unchanged:
+            end_byte = nodes[unchanged].start_byte if unchanged < len(nodes) else len(source_bytes)
+            index = previous.index.prefix(source_bytes, end_byte)
+            for node in nodes[unchanged:]:
+                index.add(node)
+        else:
+            index = BlockIndex.build(tree.root_node, source_bytes)
 
         # First, calculate all expected points using shared logic
-        issues, final_state, block_points_map, category_minutes = self.process_nodes(nodes, source_bytes)
+        issues, final_state, block_points_map, category_minutes = self.process_nodes(
+            nodes, source_bytes, checkpoints=checkpoints, resume=resume, index=index
+        )
+
+        block_points = {
+            idx: block_points_map[id(n)]
+            for idx, n in enumerate(nodes)
+            if id(n) in block_points_map
+        }
+
 
         # Track if we've encountered an error (to stop adding calculations after)
         encountered_error = False
         error_line_num = float('inf')
 
         # Find the first error line from block_points_map
+        nodes_by_id = {id(node): node for node in nodes}
         for node_id, (points_or_error, _) in block_points_map.items():
             if isinstance(points_or_error, str) and points_or_error.startswith("[ERROR]"):
                 # Find which line this node is on
-                for node in nodes:
-                    if id(node) == node_id:
-                        error_line_num = min(error_line_num, node.start_point[0])
-                        encountered_error = True
-                        break
+                node = nodes_by_id.get(node_id)
+                if node is not None:
+                    error_line_num = min(error_line_num, node.start_point[0])
+                    encountered_error = True
 
         # Now process line-by-line to apply fixes and formatting
         lines = cleaned_source.split('\n')
         fixed_lines = []
 
-        # Map node start line to node for quick lookup
+        # Map node start line to the nodes that shape each line (queries/layout.scm).
+        # Captures are new node objects: swap in the root-level ones from `nodes`,
+        # which block_points_map is keyed by.
+        root = tree.root_node
+        root_level = {node: node for node in nodes}
         node_map = {}
-
-        def map_nodes(node):
-            """Recursively map all nodes by line number."""
-            if node.start_point[0] not in node_map:
-                node_map[node.start_point[0]] = []
-            node_map[node.start_point[0]].append(node)
-            for child in node.children:
-                map_nodes(child)
-
-        map_nodes(root)
+        if self.incremental:
+            layout_nodes, layout = self.layout_nodes(nodes, previous.layout[:unchanged] if unchanged else ())
+            self._parse_cache[cache_key] = ParseCache(
+                source_bytes=source_bytes,
+                tree=tree,
+                spans=[self._node_span(n) for n in nodes],
+                checkpoints=checkpoints,
+                issues=list(issues),
+                block_points=block_points,
+                index=index,
+                layout=layout,
+                stripped_lines=stripped_lines,
+            )
+            self._parse_cache.move_to_end(cache_key)
+            while len(self._parse_cache) > PARSE_CACHE_SIZE:
+                self._parse_cache.popitem(last=False)
+        else:
+            layout_nodes = [n for n in self.parser.captures('layout', root).get('line', []) if n != root]
+        for node in in_tree_order(layout_nodes):
+            node_map.setdefault(node.start_point[0], []).append(root_level.get(node, node))
 
         # Track state for formatting (indentation, focus tracking)
         state = CalculationState()
@@ -2186,8 +2331,10 @@ class PointCalculator:
         in_c_section = False  # Track if we're inside a {c} section
         in_summary_section = False  # Track if we're inside a {summary} section
         summary_generated = False  # Track if we've already generated the summary
+        summary_minutes = {}  # Category minutes as written to the generated summary
         in_attributes_section = False  # Track if we're inside a {attributes} section
         attributes_generated = False  # Track if we've already generated the attributes
+        attributes_lines = []  # Attribute lines as written to the generated {attributes}
         captured_attributes_lines = []  # Capture attributes lines from source for later processing
         block_count = 0  # Track number of blocks for separator insertion
         previous_line_indent = ""  # Track previous block's indentation for separator
@@ -2263,6 +2410,7 @@ class PointCalculator:
                     if not (fixed_lines and not fixed_lines[-1].strip()):
                         fixed_lines.append("")
                     summary_lines = self.generate_summary_lines(category_minutes)
+                    summary_minutes = dict(category_minutes)
                     fixed_lines.extend(summary_lines)
                     # Add blank line between summary and === if there isn't one already in source
                     end_marker_line_idx = line_idx
@@ -2295,6 +2443,7 @@ class PointCalculator:
                         attrs_lines = self.generate_attributes_template()
                         fixed_lines.extend(attrs_lines)
 
+                    attributes_lines = attrs_lines
                     attributes_generated = True
                     num_fixes += 1
 
@@ -2434,6 +2583,7 @@ class PointCalculator:
                     if fixed_lines and fixed_lines[-1].strip():
                         fixed_lines.append("")
                     summary_lines = self.generate_summary_lines(category_minutes)
+                    summary_minutes = dict(category_minutes)
                     fixed_lines.extend(summary_lines)
                     summary_generated = True
                     num_fixes += 1
@@ -2540,7 +2690,7 @@ class PointCalculator:
                 # Skip ERROR nodes in summary section (old summary lines with invalid times)
                 if in_summary_section:
                     # Check if this is a summary-like line (indented [category] - time)
-                    if re.match(r'^\s*\[[^\]]+\]\s+-\s+', clean_line):
+                    if _SUMMARY_LINE.match(clean_line):
                         # Skip old summary line
                         continue
                     else:
@@ -2550,12 +2700,12 @@ class PointCalculator:
                 # Handle ERROR nodes in c section (c lines that don't match time_block pattern)
                 if in_c_section:
                     # Check if this looks like a c line: HH:MM - amount_text
-                    if re.match(r'^\s*([0-1][0-9]|2[0-3]):[0-5][0-9]\s+-\s+', clean_line):
+                    if _C_LINE.match(clean_line):
                         # This is a c line - indent it
                         content = clean_line.lstrip()
                         fixed_lines.append(f"    {content}")
                         continue
-                    elif re.match(r'^\s*\{', clean_line):
+                    elif _DECLARATION.match(clean_line):
                         # New declaration - end c section
                         in_c_section = False
                         # Fall through to handle as declaration
@@ -2566,7 +2716,7 @@ class PointCalculator:
                         continue
 
                 # Check if this looks like a metadata line: [category] text - HH:MM
-                if re.match(r'^\s*\[[^\]]+\]\s+.+\s+-\s+\d{1,2}:\d{2}\s*$', clean_line):
+                if _METADATA_ENTRY.match(clean_line):
                     # This is a metadata line - preserve with indentation
                     content = clean_line.lstrip()
                     fixed_lines.append(f"    {content}")  # Indent metadata lines
@@ -2650,29 +2800,22 @@ class PointCalculator:
                     continue
 
                 # Extract info we need for formatting
-                blick_list_node = None
-                for child in node.children:
-                    if child.type == 'blick_list':
-                        blick_list_node = child
-                        break
+                row = index.row(node)
+                categories = self.block_categories(index, row)
+                is_x_block = index.has_flag(row, IS_X)
 
-                categories = self.extract_categories(blick_list_node, source_bytes) if blick_list_node else []
-                is_x_block = self.detect_x_block(node, source_bytes)
-
-                # Find points node
-                points_node = self.find_points_node(node)
+                # Find points notation
+                actual_text = index.points(row)
 
                 # Check if this is a continuation block without end time
-                time_nodes = self.find_all_times(node)
-                has_end_time = len(time_nodes) > 1
+                has_end_time = index.end_time(row) is not None
 
                 # Fix points calculation if needed
                 fixed_line = line
                 if has_end_time:
                     # Only add/fix points for blocks with end times
-                    if points_node:
+                    if actual_text is not None:
                         # Points exist - check if correct
-                        actual_text = node_text(points_node, source_bytes)
                         actual_total = self.parse_points_notation(actual_text)
 
                         # Compare running totals
@@ -2827,6 +2970,7 @@ class PointCalculator:
             if fixed_lines and fixed_lines[-1].strip():
                 fixed_lines.append("")
             summary_lines = self.generate_summary_lines(category_minutes)
+            summary_minutes = dict(category_minutes)
             fixed_lines.extend(summary_lines)
             summary_generated = True
             num_fixes += 1
@@ -2857,6 +3001,7 @@ class PointCalculator:
                 fixed_lines.extend(attrs_lines)
                 num_fixes += 1
 
+            attributes_lines = attrs_lines
             attributes_generated = True
 
         # Join fixed lines
@@ -2911,4 +3056,12 @@ class PointCalculator:
                 with open(output_path_obj, 'w', encoding='utf-8') as f:
                     f.write(result)
 
-        return num_fixes
+        return FileAnalysis(
+            path=str(file_path),
+            content=result,
+            num_fixes=num_fixes,
+            tree=tree,
+            block_points=block_points,
+            category_minutes={cat: minutes for cat, minutes in summary_minutes.items() if minutes > 0},
+            attributes=parse_attribute_lines(line.strip() for line in attributes_lines),
+        )
@@ -7,8 +7,85 @@ import click
 from pathlib import Path
 from datetime import datetime
 import subprocess
-from .calculator import PointCalculator
-from .sync import sync_now
+
+# The calculator (tree-sitter) and sync client (requests) are imported where
+# they are used, so `sxiva --list`, `--open N` and `--help` start without them.
+
+
+def _get_calculator():
+    """Get the PointCalculator for the current command.
+
+    Under `sxiva serve` the daemon passes its long-lived incremental
+    calculator in the click context object; otherwise a fresh one is made.
+    """
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and isinstance(ctx.obj, dict) and 'calculator' in ctx.obj:
+        return ctx.obj['calculator']
+
+    from .calculator import PointCalculator
+    return PointCalculator()
+
+
+def _client_env():
+    """The forwarding client's FORWARDED_ENV values under `sxiva serve`, else None."""
+    ctx = click.get_current_context(silent=True)
+    if ctx is not None and isinstance(ctx.obj, dict):
+        return ctx.obj.get('env')
+    return None
+
+
+def _getenv(name, default=None):
+    """Get an environment variable of the user running the command.
+
+    Under `sxiva serve` that is the forwarding client's value (for the names
+    in daemon.FORWARDED_ENV), not the daemon's: the daemon's own environment
+    is shared with its background threads and is never changed per request.
+    """
+    env = _client_env()
+    if env is not None and name in env:
+        value = env[name]
+        return default if value is None else value
+    return os.environ.get(name, default)
+
+
+def _now():
+    """Current local time, in the client's TZ under `sxiva serve`."""
+    env = _client_env()
+    if env is None or env.get('TZ') == os.environ.get('TZ'):
+        return datetime.now()
+
+    try:
+        from zoneinfo import ZoneInfo
+        tz = env.get('TZ')
+        if tz is None:
+            with open('/etc/localtime', 'rb') as f:
+                zone = ZoneInfo.from_file(f)
+        else:
+            zone = ZoneInfo(tz.lstrip(':'))
+    except (ImportError, OSError, ValueError):
+        # No zoneinfo (Python 3.8) or a POSIX TZ string: the daemon's time
+        return datetime.now()
+    return datetime.now(zone).replace(tzinfo=None)
+
+
+def _journal_day(analysis):
+    """Journal the sync payload of a file just rewritten in $SXIVA_DATA.
+
+    The payload is built from the fixer's analysis, so nothing is parsed
+    again; see journal.py for how the journal reaches the dashboard. Files
+    outside $SXIVA_DATA, and everything under SXIVA_NO_SYNC, are left alone.
+    """
+    sxiva_data = _getenv('SXIVA_DATA')
+    if not sxiva_data or _getenv('SXIVA_NO_SYNC'):
+        return
+
+    file_path = Path(analysis.path).resolve()
+    if file_path.parent != Path(sxiva_data).resolve():
+        return
+
+    from .journal import record
+    from .parser_extractor import SxivaDataExtractor
+    record(file_path, SxivaDataExtractor().extract_from_analysis(analysis))
 
 
 def _get_data_path():
@@ -19,7 +96,7 @@ def _get_data_path():
 
     Exits with error if SXIVA_DATA is not set or invalid.
     """
-    sxiva_data = os.environ.get('SXIVA_DATA')
+    sxiva_data = _getenv('SXIVA_DATA')
     if not sxiva_data:
         click.secho("Error: SXIVA_DATA environment variable not set", fg='red', err=True)
         click.echo("Please set SXIVA_DATA to your SXIVA data directory:")
@@ -43,7 +120,7 @@ def _get_yyyymmdd_files(data_path, limit=10):
 
     Args:
         data_path: Path to SXIVA_DATA directory
-        limit: Maximum number of files to return (default: 10)
+        limit: Maximum number of files to return (default: 10, None = all)
 
     Returns:
         List of (date_str, file_path) tuples, sorted newest first
@@ -113,40 +190,41 @@ def open_nth_file(n):
         sys.exit(1)
 
 
-def recalculate_all_files_silent(data_path):
+def recalculate_all_files_silent(data_path, jobs=None):
     """Recalculate all .sxiva files in data_path without prompting.
 
     Args:
         data_path: Path to directory containing .sxiva files
+        jobs: Worker processes (None = one per CPU)
+
+    Returns:
+        list: FileResult per file (carrying sync payloads for sync_now)
     """
     sxiva_files = sorted(data_path.glob('*.sxiva'))
 
     if not sxiva_files:
-        return
+        return []
 
-    # Process all files silently
-    from .calculator import PointCalculator
-    calculator = PointCalculator()
+    # Process all files silently (errors are skipped; unchanged files keep their mtime).
+    # Files whose content hasn't changed since their last recalculation are skipped.
+    from .batch import recalculate_files
+    from .manifest import Manifest
 
-    for file_path in sxiva_files:
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+    manifest = Manifest.load(data_path)
+    results = list(recalculate_files(sxiva_files, jobs=jobs, manifest=manifest))
+    manifest.save()
+    return results
 
-            # Calculate and update the file
-            updated_content = calculator.calculate(content, file_path=str(file_path))
 
-            # Only write if content changed (preserves mtime)
-            if updated_content != content:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(updated_content)
-        except Exception:
-            # Silent skip on errors
-            pass
+def recalculate_all_files(jobs=None):
+    """Recalculate all .sxiva files in the current directory.
 
+    Args:
+        jobs: Worker processes (None = one per CPU, 1 = serial)
 
-def recalculate_all_files():
-    """Recalculate all .sxiva files in the current directory."""
+    Returns:
+        list: FileResult per file in name order (empty if cancelled)
+    """
     # Find all .sxiva files in current directory
     # Use SXIVA_ORIGINAL_DIR if set by wrapper script, otherwise use PWD or cwd
     original_dir = os.environ.get('SXIVA_ORIGINAL_DIR') or os.environ.get('PWD')
@@ -158,7 +236,7 @@ def recalculate_all_files():
 
     if not sxiva_files:
         click.secho("No .sxiva files found in current directory", fg='yellow')
-        return
+        return []
 
     # Show files and ask for confirmation
     click.echo(f"Found {len(sxiva_files)} .sxiva file(s) in {cwd}:")
@@ -171,59 +249,45 @@ def recalculate_all_files():
 
     if response.lower() != 'y':
         click.echo("Cancelled.")
-        return
+        return []
 
-    # Process all files
-    from .calculator import PointCalculator
-    calculator = PointCalculator()
+    # Process all files (in parallel when jobs > 1; results arrive in name order)
+    import time
+    from .batch import recalculate_files, resolve_jobs
 
-    success_count = 0
-    files_with_errors = []  # Track files that have [ERROR] messages
-    files_changed = []  # Track files that had changes
-    files_unchanged = []  # Track files with no changes
+    workers = resolve_jobs(jobs, len(sxiva_files))
+    started = time.perf_counter()
+    results = []
 
     click.echo()
-    for file_path in sxiva_files:
-        try:
-            # Read original content before processing
-            with open(file_path, 'r', encoding='utf-8') as f:
-                original_content = f.read()
-
-            # Process the file
-            num_fixes = calculator.fix_file(str(file_path), output_path=None, dry_run=False)
-
-            # Read content after processing
-            with open(file_path, 'r', encoding='utf-8') as f:
-                new_content = f.read()
-                has_errors = '[ERROR]' in new_content
-
-            # Determine if file actually changed
-            file_changed = (original_content != new_content)
-
-            if has_errors:
-                # File has [ERROR] messages - show in red with X
-                click.secho(f"✗ {file_path.name} (has errors)", fg='red')
-                files_with_errors.append(file_path.name)
-            elif file_changed:
-                # File was changed - show in yellow
-                click.secho(f"✓ {file_path.name} (regenerated with changes)", fg='yellow')
-                files_changed.append(file_path.name)
-            else:
-                # No changes - show in green
-                click.secho(f"✓ {file_path.name} (no changes)", fg='green')
-                files_unchanged.append(file_path.name)
-            success_count += 1
-        except Exception as e:
-            click.secho(f"✗ {file_path.name}: {e}", fg='red', err=True)
-            files_with_errors.append(file_path.name)
+    for result in recalculate_files(sxiva_files, jobs=workers):
+        results.append(result)
+        if result.error:
+            click.secho(f"✗ {result.name}: {result.error}", fg='red', err=True)
+        elif result.status == 'errored':
+            # File has [ERROR] messages - show in red with X
+            click.secho(f"✗ {result.name} (has errors)", fg='red')
+        elif result.status == 'changed':
+            # File was changed - show in yellow
+            click.secho(f"✓ {result.name} (regenerated with changes)", fg='yellow')
+        else:
+            # No changes - show in green
+            click.secho(f"✓ {result.name} (no changes)", fg='green')
+
+    elapsed = time.perf_counter() - started
+    files_with_errors = [r.name for r in results if r.status == 'errored']
+    num_changed = sum(1 for r in results if r.status == 'changed')
+    num_unchanged = sum(1 for r in results if r.status == 'unchanged')
+    success_count = sum(1 for r in results if r.error is None)
 
     # Summary
     click.echo()
     click.echo("=" * 50)
-    click.secho(f"Processed {success_count} file(s)", fg='cyan')
+    click.secho(f"Processed {success_count} file(s) in {elapsed:.2f}s "
+                f"({workers} worker{'s' if workers != 1 else ''})", fg='cyan')
     click.echo()
-    click.secho(f"  {len(files_unchanged)} unchanged", fg='green')
-    click.secho(f"  {len(files_changed)} regenerated with changes", fg='yellow')
+    click.secho(f"  {num_unchanged} unchanged", fg='green')
+    click.secho(f"  {num_changed} regenerated with changes", fg='yellow')
 
     if files_with_errors:
         click.secho(f"  {len(files_with_errors)} with errors", fg='red')
@@ -233,8 +297,13 @@ def recalculate_all_files():
             click.secho(f"  - {filename}", fg='red')
     else:
         click.secho(f"  0 with errors", fg='green')
+
+    slowest = max(results, key=lambda r: r.seconds)
+    click.echo(f"  Slowest: {slowest.name} ({slowest.seconds * 1000:.0f} ms)")
     click.echo("=" * 50)
 
+    return results
+
 
 @click.group(invoke_without_command=True)
 @click.version_option(version="0.1.0")
@@ -245,9 +314,10 @@ def recalculate_all_files():
 @click.option('-l', '--list', 'list_files', is_flag=True, help='List last 10 YYYYMMDD sxiva files in reverse chronological order')
 @click.option('-o', '--open', 'open_nth', metavar='N', type=int, help='Open the Nth file from the list (1-based index)')
 @click.option('-a', '--all', 'recalculate_all', is_flag=True, help='Recalculate all .sxiva files in current directory')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=0), default=None, help='Worker processes for --all (default: one per CPU; 1 = serial)')
 @click.option('--local', 'sync_local', is_flag=True, help='Sync to local database (localhost:5000) instead of remote')
 @click.pass_context
-def cli(ctx, date, yesterday, tomorrow, preserve, list_files, open_nth, recalculate_all, sync_local):
+def cli(ctx, date, yesterday, tomorrow, preserve, list_files, open_nth, recalculate_all, jobs, sync_local):
     """SXIVA CLI tools for parsing and calculating points.
 
     When called without a subcommand, opens today's SXIVA file from $SXIVA_DATA.
@@ -258,7 +328,7 @@ def cli(ctx, date, yesterday, tomorrow, preserve, list_files, open_nth, recalcul
 
     # Handle --all flag
     if recalculate_all:
-        recalculate_all_files()
+        recalculate_all_files(jobs=jobs)
         return
 
     # Handle --list flag
@@ -449,14 +519,14 @@ def open_today(date_str=None, yesterday=False, preserve=None, sync_local=False,
     elif yesterday:
         # Yesterday
         from datetime import timedelta
-        target_date = datetime.now() - timedelta(days=1)
+        target_date = _now() - timedelta(days=1)
     elif tomorrow:
         # Tomorrow
         from datetime import timedelta
-        target_date = datetime.now() + timedelta(days=1)
+        target_date = _now() + timedelta(days=1)
     else:
         # Today (default)
-        target_date = datetime.now()
+        target_date = _now()
 
     formatted_date = target_date.strftime('%Y%m%d')
     day_letter = _day_letter(target_date)
@@ -504,14 +574,17 @@ def open_today(date_str=None, yesterday=False, preserve=None, sync_local=False,
     if not file_is_new:
         _sanitize_section_markers(file_path)
 
-    # Recalculate all files silently (unless SXIVA_NO_RECALC is set)
-    if not os.environ.get('SXIVA_NO_RECALC'):
-        recalculate_all_files_silent(data_path)
+    # Recalculate all files silently: opt-in with SXIVA_RECALC=1, since it
+    # rewrites the whole data directory before the editor opens
+    recalculated = None
+    if os.environ.get('SXIVA_RECALC') and not os.environ.get('SXIVA_NO_RECALC'):
+        recalculated = recalculate_all_files_silent(data_path)
 
-    # Sync to dashboard (unless SXIVA_NO_SYNC is set)
+    # Sync to dashboard (unless SXIVA_NO_SYNC is set), reusing the recalculation's parse
     if not os.environ.get('SXIVA_NO_SYNC'):
+        from .sync import sync_now
         api_url = 'http://localhost:5000' if sync_local else None
-        sync_now(data_path, api_url=api_url)
+        sync_now(data_path, api_url=api_url, recalculated=recalculated)
 
     # Open with editor
     editor = os.environ.get('EDITOR', 'vi')
@@ -542,13 +615,16 @@ def calculate(file_path, fix, output):
         sxiva calculate input.sxiva -o output.sxiva    # Fix to specific file
         sxiva calculate input.sxiva -o out_dir/        # Fix to directory
     """
-    calculator = PointCalculator()
+    calculator = _get_calculator()
 
     try:
         if fix or output:
             # Fix mode: determine output path
             output_path = output if output else file_path
-            num_fixes = calculator.fix_file(file_path, output_path=output_path, dry_run=False)
+            analysis = calculator.analyze_file(file_path, output_path=output_path, dry_run=False)
+            num_fixes = analysis.num_fixes
+            if output_path == file_path:
+                _journal_day(analysis)
 
             if num_fixes > 0:
                 target = output_path if output_path != file_path else file_path
@@ -596,78 +672,51 @@ def log_now(file_path):
         sxiva log-now today.sxiva    # Set last entry end time to now
     """
     from datetime import datetime
-    from .parser import SxivaParser, node_text
+    from .block_index import BlockIndex
 
     try:
         # Read the file
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Parse with tree-sitter
-        parser = SxivaParser()
-        tree = parser.parse(content)
+        # Parse with tree-sitter and index all time_block and continuation_block nodes
+        parser = _get_calculator().parser
         source_bytes = content.encode('utf-8')
+        tree = parser.parse(source_bytes)
+        index = BlockIndex.build(tree.root_node, source_bytes)
+        blocks = index.rows('time_block', 'continuation_block')
 
-        # Find all time_block and continuation_block nodes
-        time_blocks = []
-
-        def find_time_blocks(node):
-            if node.type in ['time_block', 'continuation_block']:
-                time_blocks.append(node)
-            for child in node.children:
-                find_time_blocks(child)
-
-        find_time_blocks(tree.root_node)
-
-        if not time_blocks:
+        if not blocks:
             click.secho("No timesheet entries found in file", fg='yellow')
             sys.exit(1)
 
-        # Find the end time node within a block
+        # Find the last time block that has a valid end time
         # Structure: time_block -> terminator -> end_term -> time
-        # Or: continuation_block -> terminator -> end_term -> time
-        def find_end_time(node):
-            if node.type == 'time' and node.parent and node.parent.type == 'end_term':
-                return node
-            for child in node.children:
-                result = find_end_time(child)
-                if result:
-                    return result
-            return None
+        end_time_span = None
+
+        for row in reversed(blocks):
+            end_time = index.end_term_time(row)
+            # Check that the end time is not empty (e.g., line ending with just "---")
+            if end_time and end_time.strip():
+                old_end_time = end_time
+                end_time_span = index.end_term_span(row)
+                break
 
-        # Find the last time block that has a valid end time
-        last_block_with_end_time = None
-        end_time_node = None
-
-        for block in reversed(time_blocks):
-            end_time = find_end_time(block)
-            if end_time:
-                # Check that the end time is not empty (e.g., line ending with just "---")
-                end_time_text = node_text(end_time, source_bytes).strip()
-                if end_time_text:
-                    last_block_with_end_time = block
-                    end_time_node = end_time
-                    break
-
-        if not end_time_node:
+        if not end_time_span:
             click.secho("Could not find any timesheet entry with an end time", fg='yellow')
             sys.exit(1)
 
-        # Get the old end time
-        old_end_time = node_text(end_time_node, source_bytes)
-
         # Get current time rounded to nearest minute
-        now = datetime.now()
+        now = _now()
         current_time = f"{now.hour:02d}:{now.minute:02d}"
 
-        # Replace the end time in the content
-        start_byte = end_time_node.start_byte
-        end_byte = end_time_node.end_byte
+        # Replace the end time in the content (node offsets are bytes)
+        start_byte, end_byte = end_time_span
         new_content = (
-            content[:start_byte] +
-            current_time +
-            content[end_byte:]
-        )
+            source_bytes[:start_byte] +
+            current_time.encode('utf-8') +
+            source_bytes[end_byte:]
+        ).decode('utf-8')
 
         # Write back to file
         with open(file_path, 'w', encoding='utf-8') as f:
@@ -676,8 +725,8 @@ def log_now(file_path):
         click.secho(f"✓ Updated last entry end time: {old_end_time} → {current_time}", fg='green')
 
         # Now run calculator to fix point calculations
-        calculator = PointCalculator()
-        calculator.fix_file(file_path, output_path=None, dry_run=False)
+        calculator = _get_calculator()
+        _journal_day(calculator.analyze_file(file_path, output_path=None, dry_run=False))
         click.secho(f"✓ Recalculated points", fg='green')
 
     except FileNotFoundError as e:
@@ -702,7 +751,7 @@ def log_end(file_path):
     Example:
         sxiva log-end today.sxiva    # Clean up last incomplete entry and log current time
     """
-    from .parser import SxivaParser, node_text
+    from .block_index import BlockIndex
     from datetime import datetime
 
     try:
@@ -710,65 +759,27 @@ def log_end(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Parse with tree-sitter
-        parser = SxivaParser()
-        tree = parser.parse(content)
+        # Parse with tree-sitter and index the blocks and incomplete entries
+        parser = _get_calculator().parser
         source_bytes = content.encode('utf-8')
+        tree = parser.parse(source_bytes)
+        index = BlockIndex.build(tree.root_node, source_bytes)
 
         # Find all lines that look like incomplete entries
         # We need to look for:
         # 1. Valid time_block/continuation_block nodes with empty end times
         # 2. Invalid lines that start with time - blick_list --- but have junk after ---
-
-        # Collect candidate entries: (line_number, has_dash_end)
+        #    (indexed as 'entry' rows: a time outside any block with a --- sibling)
         candidates = []
 
-        def find_candidates(node, parent=None, inside_block=False):
-            # Case 1: Valid blocks with empty end times
-            if node.type in ['time_block', 'continuation_block']:
-                # Check if it has an empty end time
-                def find_end_time(n):
-                    if n.type == 'time' and n.parent and n.parent.type == 'end_term':
-                        return n
-                    for child in n.children:
-                        result = find_end_time(child)
-                        if result:
-                            return result
-                    return None
-
-                end_time = find_end_time(node)
-                if end_time:
-                    end_time_text = node_text(end_time, source_bytes).strip()
-                    if not end_time_text:
-                        # This is an incomplete entry
-                        line_num = node.start_point[0]
-                        candidates.append(line_num)
-
-                # Recurse into children but mark that we're inside a block
-                for child in node.children:
-                    find_candidates(child, node, inside_block=True)
-                return
-
-            # Case 2: Look for time nodes (or x_time nodes for x-blocks) that are NOT inside a time_block
-            # but have a triple_dash or --- sibling (these are invalid/incomplete lines)
-            if not inside_block and node.type in ['time', 'x_time'] and parent and parent.type != 'start_term':
-                # Check if this time has a triple_dash or --- sibling
-                if parent:
-                    has_dash = False
-                    for sibling in parent.children:
-                        if sibling.type in ['triple_dash', '---']:
-                            has_dash = True
-                            break
-
-                    if has_dash:
-                        # This looks like a time entry with dashes
-                        line_num = node.start_point[0]
-                        candidates.append(line_num)
-
-            for child in node.children:
-                find_candidates(child, node, inside_block)
-
-        find_candidates(tree.root_node)
+        for row in index.rows():
+            if index.type(row) == 'entry':
+                candidates.append(index.line[row])
+            else:
+                end_time = index.end_term_time(row)
+                if end_time is not None and not end_time.strip():
+                    # This is an incomplete entry
+                    candidates.append(index.line[row])
 
         if not candidates:
             click.secho("No incomplete timesheet entries found", fg='yellow')
@@ -798,7 +809,7 @@ def log_end(file_path):
         cleaned_line = block_line[:dash_end]
 
         # Now add the current time as the end time
-        current_time = datetime.now()
+        current_time = _now()
         time_str = current_time.strftime('%H:%M')
 
         # Add the time after the dashes
@@ -841,7 +852,7 @@ def repeat_entry(file_path):
     Example:
         sxiva repeat-entry today.sxiva    # Duplicate last entry with +12 min start
     """
-    from .parser import SxivaParser, node_text
+    from .block_index import BlockIndex
     from datetime import datetime, timedelta
 
     try:
@@ -849,46 +860,13 @@ def repeat_entry(file_path):
         with open(file_path, 'r', encoding='utf-8') as f:
             content = f.read()
 
-        # Parse with tree-sitter
-        parser = SxivaParser()
-        tree = parser.parse(content)
+        # Parse with tree-sitter and index the blocks, including
+        # incomplete/invalid entries like we do in log-end
+        parser = _get_calculator().parser
         source_bytes = content.encode('utf-8')
-
-        # Find all time_block and continuation_block nodes
-        time_blocks = []
-
-        def find_time_blocks(node):
-            if node.type in ['time_block', 'continuation_block']:
-                time_blocks.append(node)
-            for child in node.children:
-                find_time_blocks(child)
-
-        find_time_blocks(tree.root_node)
-
-        # Also look for incomplete/invalid entries like we do in log-end
-        candidates = []
-
-        def find_candidates(node, parent=None, inside_block=False):
-            if node.type in ['time_block', 'continuation_block']:
-                candidates.append(node.start_point[0])
-                for child in node.children:
-                    find_candidates(child, node, inside_block=True)
-                return
-
-            if not inside_block and node.type in ['time', 'x_time'] and parent and parent.type != 'start_term':
-                if parent:
-                    has_dash = False
-                    for sibling in parent.children:
-                        if sibling.type in ['triple_dash', '---']:
-                            has_dash = True
-                            break
-                    if has_dash:
-                        candidates.append(node.start_point[0])
-
-            for child in node.children:
-                find_candidates(child, node, inside_block)
-
-        find_candidates(tree.root_node)
+        tree = parser.parse(source_bytes)
+        index = BlockIndex.build(tree.root_node, source_bytes)
+        candidates = list(index.line)
 
         if not candidates:
             click.secho("No timesheet entries found in file", fg='yellow')
@@ -959,8 +937,143 @@ def repeat_entry(file_path):
         sys.exit(1)
 
 
+@cli.command()
+@click.option('--format', 'output_format', type=click.Choice(['csv', 'jsonl']), default='csv', help='Output format (default: csv)')
+@click.option('--hobby', default='', help='Comma-separated hobby categories (e.g., wf,wr,bkc)')
+@click.option('--work', default='', help='Comma-separated work categories (e.g., sp)')
+@click.option('--days', 'window_days', type=click.IntRange(min=1), default=7, help='Rolling window size (default: 7)')
+@click.option('--lambda', 'decay_lambda', type=float, default=0.2, help='Decay parameter for exponential weighting (default: 0.2)')
+@click.option('-j', '--jobs', metavar='N', type=click.IntRange(min=0), default=None, help='Worker processes (default: one per CPU; 1 = serial)')
+def stats(output_format, hobby, work, window_days, decay_lambda, jobs):
+    """Write per-day and rolling category totals for every dated file.
+
+    Extracts the YYYYMMDD files in $SXIVA_DATA that changed since they were
+    last cached (in $SXIVA_DATA/.sxiva-days.bin), then writes one row per day
+    to stdout in date order: the day's hobby, work, other and total minutes,
+    and the same rolling series as the dashboard's category rolling sum
+    (computed by the same engine). No database is needed. JSONL rows also
+    carry each day's category_minutes.
+
+    \b
+    Example:
+        sxiva stats --hobby wf,wr,bkc --work sp > stats.csv
+        sxiva stats --format jsonl --days 14 | jq .hobby_weighted
+    """
+    import csv
+    import json
+    from .day_cache import DayCache, day_files
+    from .stats import FIELDS, cache_stats
+
+    data_path = _get_data_path()
+    files = day_files(data_path)
+
+    # A date with several files keeps the last by name, as a sync would
+    files_by_date = {}
+    for file_path in files:
+        files_by_date[file_path.name[:8]] = file_path
+
+    cache = DayCache.load(data_path)
+    cache.retain(p.name for p in files)
+    cache.update(list(files_by_date.values()), jobs=jobs)
+    cache.save()
+    rows = cache_stats(
+        cache,
+        names=[p.name for p in files_by_date.values()],
+        hobby=[cat.strip() for cat in hobby.split(',') if cat.strip()],
+        work=[cat.strip() for cat in work.split(',') if cat.strip()],
+        window_days=window_days,
+        decay_lambda=decay_lambda,
+    )
+
+    out = sys.stdout
+    if output_format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=FIELDS, extrasaction='ignore', lineterminator='\n')
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(row)
+    else:
+        for row in rows:
+            out.write(json.dumps(row) + '\n')
+
+
+@cli.command()
+@click.option('--socket', 'socket_path', type=click.Path(), help='Socket path (default: $SXIVA_SOCKET, $XDG_RUNTIME_DIR/sxiva-<uid>.sock or a private sxiva-<uid> temp directory)')
+def serve(socket_path):
+    """Run a daemon that keeps the parser and calculator warm.
+
+    While it runs, `calculate`, `log-now`, `log-end` and `repeat-entry` are
+    forwarded to it over a Unix socket instead of starting up a new parser,
+    and repeated recalculations of the same file reuse its previous parse.
+    Set SXIVA_NO_DAEMON=1 to bypass a running daemon.
+
+    \b
+    Example:
+        sxiva serve &                 # Start the daemon in the background
+        sxiva log-now today.sxiva     # Handled by the daemon
+    """
+    from .daemon import serve as run_daemon, default_socket_path
+
+    socket_path = Path(socket_path) if socket_path else default_socket_path()
+    click.echo(f"sxiva daemon listening on {socket_path}")
+
+    try:
+        run_daemon(socket_path)
+    except (RuntimeError, OSError) as e:
+        click.secho(f"Error: {e}", fg='red', err=True)
+        sys.exit(1)
+
+
+@cli.command()
+@click.option('--debounce', type=float, default=None,
+              help='Seconds a file must go unchanged before it is handled (default: $SXIVA_WATCH_DEBOUNCE or 0.5)')
+@click.option('--poll', is_flag=True, help='Poll for changes instead of using inotify')
+def watch(debounce, poll):
+    """Fix and sync files in $SXIVA_DATA as they are saved.
+
+    Syncs whatever changed since the last sync, then waits for saves to
+    YYYYMMDD files (inotify on Linux, polling elsewhere). Once a file has
+    gone unchanged for the debounce delay, its point calculations are fixed
+    and its day is uploaded to the dashboard, reusing one parser and one
+    HTTP connection. With SXIVA_NO_SYNC set, files are only fixed.
+
+    \b
+    Example:
+        sxiva watch &                 # Keep the dashboard current while editing
+    """
+    from .watch import AutoSync, DEBOUNCE_SECONDS, watch as run_watch
+
+    data_path = _get_data_path()
+
+    client = None
+    if not os.environ.get('SXIVA_NO_SYNC'):
+        from .sync import SxivaSyncClient
+        client = SxivaSyncClient()
+
+    auto_sync = AutoSync(data_path, client)
+    auto_sync.catch_up()
+
+    click.echo(f"Watching {data_path} (Ctrl-C to stop)")
+    try:
+        run_watch(data_path, auto_sync, debounce=DEBOUNCE_SECONDS if debounce is None else debounce,
+                  polling=poll, report=click.echo)
+    except KeyboardInterrupt:
+        pass
+
+
 def main():
-    """Entry point for the CLI."""
+    """Entry point for the CLI.
+
+    Commands the daemon serves are forwarded to it when it is running;
+    otherwise (or with SXIVA_NO_DAEMON set) they run in this process.
+    """
+    args = sys.argv[1:]
+    # Only subcommands are forwarded; options like --list never load the client
+    if args and not args[0].startswith('-') and not os.environ.get('SXIVA_NO_DAEMON'):
+        from .daemon import FORWARDED_COMMANDS, forward
+        if args[0] in FORWARDED_COMMANDS:
+            exit_code = forward(args)
+            if exit_code is not None:
+                sys.exit(exit_code)
     cli()
 
 
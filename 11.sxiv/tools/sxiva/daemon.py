@@ -0,0 +1,309 @@
+"""Long-lived `sxiva serve` daemon and the thin client that forwards to it.
+
+Each `sxiva calculate`, `log-now`, `log-end` and `repeat-entry` run otherwise
+starts a fresh process that loads parser.so and builds a new PointCalculator.
+The daemon keeps one incremental PointCalculator (and with it one loaded
+Language/Parser and the per-file tree caches) alive, and runs forwarded
+commands in-process. Unless SXIVA_NO_SYNC is set, it also runs the sync
+journal's background flusher (see journal.py), so edits reach the dashboard
+without waiting for the next `sxiva` run.
+
+Protocol: the client connects to a Unix socket, sends one JSON line
+{"args": [...], "cwd": "...", "env": {...}} and reads back one JSON line
+{"exit_code": int, "stdout": str, "stderr": str}. "env" holds the client's
+values of FORWARDED_ENV (null if unset); the command reads them instead of
+the daemon's environment (see cli._getenv()).
+
+The socket is created readable and writable by its owner only, and neither
+side uses a socket owned by another user: without $XDG_RUNTIME_DIR it lives
+in a private directory under the shared temp directory.
+"""
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import tempfile
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import List, Optional
+
+
+# Subcommands the CLI forwards to a running daemon
+FORWARDED_COMMANDS = {'calculate', 'log-now', 'log-end', 'repeat-entry'}
+
+# Environment variables forwarded commands depend on: where files are
+# journaled, whether to journal at all, and the local time log-now uses
+FORWARDED_ENV = ('SXIVA_DATA', 'SXIVA_NO_SYNC', 'TZ')
+
+# Seconds the client waits for the daemon to answer
+CLIENT_TIMEOUT = 30
+
+
+def default_socket_path() -> Path:
+    """Get the daemon socket path.
+
+    Uses $SXIVA_SOCKET if set, otherwise sxiva-<uid>.sock in $XDG_RUNTIME_DIR,
+    or sxiva.sock in a private sxiva-<uid> directory of the system temp
+    directory (created by serve()).
+    """
+    socket_path = os.environ.get('SXIVA_SOCKET')
+    if socket_path:
+        return Path(socket_path)
+
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return Path(runtime_dir) / f'sxiva-{os.getuid()}.sock'
+    return Path(tempfile.gettempdir()) / f'sxiva-{os.getuid()}' / 'sxiva.sock'
+
+
+def _owned_by_user(path: Path) -> Optional[bool]:
+    """True if path belongs to the current user, None if it doesn't exist."""
+    try:
+        return os.stat(path).st_uid == os.getuid()
+    except FileNotFoundError:
+        return None
+
+
+def forward(args: List[str], socket_path: Optional[Path] = None) -> Optional[int]:
+    """Run a CLI command on the daemon and relay its output.
+
+    Args:
+        args: Command-line arguments (without the program name)
+        socket_path: Daemon socket (default: default_socket_path())
+
+    Returns:
+        The command's exit code, or None if no daemon accepts the connection
+        (the caller should then run the command in-process). Once the
+        request is sent the command may have run, so later failures (e.g.
+        a timeout while the daemon is busy) are reported as exit code 1
+        instead: running it again could apply an entry twice.
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+
+    owned = _owned_by_user(socket_path)
+    if owned is None:
+        return None
+    if not owned:
+        # Someone else's socket: never send it our arguments and environment
+        sys.stderr.write(f"Warning: ignoring {socket_path}, which belongs to another user\n")
+        return None
+
+    request = json.dumps({
+        'args': args,
+        'cwd': os.getcwd(),
+        'env': {name: os.environ.get(name) for name in FORWARDED_ENV},
+    }) + '\n'
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(CLIENT_TIMEOUT)
+        try:
+            sock.connect(str(socket_path))
+        except OSError:
+            # Stale socket or daemon went away - fall back to in-process
+            return None
+
+        try:
+            sock.sendall(request.encode('utf-8'))
+            sock.shutdown(socket.SHUT_WR)
+
+            chunks = []
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            response = json.loads(b''.join(chunks).decode('utf-8'))
+        except (OSError, ValueError) as e:
+            sys.stderr.write(f"Error: no answer from sxiva daemon on {socket_path} ({e}); "
+                             "the command may or may not have run\n")
+            return 1
+
+    sys.stdout.write(response.get('stdout', ''))
+    sys.stdout.flush()
+    sys.stderr.write(response.get('stderr', ''))
+    sys.stderr.flush()
+    return response.get('exit_code', 1)
+
+
+def run_command(args: List[str], cwd: str, calculator, env: Optional[dict] = None) -> dict:
+    """Run a CLI command in-process with captured output.
+
+    Args:
+        args: Command-line arguments (without the program name)
+        cwd: Working directory of the client (relative paths resolve here)
+        calculator: Shared PointCalculator handed to the command
+        env: The client's FORWARDED_ENV values, read by the command instead
+             of the daemon's environment (default: the daemon's own)
+
+    Returns:
+        dict with 'exit_code', 'stdout' and 'stderr'
+    """
+    from .cli import cli
+
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    exit_code = 0
+    previous_cwd = os.getcwd()
+
+    obj = {'calculator': calculator}
+    if env is not None:
+        obj['env'] = {name: env.get(name) for name in FORWARDED_ENV}
+
+    try:
+        os.chdir(cwd)
+        with redirect_stdout(stdout), redirect_stderr(stderr):
+            try:
+                cli.main(args=args, prog_name='sxiva', obj=obj)
+            except SystemExit as e:
+                if e.code is None:
+                    exit_code = 0
+                elif isinstance(e.code, int):
+                    exit_code = e.code
+                else:
+                    stderr.write(f"{e.code}\n")
+                    exit_code = 1
+            except Exception as e:
+                stderr.write(f"Error: {e}\n")
+                exit_code = 1
+    except OSError as e:
+        stderr.write(f"Error: {e}\n")
+        exit_code = 1
+    finally:
+        os.chdir(previous_cwd)
+
+    return {'exit_code': exit_code, 'stdout': stdout.getvalue(), 'stderr': stderr.getvalue()}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Handle one forwarded command per connection."""
+
+    def handle(self):
+        line = self.rfile.readline()
+        try:
+            request = json.loads(line.decode('utf-8'))
+            args = [str(arg) for arg in request['args']]
+            cwd = str(request.get('cwd') or os.getcwd())
+            env = request.get('env')
+            if env is not None and not isinstance(env, dict):
+                raise TypeError('env')
+        except (ValueError, KeyError, TypeError):
+            response = {'exit_code': 2, 'stdout': '', 'stderr': "Error: malformed request\n"}
+        else:
+            if args and args[0] in FORWARDED_COMMANDS:
+                response = run_command(args, cwd, self.server.calculator, env)
+            else:
+                response = {
+                    'exit_code': 2,
+                    'stdout': '',
+                    'stderr': f"Error: command not served by daemon: {' '.join(args)}\n"
+                }
+
+        self.wfile.write((json.dumps(response) + '\n').encode('utf-8'))
+
+
+class SxivaServer(socketserver.UnixStreamServer):
+    """Unix socket server holding one warm, incremental PointCalculator.
+
+    Requests are handled one at a time: the tree-sitter parser is not
+    thread-safe and commands change the working directory while running.
+    """
+
+    def __init__(self, socket_path: Path):
+        from .calculator import PointCalculator
+
+        self.socket_path = Path(socket_path)
+        self.calculator = PointCalculator(incremental=True)
+        # Load parser.so now so the first request doesn't pay for it
+        self.calculator.parser
+        # Created 0600 from the start, not chmod-ed after bind()
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(str(self.socket_path), _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self):
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _start_flusher():
+    """Start draining the sync journal in the background (see journal.py).
+
+    Starts with $SXIVA_DATA's journal; forwarded commands that journal a
+    file wake the flusher. Returns None when syncing is off (SXIVA_NO_SYNC)
+    or impossible (no requests library).
+    """
+    if os.environ.get('SXIVA_NO_SYNC'):
+        return None
+
+    from .sync import SxivaSyncClient, requests
+    if not requests:
+        return None
+
+    from .journal import start_flusher
+    sxiva_data = os.environ.get('SXIVA_DATA')
+    return start_flusher(SxivaSyncClient(), [Path(sxiva_data).resolve()] if sxiva_data else [])
+
+
+def serve(socket_path: Optional[Path] = None):
+    """Run the daemon until interrupted (Ctrl-C or SIGTERM).
+
+    Args:
+        socket_path: Socket to listen on (default: default_socket_path())
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the socket,
+                      or the socket or its directory belongs to another user
+    """
+    if socket_path is None:
+        socket_path = default_socket_path()
+    socket_path = Path(socket_path)
+
+    # The socket's directory: ours (created private if missing) or root's (e.g. /tmp)
+    try:
+        socket_path.parent.mkdir(mode=0o700)
+    except FileExistsError:
+        pass
+    if os.stat(socket_path.parent).st_uid not in (os.getuid(), 0):
+        raise RuntimeError(f"{socket_path.parent} belongs to another user")
+
+    owned = _owned_by_user(socket_path)
+    if owned is False:
+        raise RuntimeError(f"{socket_path} belongs to another user")
+    if owned:
+        # Remove a stale socket left behind by a daemon that died
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(str(socket_path))
+            except OSError:
+                socket_path.unlink()
+            else:
+                raise RuntimeError(f"sxiva daemon already running on {socket_path}")
+
+    server = SxivaServer(socket_path)
+    flusher = _start_flusher()
+
+    def _terminate(signum, frame):
+        raise KeyboardInterrupt
+
+    # Clean up the socket on `kill` too, not only on Ctrl-C
+    signal.signal(signal.SIGTERM, _terminate)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if flusher is not None:
+            from .journal import stop_flusher
+            stop_flusher()
@@ -0,0 +1,296 @@
+"""Columnar cache of the day payloads extracted from a data directory.
+
+Keeps, per dated .sxiva file, the sync payload SxivaDataExtractor builds
+(date, category minutes and attributes) together with the content hash it was
+extracted from, so sync and `sxiva stats` only parse files that changed.
+
+Each field is one array column (dates as day ordinals, one minutes column per
+category, one column per attribute), written to disk as raw buffers after a
+JSON header line. Missing values are -1 minutes for categories, NaN for float
+attributes and MISSING_INT for int attributes. The cache is dropped when the
+extractor version changes (see manifest.extractor_version()).
+"""
+
+import json
+import math
+import os
+import re
+import sys
+from array import array
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+from .manifest import extractor_version, file_digest
+
+
+DAY_CACHE_FILENAME = '.sxiva-days.bin'
+
+# Bump when the on-disk layout changes
+CACHE_FORMAT = 1
+
+# Attribute columns of a payload and their array typecodes (see parse_attribute_lines)
+ATTRIBUTE_COLUMNS = {
+    'sleep_score': 'q',
+    'sleep_hours': 'd',
+    'dep_min': 'd',
+    'dep_max': 'd',
+    'dep_avg': 'd',
+    'dist': 'd',
+    'soc': 'q',
+    'out': 'q',
+    'exe': 'q',
+    'alc': 'd',
+    'xmx': 'q',
+    'wea': 'd',
+    'meet': 'q',
+    'abi': 'd',
+    'save': 'q',
+}
+
+MISSING_INT = -2 ** 63
+MISSING_MINUTES = -1
+
+_PAYLOAD_KEYS = {'date', 'day_of_week', 'category_minutes', *ATTRIBUTE_COLUMNS}
+_DAY_LETTERS = 'MTWRFSU'  # Monday=0, as in SxivaDataExtractor._get_day_of_week
+
+# YYYYMMDD[day letter].sxiva, as SxivaDataExtractor._extract_date_from_filename reads it
+_DAY_FILE = re.compile(r'\d{8}[UMTWRFS]?\.sxiva$')
+
+
+def day_files(data_dir: Path) -> List[Path]:
+    """The .sxiva files of data_dir named after a date, sorted by name."""
+    return sorted(p for p in Path(data_dir).glob('*.sxiva') if _DAY_FILE.match(p.name))
+
+
+def _missing(typecode: str):
+    return MISSING_INT if typecode == 'q' else math.nan
+
+
+def _fits(value, typecode: str) -> bool:
+    """True if a column of typecode gives value back unchanged."""
+    if value is None:
+        return True
+    if typecode == 'q':
+        return type(value) is int and MISSING_INT < value < 2 ** 63
+    return type(value) is float and not math.isnan(value)
+
+
+class DayCache:
+    """Columnar store of day payloads, one row per dated file."""
+
+    def __init__(self, data_dir: Path):
+        self.path = Path(data_dir) / DAY_CACHE_FILENAME
+        self.names = []  # File name per row
+        self.digests = []  # Content hash per row
+        self.dates = array('i')  # date.toordinal() per row
+        self.attributes = {name: array(typecode) for name, typecode in ATTRIBUTE_COLUMNS.items()}
+        self.categories = {}  # category -> array('i') of minutes per row
+        self._rows = {}  # file name -> row
+        self._dirty = False
+
+    @classmethod
+    def load(cls, data_dir: Path) -> 'DayCache':
+        """Load the cache for data_dir (empty if missing, unreadable or outdated)."""
+        cache = cls(data_dir)
+        try:
+            data = cache.path.read_bytes()
+            header_end = data.index(b'\n')
+            header = json.loads(data[:header_end])
+            cache._read_columns(header, memoryview(data)[header_end + 1:])
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(data_dir)
+        return cache
+
+    def _read_columns(self, header: dict, body: memoryview):
+        if (header['format'] != CACHE_FORMAT or header['byteorder'] != sys.byteorder
+                or header['extractor_version'] != extractor_version()):
+            raise ValueError("outdated day cache")
+
+        names, digests = list(header['names']), list(header['digests'])
+        num_rows = len(names)
+        if len(digests) != num_rows:
+            raise ValueError("corrupt day cache")
+
+        columns = [self.dates, *self.attributes.values()]
+        categories = {category: array('i') for category in header['categories']}
+        columns.extend(categories.values())
+
+        offset = 0
+        for column in columns:
+            size = num_rows * column.itemsize
+            if offset + size > len(body):
+                raise ValueError("truncated day cache")
+            column.frombytes(body[offset:offset + size])
+            offset += size
+
+        self.names, self.digests, self.categories = names, digests, categories
+        self._rows = {name: row for row, name in enumerate(names)}
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def has(self, name: str, digest: Optional[str]) -> bool:
+        """True if file name's payload is cached for content hashing to digest."""
+        row = self._rows.get(name)
+        return row is not None and digest is not None and self.digests[row] == digest
+
+    def get(self, name: str, digest: Optional[str]) -> Optional[dict]:
+        """Payload of file name if it was cached for content hashing to digest."""
+        if not self.has(name, digest):
+            return None
+        return self.payload(self._rows[name])
+
+    def payload(self, row: int) -> dict:
+        """Rebuild the extractor payload of a row."""
+        day = date.fromordinal(self.dates[row])
+        data = {
+            'date': day.isoformat(),
+            'day_of_week': _DAY_LETTERS[day.weekday()],
+            'category_minutes': {
+                category: minutes[row]
+                for category, minutes in self.categories.items()
+                if minutes[row] != MISSING_MINUTES
+            },
+        }
+        for name, column in self.attributes.items():
+            value = column[row]
+            if column.typecode == 'q':
+                data[name] = None if value == MISSING_INT else value
+            else:
+                data[name] = None if math.isnan(value) else value
+        return data
+
+    def put(self, name: str, digest: Optional[str], data: Optional[dict]):
+        """Record the payload extracted from file name's content (hashing to digest).
+
+        Payloads the columns can't hold exactly (unknown fields or value
+        types), and failed extractions (None), are not cached; the file's
+        row is dropped so its previous content's payload isn't served.
+        """
+        if not self._cacheable(digest, data):
+            self.discard(name)
+            return
+        category_minutes = data['category_minutes'] or {}
+
+        row = self._rows.get(name)
+        if row is None:
+            row = self._append_row(name)
+        elif self.digests[row] == digest:
+            return
+
+        self.digests[row] = digest
+        self.dates[row] = date.fromisoformat(data['date']).toordinal()
+        for key, column in self.attributes.items():
+            value = data[key]
+            column[row] = _missing(column.typecode) if value is None else value
+        for category in category_minutes:
+            if category not in self.categories:
+                self.categories[category] = array('i', [MISSING_MINUTES]) * len(self)
+        for category, minutes in self.categories.items():
+            minutes[row] = category_minutes.get(category, MISSING_MINUTES)
+        self._dirty = True
+
+    def _cacheable(self, digest: Optional[str], data: Optional[dict]) -> bool:
+        if digest is None or data is None or set(data) != _PAYLOAD_KEYS:
+            return False
+        category_minutes = data['category_minutes'] or {}
+        if any(type(minutes) is not int or not 0 <= minutes < 2 ** 31 for minutes in category_minutes.values()):
+            return False
+        return all(_fits(data[key], column.typecode) for key, column in self.attributes.items())
+
+    def discard(self, name: str):
+        """Drop file name's row, if any."""
+        if name in self._rows:
+            self._take([row for row, row_name in enumerate(self.names) if row_name != name])
+
+    def _append_row(self, name: str) -> int:
+        row = len(self)
+        self._rows[name] = row
+        self.names.append(name)
+        self.digests.append(None)
+        self.dates.append(0)
+        for column in self.attributes.values():
+            column.append(_missing(column.typecode))
+        for minutes in self.categories.values():
+            minutes.append(MISSING_MINUTES)
+        return row
+
+    def retain(self, names: Iterable[str]):
+        """Drop the rows of files not in names (e.g. deleted files)."""
+        keep = set(names)
+        rows = [row for row, name in enumerate(self.names) if name in keep]
+        if len(rows) != len(self):
+            self._take(rows)
+
+    def _take(self, rows: List[int]):
+        """Keep only the given rows, in the given order."""
+        self.names = [self.names[row] for row in rows]
+        self.digests = [self.digests[row] for row in rows]
+        self._rows = {name: row for row, name in enumerate(self.names)}
+        for column in (self.dates, *self.attributes.values(), *self.categories.values()):
+            column[:] = array(column.typecode, (column[row] for row in rows))
+        self._dirty = True
+
+    def update(self, file_paths: List[Path], jobs: Optional[int] = None) -> int:
+        """Bring the cache up to date with file_paths, extracting only changed files.
+
+        Rows of other files are kept, since sync, `sxiva stats` and the bulk
+        import each cache a different selection; retain() drops deleted files.
+
+        Args:
+            file_paths: Dated .sxiva files
+            jobs: Worker processes for extraction (None or 0 = one per CPU)
+
+        Returns:
+            int: Number of files extracted
+        """
+        from .stats import extract_files
+
+        file_paths = [Path(p) for p in file_paths]
+        digests = {p: file_digest(p) for p in file_paths}
+        changed = [p for p in file_paths if not self.has(p.name, digests[p])]
+        for file_path, data in zip(changed, extract_files(changed, jobs=jobs)):
+            self.put(file_path.name, digests[file_path], data)
+        return len(changed)
+
+    def rows(self, names: Optional[Iterable[str]] = None) -> List[int]:
+        """All rows, or those of the files in names, in date order (then file name)."""
+        rows = range(len(self)) if names is None else [self._rows[name] for name in set(names) if name in self._rows]
+        return sorted(rows, key=lambda row: (self.dates[row], self.names[row]))
+
+    def payloads(self) -> Iterator[dict]:
+        """Payloads of all rows in date order."""
+        for row in self.rows():
+            yield self.payload(row)
+
+    def save(self):
+        """Write the cache, sorted by date, if anything changed (atomically)."""
+        if not self._dirty:
+            return
+
+        order = self.rows()
+        if order != list(range(len(self))):
+            self._take(order)
+
+        header = {
+            'format': CACHE_FORMAT,
+            'byteorder': sys.byteorder,
+            'extractor_version': extractor_version(),
+            'names': self.names,
+            'digests': self.digests,
+            'categories': list(self.categories),
+        }
+
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(json.dumps(header).encode('utf-8') + b'\n')
+                for column in (self.dates, *self.attributes.values(), *self.categories.values()):
+                    column.tofile(f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The cache is only an optimization - never fail the caller
+            return
+
+        self._dirty = False
@@ -0,0 +1,241 @@
+"""Offline-first journal of day payloads waiting to be synced.
+
+Commands that rewrite a dated file in $SXIVA_DATA (`calculate --fix`,
+`log-now`) append the file's sync payload to a SQLite journal in the data
+directory, whether or not the dashboard is reachable. The journal is drained
+by flush(): when `sxiva` syncs (sync_now), and continuously while `sxiva
+serve` runs, by its background Flusher.
+
+Several edits of one date are coalesced: only the latest payload of each
+date is uploaded, and every entry of the date up to it is then dropped.
+Flushed files are marked synced in the manifest, so sync_all doesn't upload
+them again; syncing costs one upload per changed day, however long the
+machine was offline.
+"""
+
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List, NamedTuple, Optional
+
+from .manifest import Manifest, extractor_version, file_digest
+
+
+JOURNAL_FILENAME = '.sxiva-journal.db'
+
+# Seconds between background flushes (a journaled edit flushes right away)
+FLUSH_INTERVAL = float(os.getenv('SXIVA_FLUSH_INTERVAL', '60'))
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pending (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    file_name TEXT NOT NULL,
+    digest TEXT,
+    extractor_version TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS pending_date ON pending (date, seq);
+"""
+
+# Flusher running in this process, if any (see start_flusher)
+_flusher = None
+
+
+class JournalEntry(NamedTuple):
+    """Latest journaled payload of one date."""
+    seq: int
+    date: str
+    file_name: str
+    digest: Optional[str]
+    data: dict
+
+
+class SyncJournal:
+    """Append-only SQLite journal of pending day payloads in a data directory."""
+
+    def __init__(self, data_dir: Path):
+        self.data_dir = Path(data_dir)
+        self.path = self.data_dir / JOURNAL_FILENAME
+        # Autocommit: each statement is its own transaction
+        self._conn = sqlite3.connect(str(self.path), timeout=10, isolation_level=None)
+        # Writers (CLI commands) and the flusher don't block each other's reads
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        self._conn.close()
+
+    def __enter__(self) -> 'SyncJournal':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of dates with pending payloads."""
+        return self._conn.execute("SELECT COUNT(DISTINCT date) FROM pending").fetchone()[0]
+
+    def append(self, file_name: str, digest: Optional[str], data: dict):
+        """Journal the payload extracted from file_name's content (hashing to digest)."""
+        self._conn.execute(
+            """
+            INSERT INTO pending (date, file_name, digest, extractor_version, payload, recorded_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (data['date'], file_name, digest, extractor_version(), json.dumps(data), time.time())
+        )
+
+    def pending(self, limit: Optional[int] = None) -> List[JournalEntry]:
+        """The latest entry of each date, oldest date first.
+
+        Entries written by another extractor version are dropped: sync_all
+        resyncs every file after an extractor change anyway.
+        """
+        self._conn.execute("DELETE FROM pending WHERE extractor_version != ?", (extractor_version(),))
+        rows = self._conn.execute(
+            """
+            SELECT seq, date, file_name, digest, payload
+            FROM pending
+            WHERE seq IN (SELECT MAX(seq) FROM pending GROUP BY date)
+            ORDER BY date
+            LIMIT ?
+            """,
+            (-1 if limit is None else limit,)
+        ).fetchall()
+        return [JournalEntry(seq, date, name, digest, json.loads(payload))
+                for seq, date, name, digest, payload in rows]
+
+    def discard(self, entries: List[JournalEntry]):
+        """Drop flushed entries and the older entries of their dates.
+
+        Entries journaled after them (a newer edit) are kept.
+        """
+        self._conn.executemany(
+            "DELETE FROM pending WHERE date = ? AND seq <= ?",
+            [(entry.date, entry.seq) for entry in entries]
+        )
+
+
+def record(file_path: Path, data: Optional[dict]):
+    """Journal the sync payload of a file that was just written.
+
+    Does nothing for files without a payload (e.g. not named YYYYMMDD).
+    Never fails the caller: the journal is only a shortcut for sync_all.
+    """
+    if data is None:
+        return
+
+    file_path = Path(file_path)
+    try:
+        with SyncJournal(file_path.parent) as journal:
+            journal.append(file_path.name, file_digest(file_path), data)
+    except sqlite3.Error:
+        return
+
+    if _flusher is not None:
+        _flusher.wake(file_path.parent)
+
+
+def flush(data_dir: Path, client, verbose: bool = False) -> int:
+    """Upload the journal's pending days in batches and drop them.
+
+    Stops at the first batch that doesn't fully sync (e.g. offline); its
+    days stay journaled for the next flush.
+
+    Args:
+        data_dir: Data directory holding the journal
+        client: SxivaSyncClient to upload with
+        verbose: If True, print progress messages
+
+    Returns:
+        int: Number of days flushed
+    """
+    journal_path = Path(data_dir) / JOURNAL_FILENAME
+    if not journal_path.exists():
+        return 0
+
+    with SyncJournal(data_dir) as journal:
+        if not len(journal):
+            return 0
+
+        manifest = Manifest.load(data_dir)
+        flushed = 0
+        while True:
+            entries = journal.pending(limit=client.batch_size)
+            if not entries:
+                break
+
+            synced = [entries[i] for i in client.upload([entry.data for entry in entries], verbose=verbose)]
+            journal.discard(synced)
+            for entry in synced:
+                manifest.mark_synced(client.api_url, entry.file_name, entry.digest)
+            flushed += len(synced)
+            if len(synced) < len(entries):
+                break
+
+        manifest.save()
+        return flushed
+
+
+class Flusher(threading.Thread):
+    """Background thread that flushes journals as edits come in and every FLUSH_INTERVAL seconds."""
+
+    def __init__(self, client, data_dirs=(), interval: float = FLUSH_INTERVAL):
+        super().__init__(name='sxiva-journal-flusher', daemon=True)
+        self.client = client
+        self.interval = interval
+        self.data_dirs = {Path(d) for d in data_dirs}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopping = threading.Event()
+
+    def wake(self, data_dir: Path):
+        """Flush data_dir's journal now (and from now on)."""
+        with self._lock:
+            self.data_dirs.add(Path(data_dir))
+        self._wake.set()
+
+    def stop(self):
+        self._stopping.set()
+        self._wake.set()
+        self.join()
+
+    def run(self):
+        while not self._stopping.is_set():
+            with self._lock:
+                data_dirs = list(self.data_dirs)
+            for data_dir in data_dirs:
+                try:
+                    flush(data_dir, self.client)
+                except (OSError, sqlite3.Error):
+                    # Unreadable journal or data directory gone; try again next time
+                    pass
+                except Exception as e:
+                    # Anything else (e.g. an unexpected response) must not end
+                    # the thread; the daemon's own stderr, not a request's
+                    print(f"sxiva: flushing the sync journal in {data_dir} failed: {type(e).__name__}: {e}",
+                          file=sys.__stderr__)
+            self._wake.wait(self.interval)
+            self._wake.clear()
+
+
+def start_flusher(client, data_dirs=(), interval: float = FLUSH_INTERVAL) -> Flusher:
+    """Start the background flusher for this process; record() wakes it."""
+    global _flusher
+    _flusher = Flusher(client, data_dirs, interval)
+    _flusher.start()
+    return _flusher
+
+
+def stop_flusher():
+    """Stop the background flusher, if one is running."""
+    global _flusher
+    if _flusher is not None:
+        _flusher.stop()
+        _flusher = None
@@ -0,0 +1,201 @@
+"""Content-hash manifest of processed .sxiva files in a data directory.
+
+Records, per file name, the hash of the content last recalculated and last
+synced (per API URL), so bulk recalculation and sync can skip files whose
+bytes haven't changed regardless of their mtime. Each section is tagged with
+the calculator/extractor version it was produced by and is dropped when that
+version changes.
+"""
+
+import hashlib
+import json
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+
+MANIFEST_FILENAME = '.sxiva-manifest.json'
+
+
+def content_digest(data: bytes) -> str:
+    """Hash file content for the manifest."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def file_digest(file_path: Path) -> Optional[str]:
+    """Hash a file's content, or None if it can't be read."""
+    try:
+        return content_digest(Path(file_path).read_bytes())
+    except OSError:
+        return None
+
+
+def _canonical(value):
+    """value with integral floats as ints and None-valued keys dropped."""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, dict):
+        return {key: _canonical(item) for key, item in value.items() if item is not None}
+    return value
+
+
+def payload_digest(data: dict) -> str:
+    """Hash a day's sync payload.
+
+    The dashboard stores this hash with each day it receives, so the client
+    can tell which days changed without uploading them. Payloads that the
+    dashboard would store identically (7 vs 7.0, a missing key vs None) hash
+    the same.
+    """
+    canonical = json.dumps(_canonical(data), sort_keys=True, separators=(',', ':'))
+    return content_digest(canonical.encode('utf-8'))
+
+
+def _fingerprint(*paths: Path) -> str:
+    """Hash the given source files (missing files hash as empty)."""
+    h = hashlib.blake2b(digest_size=8)
+    for path in paths:
+        try:
+            h.update(path.read_bytes())
+        except OSError:
+            pass
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def calculator_version() -> str:
+    """Version key for recalculated content.
+
+    Combines CALCULATOR_VERSION with a fingerprint of the calculator source and
+    compiled grammar, so editing the rules invalidates the manifest even if
+    the constant isn't bumped.
+    """
+    from .calculator import CALCULATOR_VERSION
+
+    package_dir = Path(__file__).parent
+    return f"{CALCULATOR_VERSION}:" + _fingerprint(
+        package_dir / 'calculator.py',
+        package_dir / 'block_index.py',
+        package_dir / 'time_parser.py',
+        package_dir.parent.parent / 'parser.so',
+        package_dir.parent.parent / 'queries' / 'layout.scm',
+    )
+
+
+@lru_cache(maxsize=None)
+def extractor_version() -> str:
+    """Version key for synced content (see calculator_version())."""
+    from .parser_extractor import EXTRACTOR_VERSION
+
+    package_dir = Path(__file__).parent
+    return f"{EXTRACTOR_VERSION}:" + _fingerprint(
+        package_dir / 'parser_extractor.py',
+        package_dir / 'time_parser.py',
+        package_dir.parent.parent / 'parser.so',
+        package_dir.parent.parent / 'queries' / 'extract.scm',
+    )
+
+
+class Manifest:
+    """On-disk record of file content hashes in a data directory."""
+
+    def __init__(self, data_dir: Path):
+        self.path = Path(data_dir) / MANIFEST_FILENAME
+        self.recalculated = {}  # file name -> content hash after recalculation
+        self.synced = {}  # API URL -> {file name -> content hash}
+        self._calculator_version = None
+        self._extractor_version = None
+        self._dirty = False
+
+    @classmethod
+    def load(cls, data_dir: Path) -> 'Manifest':
+        """Load the manifest for data_dir (empty if missing or unreadable)."""
+        manifest = cls(data_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+
+        if not isinstance(data, dict):
+            return manifest
+
+        manifest._calculator_version = data.get('calculator_version')
+        manifest._extractor_version = data.get('extractor_version')
+        manifest.recalculated = dict(data.get('recalculated') or {})
+        manifest.synced = {url: dict(files) for url, files in (data.get('synced') or {}).items()}
+        return manifest
+
+    def _check_calculator_version(self):
+        if self._calculator_version != calculator_version():
+            self.recalculated = {}
+            self._calculator_version = calculator_version()
+            self._dirty = True
+
+    def _check_extractor_version(self):
+        if self._extractor_version != extractor_version():
+            # Keep the URLs: they were synced before, just not with this extractor
+            self.synced = {url: {} for url in self.synced}
+            self._extractor_version = extractor_version()
+            self._dirty = True
+
+    def is_recalculated(self, name: str, digest: Optional[str]) -> bool:
+        """True if name was last recalculated (by this calculator) with this content."""
+        self._check_calculator_version()
+        return digest is not None and self.recalculated.get(name) == digest
+
+    def mark_recalculated(self, name: str, digest: Optional[str]):
+        """Record that name's content after recalculation hashes to digest."""
+        self._check_calculator_version()
+        if digest is not None and self.recalculated.get(name) != digest:
+            self.recalculated[name] = digest
+            self._dirty = True
+
+    def knows_api_url(self, api_url: str) -> bool:
+        """True if files were ever recorded as synced to api_url."""
+        self._check_extractor_version()
+        return api_url in self.synced
+
+    def is_synced(self, api_url: str, name: str, digest: Optional[str]) -> bool:
+        """True if name was last synced to api_url (by this extractor) with this content."""
+        self._check_extractor_version()
+        return digest is not None and self.synced.get(api_url, {}).get(name) == digest
+
+    def mark_synced(self, api_url: str, name: str, digest: Optional[str]):
+        """Record that name was synced to api_url with content hashing to digest."""
+        self._check_extractor_version()
+        files = self.synced.setdefault(api_url, {})
+        if digest is not None and files.get(name) != digest:
+            files[name] = digest
+            self._dirty = True
+
+    def forget_synced(self, api_url: str):
+        """Drop sync records for api_url (e.g. the server lost its data)."""
+        if self.synced.pop(api_url, None):
+            self._dirty = True
+
+    def save(self):
+        """Write the manifest if anything changed (atomically)."""
+        if not self._dirty:
+            return
+
+        self._check_calculator_version()
+        self._check_extractor_version()
+        data = {
+            'calculator_version': self._calculator_version,
+            'extractor_version': self._extractor_version,
+            'recalculated': self.recalculated,
+            'synced': self.synced,
+        }
+
+        tmp_path = self.path.with_name(self.path.name + '.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=1, sort_keys=True)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            # The manifest is only an optimization - never fail the caller
+            return
+
+        self._dirty = False
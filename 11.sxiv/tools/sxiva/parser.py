@@ -1,41 +1,104 @@
 """Tree-sitter parser for SXIVA files."""
 
 import ctypes
+import threading
 from pathlib import Path
-from tree_sitter import Language, Parser
+from tree_sitter import Language, Parser, Query
 
+try:
+    from tree_sitter import QueryCursor
+except ImportError:  # py-tree-sitter < 0.25 runs queries with Query.captures
+    QueryCursor = None
 
-class SxivaParser:
-    """Wrapper for Tree-sitter SXIVA parser."""
+# Compiled grammar, built by compile_parser.sh
+PARSER_PATH = Path(__file__).parent.parent.parent / "parser.so"
+
+# Tree-sitter queries shipped with the grammar (queries/<name>.scm)
+QUERIES_DIR = Path(__file__).parent.parent.parent / "queries"
+
+# Loaded once per process and shared by every SxivaParser; Language and Query
+# objects are immutable, but a tree-sitter Parser must not be used by two
+# threads at once, so each thread gets its own.
+_language = None
+_queries = {}
+_load_lock = threading.Lock()
+_thread_local = threading.local()
+
+
+def get_language() -> Language:
+    """Get the SXIVA Language, loading parser.so on first use."""
+    global _language
+    if _language is None:
+        with _load_lock:
+            if _language is None:
+                _language = _load_language()
+    return _language
+
+
+def _load_language() -> Language:
+    if not PARSER_PATH.exists():
+        raise FileNotFoundError(
+            f"SXIVA parser not found at {PARSER_PATH}. "
+            "Please compile it with: gcc -o parser.so -shared src/parser.c -I./src -fPIC -O2"
+        )
+
+    # Load the language using ctypes (new tree-sitter API)
+    lib = ctypes.CDLL(str(PARSER_PATH))
+    lang_func = lib.tree_sitter_sxiva
+    lang_func.restype = ctypes.c_void_p
+    return Language(lang_func())
 
-    def __init__(self):
-        """Initialize the parser with the SXIVA grammar."""
-        # Find the parser.so relative to this file
-        # sxiva-tools/sxiva/parser.py -> ../../parser.so
-        parser_path = Path(__file__).parent.parent.parent / "parser.so"
 
-        if not parser_path.exists():
-            raise FileNotFoundError(
-                f"SXIVA parser not found at {parser_path}. "
-                "Please compile it with: gcc -o parser.so -shared src/parser.c -I./src -fPIC -O2"
-            )
+def get_parser() -> Parser:
+    """Get the calling thread's tree-sitter Parser for the SXIVA language."""
+    parser = getattr(_thread_local, 'parser', None)
+    if parser is None:
+        parser = _thread_local.parser = Parser(get_language())
+    return parser
+
+
+def get_query(name: str) -> Query:
+    """Get the query in queries/<name>.scm, compiled on first use.
+
+    Args:
+        name: Query file name without .scm (e.g. 'extract')
+
+    Returns:
+        Query: The compiled query
+    """
+    query = _queries.get(name)
+    if query is None:
+        with _load_lock:
+            query = _queries.get(name)
+            if query is None:
+                source = (QUERIES_DIR / f"{name}.scm").read_text(encoding='utf-8')
+                query = _queries[name] = Query(get_language(), source)
+    return query
+
+
+class SxivaParser:
+    """Wrapper for Tree-sitter SXIVA parser.
 
-        # Load the language using ctypes (new tree-sitter API)
-        lib = ctypes.CDLL(str(parser_path))
-        lang_func = lib.tree_sitter_sxiva
-        lang_func.restype = ctypes.c_void_p
-        lang_ptr = lang_func()
+    Instances are cheap: the grammar and queries are loaded once per process
+    and parsing uses the calling thread's Parser.
+    """
 
-        self.language = Language(lang_ptr)
+    def __init__(self):
+        """Initialize the parser with the SXIVA grammar."""
+        self.language = get_language()
 
-        # Create parser with language (new API)
-        self.parser = Parser(self.language)
+    @property
+    def parser(self) -> Parser:
+        """The calling thread's tree-sitter Parser."""
+        return get_parser()
 
-    def parse(self, source_code: str):
+    def parse(self, source_code: str, old_tree=None):
         """Parse SXIVA source code and return the syntax tree.
 
         Args:
             source_code: The .sxiva file contents as a string
+            old_tree: Optional previous tree, already adjusted with Tree.edit(),
+                      whose unchanged subtrees tree-sitter can reuse
 
         Returns:
             Tree: The parsed syntax tree
@@ -43,9 +106,41 @@ class SxivaParser:
         if isinstance(source_code, str):
             source_code = source_code.encode('utf-8')
 
+        if old_tree is not None:
+            return self.parser.parse(source_code, old_tree=old_tree)
+
         tree = self.parser.parse(source_code)
         return tree
 
+    def query(self, name: str) -> Query:
+        """Get the compiled query in queries/<name>.scm (see get_query())."""
+        return get_query(name)
+
+    def captures(self, name: str, node) -> dict:
+        """Run the query in queries/<name>.scm over a node's subtree.
+
+        Matching happens in tree-sitter; only the captured nodes come back.
+
+        Args:
+            name: Query file name without .scm
+            node: Tree-sitter node to search (e.g. tree.root_node)
+
+        Returns:
+            dict: Capture name -> list of captured nodes
+        """
+        query = self.query(name)
+        if QueryCursor is not None:
+            return QueryCursor(query).captures(node)
+
+        captures = query.captures(node)
+        if isinstance(captures, dict):
+            return captures
+        # py-tree-sitter < 0.23: a list of (node, capture name)
+        grouped = {}
+        for captured, capture_name in captures:
+            grouped.setdefault(capture_name, []).append(captured)
+        return grouped
+
     def parse_file(self, file_path: str):
         """Parse a .sxiva file and return the syntax tree.
 
@@ -75,6 +170,29 @@ def node_text(node, source_bytes):
     return source_bytes[node.start_byte:node.end_byte].decode('utf-8')
 
 
+def in_tree_order(nodes):
+    """Sort nodes into the order a depth-first walk of the tree visits them.
+
+    Query captures come back by start position, but of nested nodes starting at
+    the same byte the parent doesn't reliably come first.
+
+    Args:
+        nodes: List of tree-sitter nodes (sorted in place)
+
+    Returns:
+        list: The same list, sorted
+    """
+    def depth(node):
+        d = 0
+        while node.parent is not None:
+            node = node.parent
+            d += 1
+        return d
+
+    nodes.sort(key=lambda n: (n.start_byte, -n.end_byte, depth(n)))
+    return nodes
+
+
 def walk_tree(node, visit_fn, source_bytes, depth=0):
     """Walk the syntax tree and call visit_fn for each node.
 
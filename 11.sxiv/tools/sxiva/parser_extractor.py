@@ -14,16 +14,116 @@ from tree_sitter import Language, Parser
 # Import the parser module
 import sys
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
-from tools.sxiva.parser import SxivaParser
+from tools.sxiva.parser import SxivaParser, node_text
 from tools.sxiva.time_parser import parse_duration
 
+# Version of the extracted data format. Files recorded in the data directory
+# manifest (manifest.py) under another version are synced again.
+EXTRACTOR_VERSION = 2
+
+
+def parse_attribute_lines(lines) -> Dict[str, Any]:
+    """
+    Parse the lines of an {attributes} section into attribute values.
+
+    Each line is parsed on its own (e.g. "[dep] -1 0.5 = -0.3 ✓") so values can
+    never bleed across lines; lines that aren't "[name] ..." are ignored.
+
+    Numeric attribute values must contain at least one digit; a lone "-"
+    placeholder for an uncalculated attribute is treated as absent.
+    """
+    attributes = {
+        'sleep_score': None,
+        'sleep_hours': None,
+        'dep_min': None,
+        'dep_max': None,
+        'dep_avg': None,
+        'dist': None,
+        'soc': None,
+        'out': None,
+        'exe': None,
+        'alc': None,
+        'xmx': None,
+        'wea': None,
+        'meet': None,
+        'abi': None,
+        'save': None
+    }
+
+    NUM = r'-?\d[\d.]*'  # signed number with at least one digit
+    int_attrs = {'soc', 'out', 'exe', 'xmx'}
+    float_attrs = {'dist', 'alc', 'wea'}
+
+    for line in lines:
+        cat_match = re.match(r'\[([^\]]+)\]\s*(.*)', line)
+        if not cat_match:
+            continue
+
+        name, rest = cat_match.group(1), cat_match.group(2)
+
+        if name == 'sleep':
+            m = re.match(rf'({NUM})\s+({NUM})', rest)
+            if m:
+                attributes['sleep_score'] = int(m.group(1))
+                attributes['sleep_hours'] = float(m.group(2))
+
+        elif name == 'dep':
+            # [dep] v1 v2 ... = avg ✓
+            eq_split = rest.split('=', 1)[0]
+            dep_values = [float(x) for x in re.findall(NUM, eq_split)]
+            if dep_values:
+                attributes['dep_min'] = min(dep_values)
+                attributes['dep_max'] = max(dep_values)
+                attributes['dep_avg'] = sum(dep_values) / len(dep_values)
+
+        elif name in int_attrs:
+            m = re.match(rf'({NUM})', rest)
+            if m:
+                attributes[name] = int(float(m.group(1)))
+
+        elif name in float_attrs:
+            m = re.match(rf'({NUM})', rest)
+            if m:
+                attributes[name] = float(m.group(1))
+
+        elif name == 'meet':
+            # 5m, 1h34m, 1:34, 1.75h, ... (see time_parser.parse_duration)
+            m = re.match(r'([^\s✓]+)', rest)
+            if m:
+                minutes = parse_duration(m.group(1))
+                if minutes is not None:
+                    attributes['meet'] = minutes
+
+        elif name == 'abi':
+            m = re.match(rf'({NUM})', rest)
+            if m:
+                attributes['abi'] = float(m.group(1))
+
+        elif name == 'save':
+            m = re.match(r'(-?\$\d+)', rest)
+            if m:
+                value_str = m.group(1)
+                is_negative = value_str.startswith('-')
+                amount_str = value_str[2:] if is_negative else value_str[1:]
+                amount = int(amount_str)
+                attributes['save'] = -amount if is_negative else amount
+
+    return attributes
+
 
 class SxivaDataExtractor:
     """Extract structured data from .sxiva files"""
 
     def __init__(self):
-        """Initialize with tree-sitter parser"""
-        self.parser = SxivaParser()
+        """Initialize (the tree-sitter parser is loaded on first use)"""
+        self._parser = None
+
+    @property
+    def parser(self):
+        """Lazy-load the parser only when a file has to be parsed."""
+        if self._parser is None:
+            self._parser = SxivaParser()
+        return self._parser
 
     def extract_from_file(self, file_path: Path) -> Optional[Dict[str, Any]]:
         """
@@ -52,33 +152,68 @@ class SxivaDataExtractor:
         try:
             with open(file_path, 'r') as f:
                 content = f.read()
+            return self.extract_from_content(content, file_path.name)
 
-            # Extract date from filename (e.g., 20250117.sxiva)
-            date_str = self._extract_date_from_filename(file_path.name)
-            if not date_str:
-                return None
+        except Exception as e:
+            print(f"Error extracting from {file_path}: {e}", file=sys.stderr)
+            return None
 
-            # Parse day of week
-            day_of_week = self._get_day_of_week(date_str)
+    def extract_from_content(self, content: str, filename: str) -> Optional[Dict[str, Any]]:
+        """
+        Extract the data of extract_from_file from a file's content, given
+        its file name (for the date).
+        """
+        # Extract date from filename (e.g., 20250117.sxiva)
+        date_str = self._extract_date_from_filename(filename)
+        if not date_str:
+            return None
 
-            # Parse tree
-            tree = self.parser.parse(content)
+        # Parse day of week
+        day_of_week = self._get_day_of_week(date_str)
 
-            # Extract data
-            category_minutes = self._extract_summary(tree, content)
-            attributes = self._extract_attributes(tree, content)
+        # Parse tree
+        tree = self.parser.parse(content)
 
-            return {
-                'date': date_str,
-                'day_of_week': day_of_week,
-                'category_minutes': category_minutes,
-                **attributes
-            }
+        # Extract data
+        sections = self.parser.captures('extract', tree.root_node)
+        category_minutes = self._extract_summary(sections, content)
+        attributes = self._extract_attributes(sections, content)
 
-        except Exception as e:
-            print(f"Error extracting from {file_path}: {e}", file=sys.stderr)
+        return {
+            'date': date_str,
+            'day_of_week': day_of_week,
+            'category_minutes': category_minutes,
+            **attributes
+        }
+
+    def extract_from_analysis(self, analysis) -> Optional[Dict[str, Any]]:
+        """
+        Build the same data as extract_from_file from a FileAnalysis, without
+        parsing the file again.
+
+        The analysis (PointCalculator.analyze_file) already holds the category
+        minutes and attributes it wrote into the file. Content with [ERROR]
+        markers doesn't re-parse the way it was calculated, so it is parsed
+        again here: the payload must not depend on which path built it.
+        """
+        date_str = self._extract_date_from_filename(Path(analysis.path).name)
+        if not date_str:
             return None
 
+        if '[ERROR]' in analysis.content:
+            try:
+                return self.extract_from_content(analysis.content, Path(analysis.path).name)
+            except Exception as e:
+                print(f"Error extracting from {analysis.path}: {e}", file=sys.stderr)
+                return None
+
+        return {
+            'date': date_str,
+            'day_of_week': self._get_day_of_week(date_str),
+            'category_minutes': dict(analysis.category_minutes),
+            **analysis.attributes
+        }
+
     def _extract_date_from_filename(self, filename: str) -> Optional[str]:
         """
         Extract date from filename.
@@ -104,166 +239,60 @@ class SxivaDataExtractor:
         days = ['M', 'T', 'W', 'R', 'F', 'S', 'U']  # Monday=0, Sunday=6
         return days[date.weekday()]
 
-    def _extract_summary(self, tree, content: str) -> Dict[str, int]:
+    def _extract_summary(self, sections: Dict[str, list], content: str) -> Dict[str, int]:
         """
         Extract {summary} section.
 
+        Takes the captures of queries/extract.scm.
+
         Returns: {"bkc": 40, "jnl": 32, ...}
         """
         category_minutes = {}
-
-        # Find summary section
-        summary_node = self._find_node_by_type(tree.root_node, 'summary_section')
-        if not summary_node:
-            return category_minutes
+        source_bytes = content.encode('utf-8')  # Node offsets are in bytes
 
         # Extract category lines
-        for child in summary_node.children:
-            if child.type == 'summary_line':
-                text = content[child.start_byte:child.end_byte].strip()
-                # Parse line like: [bkc] - 00:40
-                match = re.match(r'\[([^\]]+)\]\s*-\s*(\d{2}):(\d{2})', text)
-                if match:
-                    category = match.group(1)
-                    hours = int(match.group(2))
-                    minutes = int(match.group(3))
-                    total_minutes = hours * 60 + minutes
-
-                    # Only include non-zero categories
-                    if total_minutes > 0:
-                        category_minutes[category] = total_minutes
+        for line_node in self._first_section_lines(sections, 'summary'):
+            text = node_text(line_node, source_bytes).strip()
+            # Parse line like: [bkc] - 00:40
+            match = re.match(r'\[([^\]]+)\]\s*-\s*(\d{2}):(\d{2})', text)
+            if match:
+                category = match.group(1)
+                hours = int(match.group(2))
+                minutes = int(match.group(3))
+                total_minutes = hours * 60 + minutes
+
+                # Only include non-zero categories
+                if total_minutes > 0:
+                    category_minutes[category] = total_minutes
 
         return category_minutes
 
-    def _extract_attributes(self, tree, content: str) -> Dict[str, Any]:
+    def _extract_attributes(self, sections: Dict[str, list], content: str) -> Dict[str, Any]:
         """
         Extract {attributes} section.
 
-        Walks the tree-sitter `attributes_section` node and parses each
+        Takes the captures of queries/extract.scm and parses each
         `attributes_line` individually so values can never bleed across lines
         or into following sections (preserved notes, freeform, ===).
-
-        Numeric attribute values must contain at least one digit; a lone "-"
-        placeholder for an uncalculated attribute is treated as absent.
         """
-        attributes = {
-            'sleep_score': None,
-            'sleep_hours': None,
-            'dep_min': None,
-            'dep_max': None,
-            'dep_avg': None,
-            'dist': None,
-            'soc': None,
-            'out': None,
-            'exe': None,
-            'alc': None,
-            'xmx': None,
-            'wea': None,
-            'meet': None,
-            'abi': None,
-            'save': None
-        }
-
-        attr_node = self._find_node_by_type(tree.root_node, 'attributes_section')
-        if not attr_node:
-            return attributes
-
-        NUM = r'-?\d[\d.]*'  # signed number with at least one digit
-        int_attrs = {'soc', 'out', 'exe', 'xmx'}
-        float_attrs = {'dist', 'alc', 'wea'}
-
-        for line_node in attr_node.children:
-            if line_node.type != 'attributes_line':
-                continue
-
-            line = content[line_node.start_byte:line_node.end_byte].strip()
-            cat_match = re.match(r'\[([^\]]+)\]\s*(.*)', line)
-            if not cat_match:
-                continue
-
-            name, rest = cat_match.group(1), cat_match.group(2)
-
-            if name == 'sleep':
-                m = re.match(rf'({NUM})\s+({NUM})', rest)
-                if m:
-                    attributes['sleep_score'] = int(m.group(1))
-                    attributes['sleep_hours'] = float(m.group(2))
-
-            elif name == 'dep':
-                # [dep] v1 v2 ... = avg ✓
-                eq_split = rest.split('=', 1)[0]
-                dep_values = [float(x) for x in re.findall(NUM, eq_split)]
-                if dep_values:
-                    attributes['dep_min'] = min(dep_values)
-                    attributes['dep_max'] = max(dep_values)
-                    attributes['dep_avg'] = sum(dep_values) / len(dep_values)
-
-            elif name in int_attrs:
-                m = re.match(rf'({NUM})', rest)
-                if m:
-                    attributes[name] = int(float(m.group(1)))
-
-            elif name in float_attrs:
-                m = re.match(rf'({NUM})', rest)
-                if m:
-                    attributes[name] = float(m.group(1))
-
-            elif name == 'meet':
-                m = re.match(r'([^\s✓]+)', rest)
-                if m:
-                    minutes = self._parse_meeting_time(m.group(1))
-                    if minutes is not None:
-                        attributes['meet'] = minutes
-
-            elif name == 'abi':
-                m = re.match(rf'({NUM})', rest)
-                if m:
-                    attributes['abi'] = float(m.group(1))
-
-            elif name == 'save':
-                m = re.match(r'(-?\$\d+)', rest)
-                if m:
-                    value_str = m.group(1)
-                    is_negative = value_str.startswith('-')
-                    amount_str = value_str[2:] if is_negative else value_str[1:]
-                    amount = int(amount_str)
-                    attributes['save'] = -amount if is_negative else amount
-
-        return attributes
-
-    def _parse_meeting_time(self, time_str: str) -> Optional[int]:
-        """Parse meeting time format into minutes.
-
-        Supported formats:
-        - 5m (minutes only)
-        - 1h (hours only)
-        - 1h34m (hours and minutes)
-        - 1:34 (H:MM format)
-        - 01:34 (HH:MM format)
-        - 75m (minutes)
-        - 1.75h (decimal hours, rounded to nearest minute)
-        - 0.5h (decimal hours)
-        - 0.25h (decimal hours)
-
-        Args:
-            time_str: Time string to parse
-
-        Returns:
-            int: Total minutes, or None if invalid format
-        """
-        return parse_duration(time_str)
-
-    def _find_node_by_type(self, node, node_type: str):
-        """Recursively find first node of given type"""
-        if node.type == node_type:
-            return node
-
-        for child in node.children:
-            result = self._find_node_by_type(child, node_type)
-            if result:
-                return result
-
-        return None
+        source_bytes = content.encode('utf-8')  # Node offsets are in bytes
+        return parse_attribute_lines(
+            node_text(line_node, source_bytes).strip()
+            for line_node in self._first_section_lines(sections, 'attributes')
+        )
+
+    def _first_section_lines(self, sections: Dict[str, list], name: str) -> list:
+        """Captured line nodes of the first section captured as `name`"""
+        section_nodes = sections.get(name)
+        if not section_nodes:
+            return []
+
+        first = min(section_nodes, key=lambda n: n.start_byte)
+        return sorted(
+            (n for n in sections.get(f'{name}.line', [])
+             if first.start_byte <= n.start_byte < first.end_byte),
+            key=lambda n: n.start_byte
+        )
 
 
 if __name__ == '__main__':
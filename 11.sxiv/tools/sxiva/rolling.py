@@ -0,0 +1,171 @@
+"""Category rolling sums: the series behind the dashboard's activity chart.
+
+Shared by the dashboard API (/api/category-rolling-sum) and `sxiva stats`, so
+both compute exactly the same numbers. Each day's category minutes are split
+into hobby, work (plus the [meet] attribute), other and total; then, per day:
+
+- hobby_raw, other_raw, total_raw: sums over the last window_days days present
+- hobby_weighted: exponentially decayed hobby minutes over the last
+  window_days calendar days, normalized to window_days
+- work_raw, work_weighted: the same over the last 5 weekdays (Monday to
+  Friday), normalized to 5; weekend days carry the preceding weekday's values
+
+Weighted sums are rounded like PostgreSQL's ROUND(value::numeric, 1), as the
+dashboard's SQL did. Only NumPy is needed, so the dashboard server can use
+this module without the rest of the package.
+"""
+
+import math
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Dict, Iterable, Mapping, Optional
+
+import numpy as np
+
+
+DEFAULT_WINDOW_DAYS = 7
+DEFAULT_DECAY_LAMBDA = 0.2
+WORK_WINDOW = 5  # Work is summed over the last 5 weekdays
+
+# Daily totals and rolling series returned by category_rolling_sums
+DAILY = ('hobby', 'work', 'other', 'total')
+SERIES = ('hobby_raw', 'hobby_weighted', 'work_raw', 'work_weighted', 'other_raw', 'total_raw')
+
+
+def round_numeric(value: float, places: int = 1) -> float:
+    """Round like PostgreSQL's ROUND(value::numeric, places).
+
+    float8 -> numeric keeps 15 significant digits, and numeric rounds
+    halves away from zero.
+    """
+    quantum = Decimal(1).scaleb(-places)
+    return float(Decimal(f"{value:.15g}").quantize(quantum, rounding=ROUND_HALF_UP))
+
+
+def split_categories(minutes: Mapping[str, np.ndarray], meet: Optional[np.ndarray],
+                     hobby: Iterable[str], work: Iterable[str], num_days: int) -> Dict[str, np.ndarray]:
+    """Split per-category minute columns into hobby, work, other and total.
+
+    Args:
+        minutes: Category -> minutes per day (0 where the category is absent)
+        meet: Meeting minutes per day (0 where absent), or None; counted
+            toward work and the total
+        hobby: Hobby categories
+        work: Work categories (a category may be both hobby and work)
+        num_days: Number of days (length of every column)
+
+    Returns:
+        dict: 'hobby', 'work', 'other' and 'total' int64 arrays
+    """
+    hobby, work = set(hobby), set(work)
+    split = {name: np.zeros(num_days, dtype=np.int64) for name in DAILY}
+    for category, column in minutes.items():
+        split['total'] += column
+        if category in hobby:
+            split['hobby'] += column
+        if category in work:
+            split['work'] += column
+        if category not in hobby and category not in work:
+            split['other'] += column
+    if meet is not None:
+        split['work'] += meet
+        split['total'] += meet
+    return split
+
+
+def _rows_sum(values: np.ndarray, window: int) -> np.ndarray:
+    """Sum of each value and the window - 1 values before it."""
+    sums = np.cumsum(values)
+    out = sums.copy()
+    out[window:] -= sums[:-window]
+    return out
+
+
+def _calendar_weighted(days: np.ndarray, values: np.ndarray, window_days: int,
+                       decay_lambda: float) -> np.ndarray:
+    """Decayed sum over the last window_days calendar days, normalized to window_days."""
+    offsets = days - days[0]
+    span = int(offsets[-1]) + 1
+
+    # One slot per calendar day, so each decay weight is a shift of the whole series
+    dense = np.zeros(span)
+    dense[offsets] = values
+    present = np.zeros(span)
+    present[offsets] = 1.0
+
+    weighted = np.zeros(span)
+    weights = np.zeros(span)
+    for lag in range(min(window_days, span)):
+        weight = math.exp(-decay_lambda * lag)
+        weighted[lag:] += dense[:span - lag] * weight
+        weights[lag:] += present[:span - lag] * weight
+    return weighted[offsets] * (window_days / weights[offsets])
+
+
+def _rows_weighted(days: np.ndarray, values: np.ndarray, window: int,
+                   decay_lambda: float) -> np.ndarray:
+    """Decayed sum over each value and the window - 1 before it, normalized to window."""
+    n = len(values)
+    weighted = np.zeros(n)
+    weights = np.zeros(n)
+    for lag in range(min(window, n)):
+        weight = np.exp(-decay_lambda * (days[lag:] - days[:n - lag]))
+        weighted[lag:] += values[:n - lag] * weight
+        weights[lag:] += weight
+    return weighted * (window / weights)
+
+
+def category_rolling_sums(dates, minutes: Mapping[str, np.ndarray], meet: Optional[np.ndarray] = None,
+                          hobby: Iterable[str] = (), work: Iterable[str] = (),
+                          window_days: int = DEFAULT_WINDOW_DAYS,
+                          decay_lambda: float = DEFAULT_DECAY_LAMBDA,
+                          limit: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """Daily totals and rolling series for every day, oldest first.
+
+    Args:
+        dates: Days in ascending order, one per day (dates or datetime64[D])
+        minutes: Category -> minutes per day (0 where the category is absent)
+        meet: Meeting minutes per day (0 where absent), or None
+        hobby: Hobby categories
+        work: Work categories
+        window_days: Rolling window size in days
+        decay_lambda: Decay parameter for exponential weighting
+        limit: Only return the last limit days (None = all); earlier days
+            still count toward their windows
+
+    Returns:
+        dict: 'date' (datetime64[D]) plus one array per name in DAILY and SERIES
+    """
+    dates = np.asarray(dates, dtype='datetime64[D]')
+    days = dates.astype(np.int64)
+    num_days = len(days)
+    result = split_categories(minutes, meet, hobby, work, num_days)
+    result['date'] = dates
+
+    if num_days == 0:
+        result.update({name: np.zeros(0) for name in SERIES})
+        return result
+
+    for name in ('hobby', 'other', 'total'):
+        result[f'{name}_raw'] = _rows_sum(result[name], window_days)
+    result['hobby_weighted'] = _calendar_weighted(days, result['hobby'], window_days, decay_lambda)
+
+    # 1970-01-01 was a Thursday: Monday to Friday are 0-4
+    weekday = (days + 3) % 7 < 5
+    # Index of each day's weekday (itself, or the last one before a weekend day)
+    latest_weekday = np.cumsum(weekday) - 1
+    carried = latest_weekday >= 0
+    work_raw = np.zeros(num_days, dtype=np.int64)
+    work_weighted = np.zeros(num_days)
+    if weekday.any():
+        weekday_work = result['work'][weekday]
+        work_raw[carried] = _rows_sum(weekday_work, WORK_WINDOW)[latest_weekday[carried]]
+        work_weighted[carried] = _rows_weighted(
+            days[weekday], weekday_work, WORK_WINDOW, decay_lambda)[latest_weekday[carried]]
+    result['work_raw'] = work_raw
+    result['work_weighted'] = work_weighted
+
+    if limit is not None:
+        result = {name: values[max(num_days - limit, 0):] for name, values in result.items()}
+    for name in ('hobby_weighted', 'work_weighted'):
+        result[name] = np.array([round_numeric(value) for value in result[name].tolist()])
+    return result
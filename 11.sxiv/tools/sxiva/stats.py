@@ -0,0 +1,109 @@
+"""Dashboard category series computed offline from the .sxiva archive.
+
+`sxiva stats` brings the day cache (day_cache.py) of SXIVA_DATA up to date,
+extracting only files that changed, then runs the rolling sums engine
+(rolling.py) over its columns: per day, the hobby/work/other totals and the
+rolling series of the dashboard's /api/category-rolling-sum endpoint, with no
+database.
+"""
+
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .batch import resolve_jobs
+from .day_cache import DayCache, MISSING_INT
+from .rolling import (
+    DAILY, DEFAULT_DECAY_LAMBDA, DEFAULT_WINDOW_DAYS, SERIES, category_rolling_sums,
+)
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()  # Day ordinal -> datetime64[D]
+
+# Files extracted ahead of the one being written, per worker
+IN_FLIGHT_PER_WORKER = 4
+
+# Columns of each output row (JSONL rows also carry category_minutes)
+FIELDS = [
+    'date', 'day_of_week',
+    'hobby', 'work', 'other', 'total',
+    'hobby_raw', 'hobby_weighted', 'work_raw', 'work_weighted', 'other_raw', 'total_raw',
+]
+
+# Per-process extractor: each worker loads its own parser once
+_worker_extractor = None
+
+
+def _init_worker():
+    global _worker_extractor
+    from .parser_extractor import SxivaDataExtractor
+
+    _worker_extractor = SxivaDataExtractor()
+
+
+def extract_file(file_path: str) -> Optional[dict]:
+    """Sync payload of one file, as the dashboard would receive it."""
+    if _worker_extractor is None:
+        _init_worker()
+    return _worker_extractor.extract_from_file(Path(file_path))
+
+
+def extract_files(file_paths: List[Path], jobs: Optional[int] = None) -> Iterator[Optional[dict]]:
+    """Extract files, yielding one payload (or None) per file in input order.
+
+    With several workers, only a few files per worker are extracted ahead of
+    the one being yielded, so memory stays bounded however many files there are.
+
+    Args:
+        file_paths: Files to extract
+        jobs: Worker processes (None or 0 = one per CPU, 1 = serial in-process)
+    """
+    file_paths = [str(p) for p in file_paths]
+    workers = resolve_jobs(jobs, len(file_paths))
+
+    if workers == 1:
+        for file_path in file_paths:
+            yield extract_file(file_path)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+        pending = deque()
+        for file_path in file_paths:
+            pending.append(executor.submit(extract_file, file_path))
+            if len(pending) >= workers * IN_FLIGHT_PER_WORKER:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def cache_stats(cache: DayCache, names: Optional[Iterable[str]] = None,
+                hobby: Iterable[str] = (), work: Iterable[str] = (),
+                window_days: int = DEFAULT_WINDOW_DAYS,
+                decay_lambda: float = DEFAULT_DECAY_LAMBDA) -> Iterator[dict]:
+    """Output rows for the files in names (one per date; default: every cached
+    file), in date order."""
+    rows = np.array(cache.rows(names), dtype=np.intp)
+    dates = np.frombuffer(cache.dates, dtype=np.dtype(cache.dates.typecode))[rows]
+    minutes = {
+        category: np.maximum(np.frombuffer(column, dtype=np.dtype(column.typecode))[rows], 0)
+        for category, column in cache.categories.items()
+    }
+    meet = np.frombuffer(cache.attributes['meet'], dtype=np.int64)[rows]
+    meet = np.where(meet == MISSING_INT, 0, meet)
+
+    sums = category_rolling_sums(
+        dates - _EPOCH_ORDINAL, minutes, meet,
+        hobby=hobby, work=work, window_days=window_days, decay_lambda=decay_lambda,
+    )
+    columns = {name: sums[name].tolist() for name in (*DAILY, *SERIES)}
+    for i, row in enumerate(rows.tolist()):
+        day = cache.payload(row)
+        yield {
+            'date': day['date'],
+            'day_of_week': day['day_of_week'],
+            **{name: values[i] for name, values in columns.items()},
+            'category_minutes': day['category_minutes'],
+        }
@@ -5,8 +5,12 @@ SXIVA Sync Client
 Syncs .sxiva files to the dashboard API.
 """
 
+import math
 import os
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
 from typing import List, Optional
@@ -20,21 +24,120 @@ except ImportError:
 # Import parser extractor
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from tools.sxiva.parser_extractor import SxivaDataExtractor
+from tools.sxiva.manifest import Manifest, file_digest, payload_digest
+from tools.sxiva.day_cache import DayCache
+from tools.sxiva.journal import flush
 
 
 # Configuration
 API_BASE_URL = os.getenv('SXIVA_API_URL', 'https://andrewcheong.com/status')
 API_TOKEN = os.getenv('SXIVA_API_TOKEN', '70e76d8aa02a319a510b8c239e1e7cbe86dbc3c35fec7bf270564757af0c6a90')
 DATA_DIR = Path.home() / 'src/minutes/data'
+SYNC_BATCH_SIZE = int(os.getenv('SXIVA_SYNC_BATCH_SIZE', '100'))  # Days per /api/sync/batch request
+SYNC_PARALLELISM = int(os.getenv('SXIVA_SYNC_PARALLELISM', '4'))  # Batch requests in flight at once
+SYNC_RETRIES = int(os.getenv('SXIVA_SYNC_RETRIES', '3'))  # Retries after a 5xx response, timeout or connection error
+SYNC_BACKOFF = float(os.getenv('SXIVA_SYNC_BACKOFF', '0.5'))  # Seconds before the first retry, doubled for each next one
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of values (0.0 if empty)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * fraction)) - 1]
 
 
 class SxivaSyncClient:
     """Client for syncing .sxiva files to the dashboard API"""
 
-    def __init__(self, api_url: str = API_BASE_URL, api_token: str = API_TOKEN):
+    def __init__(self, api_url: str = API_BASE_URL, api_token: str = API_TOKEN,
+                 batch_size: int = SYNC_BATCH_SIZE, parallelism: int = SYNC_PARALLELISM,
+                 retries: int = SYNC_RETRIES, backoff: float = SYNC_BACKOFF):
         self.api_url = api_url.rstrip('/')
         self.api_token = api_token
+        self.batch_size = max(1, batch_size)
+        self.parallelism = max(1, parallelism)
+        self.retries = max(0, retries)
+        self.backoff = backoff
         self.extractor = SxivaDataExtractor()
+        self.prepared = {}  # file name -> (content hash, payload) built during recalculation
+        self.cache = None  # DayCache of the data directory being synced, if any
+        self.latencies = []  # Seconds per HTTP request (every attempt) of the current sync
+        self._session = None
+        self._lock = threading.Lock()  # Guards the session, day cache and latencies across upload threads
+
+    @property
+    def session(self):
+        """Keep-alive HTTP session, with one pooled connection per concurrent upload"""
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_maxsize=self.parallelism)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                session.headers['Authorization'] = f'Bearer {self.api_token}'
+                self._session = session
+            return self._session
+
+    def request(self, method: str, path: str, retries: Optional[int] = None, **kwargs):
+        """
+        Send a request to the API over the session.
+
+        5xx responses, timeouts and connection errors are retried after an
+        exponential backoff (backoff, 2 * backoff, ...), up to `retries` times
+        (default: the client's). The last response is returned, or the last
+        error raised.
+        """
+        retries = self.retries if retries is None else retries
+        for attempt in range(retries + 1):
+            start = time.perf_counter()
+            try:
+                response = self.session.request(method, f'{self.api_url}{path}', **kwargs)
+            except (requests.Timeout, requests.ConnectionError):
+                self._record_latency(time.perf_counter() - start)
+                if attempt == retries:
+                    raise
+            else:
+                self._record_latency(time.perf_counter() - start)
+                if response.status_code < 500 or attempt == retries:
+                    return response
+            time.sleep(self.backoff * 2 ** attempt)
+
+    def _record_latency(self, seconds: float):
+        with self._lock:
+            self.latencies.append(seconds)
+
+    def use_recalculated(self, results):
+        """
+        Reuse the payloads built while recalculating files (batch.FileResult)
+        instead of parsing those files again.
+        """
+        for result in results:
+            if result.data is not None and result.digest is not None:
+                self.prepared[result.name] = (result.digest, result.data)
+
+    def extract(self, file_path: Path) -> Optional[dict]:
+        """
+        Get the sync payload for a file.
+
+        Uses the payload from recalculation or the day cache if the file's
+        content hasn't changed since, and parses the file otherwise.
+        """
+        digest = file_digest(file_path)
+        prepared = self.prepared.get(file_path.name)
+        if prepared and prepared[0] == digest:
+            data = prepared[1]
+        else:
+            with self._lock:
+                cached = self.cache.get(file_path.name, digest) if self.cache is not None else None
+            if cached is not None:
+                return cached
+            data = self.extractor.extract_from_file(file_path)
+
+        if self.cache is not None:
+            with self._lock:
+                self.cache.put(file_path.name, digest, data)
+        return data
 
     def get_last_sync_timestamp(self) -> tuple[bool, Optional[datetime]]:
         """
@@ -48,11 +151,8 @@ class SxivaSyncClient:
             return (False, None)
 
         try:
-            response = requests.get(
-                f'{self.api_url}/api/status/last-sync',
-                headers={'Authorization': f'Bearer {self.api_token}'},
-                timeout=5
-            )
+            # No retries: an unreachable server means offline, and sync is skipped
+            response = self.request('GET', '/api/status/last-sync', retries=0, timeout=5)
 
             if response.status_code == 200:
                 data = response.json()
@@ -68,6 +168,30 @@ class SxivaSyncClient:
             print(f"Warning: Failed to contact sync server: {e}", file=sys.stderr)
             return (False, None)
 
+    def get_remote_hashes(self, start: Optional[str] = None, end: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the payload hash of each day the server has, from /api/sync/hashes.
+
+        Args:
+            start: First date (YYYY-MM-DD), or None for the earliest
+            end: Last date (YYYY-MM-DD), or None for the latest
+
+        Returns: {date: payload_digest} or None if the server couldn't say
+        (e.g. an older server without the endpoint)
+        """
+        if not requests:
+            return None
+
+        params = {key: value for key, value in (('start', start), ('end', end)) if value}
+        try:
+            # No retries: without hashes, sync_all falls back to the manifest
+            response = self.request('GET', '/api/sync/hashes', params=params, retries=0, timeout=10)
+            if response.status_code == 200:
+                return response.json()['hashes']
+        except (requests.RequestException, ValueError, KeyError):
+            pass
+        return None
+
     def sync_file(self, file_path: Path, verbose: bool = False) -> bool:
         """
         Sync a single .sxiva file to the server.
@@ -82,22 +206,22 @@ class SxivaSyncClient:
             return False
 
         # Extract data from file
-        data = self.extractor.extract_from_file(file_path)
+        data = self.extract(file_path)
         if not data:
             if verbose:
                 print(f"  ✗ {file_path.name}: Failed to extract data", file=sys.stderr)
             return False
 
+        return self.upload_day(data, verbose=verbose)
+
+    def upload_day(self, data: dict, verbose: bool = False) -> bool:
+        """
+        Upload one day's payload to /api/sync/daily.
+
+        Returns: True if successful, False otherwise
+        """
         try:
-            response = requests.post(
-                f'{self.api_url}/api/sync/daily',
-                headers={
-                    'Authorization': f'Bearer {self.api_token}',
-                    'Content-Type': 'application/json'
-                },
-                json=data,
-                timeout=10
-            )
+            response = self.request('POST', '/api/sync/daily', json=data, timeout=10)
 
             if response.status_code == 200:
                 if verbose:
@@ -105,53 +229,180 @@ class SxivaSyncClient:
                 return True
             else:
                 if verbose:
-                    print(f"  ✗ {file_path.name}: {response.status_code}", file=sys.stderr)
+                    print(f"  ✗ {data['date']}: {response.status_code}", file=sys.stderr)
                 return False
 
         except Exception as e:
             if verbose:
-                print(f"  ✗ {file_path.name}: {e}", file=sys.stderr)
+                print(f"  ✗ {data['date']}: {e}", file=sys.stderr)
             return False
 
-    def sync_all(self, data_dir: Path, last_sync_timestamp: Optional[datetime] = None, verbose: bool = False) -> dict:
+    def sync_batch(self, file_paths: List[Path], verbose: bool = False) -> List[Path]:
+        """
+        Sync several .sxiva files in one request to /api/sync/batch.
+
+        Falls back to one /api/sync/daily request per file if the server
+        doesn't have the batch endpoint.
+
+        Args:
+            file_paths: Paths to .sxiva files
+            verbose: If True, print progress messages
+
+        Returns: The paths that were synced successfully
+        """
+        if not requests:
+            return []
+
+        # Extract data from files
+        days = []
+        extracted_paths = []
+        for file_path in file_paths:
+            data = self.extract(file_path)
+            if not data:
+                if verbose:
+                    print(f"  ✗ {file_path.name}: Failed to extract data", file=sys.stderr)
+                continue
+            days.append(data)
+            extracted_paths.append(file_path)
+
+        return [extracted_paths[i] for i in self.upload(days, verbose=verbose)]
+
+    def upload(self, days: List[dict], verbose: bool = False) -> List[int]:
+        """
+        Upload day payloads in one request to /api/sync/batch.
+
+        Falls back to one /api/sync/daily request per day if the server
+        doesn't have the batch endpoint.
+
+        Returns: Indices (into days) of the days that were synced
+        """
+        if not requests or not days:
+            return []
+
+        try:
+            response = self.request('POST', '/api/sync/batch', json={'days': days}, timeout=30)
+
+            if response.status_code == 404:
+                # Older server without the batch endpoint
+                return [i for i, data in enumerate(days) if self.upload_day(data, verbose=verbose)]
+
+            if response.status_code == 200:
+                if verbose:
+                    for data in days:
+                        print(f"  ✓ {data['date']}: Synced", file=sys.stderr)
+                return list(range(len(days)))
+            else:
+                if verbose:
+                    print(f"  ✗ Batch of {len(days)} file(s): {response.status_code}", file=sys.stderr)
+                return []
+
+        except Exception as e:
+            if verbose:
+                print(f"  ✗ Batch of {len(days)} file(s): {e}", file=sys.stderr)
+            return []
+
+    def sync_all(self, data_dir: Path, last_sync_timestamp: Optional[datetime] = None, verbose: bool = False,
+                 use_manifest: bool = True) -> dict:
         """
-        Sync all .sxiva files modified after last_sync_timestamp.
+        Sync all .sxiva files whose content changed since they were last synced.
+
+        If the server serves payload hashes (/api/sync/hashes), every file's
+        payload is hashed and only the days the server has a different (or
+        no) hash for are uploaded. mtimes and the manifest don't matter then.
+
+        Otherwise, with use_manifest, files are compared by content hash
+        against the data directory manifest. Files the manifest doesn't know
+        yet (first run) fall back to comparing their mtime with
+        last_sync_timestamp.
+
+        With use_manifest, payloads are taken from the data directory's day
+        cache when it has them for the file's content, and new ones are added
+        to it. Files found up to date on the server are recorded as synced in
+        the manifest, like the ones uploaded.
+
+        Files are uploaded in batches of `batch_size`, with up to
+        `parallelism` batch requests in flight over the keep-alive session.
 
         Args:
             data_dir: Directory containing .sxiva files
-            last_sync_timestamp: Only sync files modified after this timestamp. If None, sync all.
+            last_sync_timestamp: Last sync recorded by the server. If None, sync all.
             verbose: If True, print detailed progress messages
+            use_manifest: If False, only filter on modification time
 
         Returns:
-            dict with 'synced', 'failed', 'skipped' counts
+            dict with 'synced', 'failed', 'skipped' counts, and for the
+            uploads 'requests' (HTTP requests, retries included), 'seconds'
+            (wall time) and 'p50_ms'/'p95_ms' (request latency)
         """
+        start = time.perf_counter()
+        self.latencies = []
+
         if not data_dir.exists():
             print(f"Warning: Data directory not found: {data_dir}", file=sys.stderr)
-            return {'synced': 0, 'failed': 0, 'skipped': 0}
+            return self._summary(0, 0, 0, start)
 
         # Get all .sxiva files
         files = sorted(data_dir.glob('*.sxiva'))
         if not files:
-            return {'synced': 0, 'failed': 0, 'skipped': 0}
+            return self._summary(0, 0, 0, start)
+
+        manifest = Manifest.load(data_dir) if use_manifest else None
+        self.cache = DayCache.load(data_dir) if use_manifest else None
+        if manifest and last_sync_timestamp is None:
+            # Server has no prior sync - whatever we recorded is gone from it
+            manifest.forget_synced(self.api_url)
+        # Without hashes for this server yet, trust mtime once to seed them
+        seed_from_mtime = manifest is not None and not manifest.knows_api_url(self.api_url)
 
         # Collect files to sync
         files_to_sync = []
+        digests = {}
         synced = 0
         failed = 0
         skipped = 0
 
+        # Only files with a valid .sxiva filename are synced
+        dated = {}
         for file_path in files:
-            # Check if file has valid .sxiva filename
             file_date_str = self.extractor._extract_date_from_filename(file_path.name)
-            if not file_date_str:
+            if file_date_str:
+                dated[file_path] = file_date_str
+            else:
                 skipped += 1
+
+        remote_hashes = None
+        if dated:
+            remote_hashes = self.get_remote_hashes(min(dated.values()), max(dated.values()))
+
+        for file_path in dated:
+            if remote_hashes is not None:
+                # Delta sync: upload the day unless the server has this payload
+                data = self.extract(file_path)
+                if manifest:
+                    digests[file_path] = file_digest(file_path)
+                if data is not None and remote_hashes.get(data['date']) == payload_digest(data):
+                    if manifest:
+                        manifest.mark_synced(self.api_url, file_path.name, digests[file_path])
+                    skipped += 1
+                    continue
+                files_to_sync.append(file_path)
                 continue
 
+            if manifest:
+                digest = file_digest(file_path)
+                if manifest.is_synced(self.api_url, file_path.name, digest):
+                    skipped += 1
+                    continue
+                digests[file_path] = digest
+                if not seed_from_mtime:
+                    # Content changed since last sync (or file is new) - mtime doesn't matter
+                    files_to_sync.append(file_path)
+                    continue
+
             # Check if we should sync this file based on modification time
             if last_sync_timestamp:
                 try:
                     # Get file modification time as UTC timestamp
-                    import time
                     file_mtime_utc = file_path.stat().st_mtime
 
                     # Convert last_sync_timestamp to UTC timestamp for comparison
@@ -159,6 +410,8 @@ class SxivaSyncClient:
 
                     # Only sync if file was modified after last sync
                     if file_mtime_utc <= last_sync_utc:
+                        if manifest:
+                            manifest.mark_synced(self.api_url, file_path.name, digests[file_path])
                         skipped += 1
                         continue
                 except (OSError, ValueError):
@@ -171,17 +424,50 @@ class SxivaSyncClient:
         if verbose and files_to_sync:
             print(f"Syncing {len(files_to_sync)} file(s) to dashboard...", file=sys.stderr)
 
-        # Sync the files
-        for file_path in files_to_sync:
-            if self.sync_file(file_path, verbose=verbose):
-                synced += 1
-            else:
-                failed += 1
-
-        return {'synced': synced, 'failed': failed, 'skipped': skipped}
-
-
-def sync_now(data_dir: Optional[Path] = None, verbose: bool = True, api_url: Optional[str] = None) -> bool:
+        # Sync the files in batches, several batches at a time
+        chunks = [files_to_sync[i:i + self.batch_size] for i in range(0, len(files_to_sync), self.batch_size)]
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            futures = {executor.submit(self.sync_batch, chunk, verbose): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                synced_paths = future.result()
+                synced += len(synced_paths)
+                failed += len(chunk) - len(synced_paths)
+                if manifest:
+                    for file_path in synced_paths:
+                        manifest.mark_synced(self.api_url, file_path.name, digests[file_path])
+
+        if manifest:
+            manifest.save()
+            self.cache.save()
+
+        result = self._summary(synced, failed, skipped, start)
+        if verbose and files_to_sync:
+            print(
+                f"Uploaded {synced} file(s) in {result['requests']} request(s), {result['seconds']:.1f}s "
+                f"({synced / max(result['seconds'], 1e-9):.1f} files/s); "
+                f"latency p50 {result['p50_ms']:.0f} ms, p95 {result['p95_ms']:.0f} ms",
+                file=sys.stderr
+            )
+        return result
+
+    def _summary(self, synced: int, failed: int, skipped: int, start: float) -> dict:
+        """sync_all's result, with request statistics since start"""
+        with self._lock:
+            latencies = list(self.latencies)
+        return {
+            'synced': synced,
+            'failed': failed,
+            'skipped': skipped,
+            'requests': len(latencies),
+            'seconds': time.perf_counter() - start,
+            'p50_ms': _percentile(latencies, 0.50) * 1000,
+            'p95_ms': _percentile(latencies, 0.95) * 1000,
+        }
+
+
+def sync_now(data_dir: Optional[Path] = None, verbose: bool = True, api_url: Optional[str] = None,
+             recalculated: Optional[list] = None) -> bool:
     """
     Sync all .sxiva files to the dashboard.
 
@@ -191,6 +477,8 @@ def sync_now(data_dir: Optional[Path] = None, verbose: bool = True, api_url: Opt
         data_dir: Directory containing .sxiva files (default: ~/src/minutes/data)
         verbose: If True, show detailed progress messages
         api_url: API base URL (default: from SXIVA_API_URL env var or https://andrewcheong.com/status/api)
+        recalculated: FileResults from recalculating data_dir just before, whose
+                      payloads are synced without parsing the files again
 
     Returns:
         True if sync completed (even if some files failed)
@@ -209,6 +497,8 @@ def sync_now(data_dir: Optional[Path] = None, verbose: bool = True, api_url: Opt
             api_url = os.getenv('SXIVA_API_URL', API_BASE_URL)
 
         client = SxivaSyncClient(api_url=api_url)
+        if recalculated:
+            client.use_recalculated(recalculated)
 
         # Get last sync timestamp from server
         reachable, last_sync_timestamp = client.get_last_sync_timestamp()
@@ -224,6 +514,12 @@ def sync_now(data_dir: Optional[Path] = None, verbose: bool = True, api_url: Opt
             else:
                 print("Last sync: No previous sync found", file=sys.stderr)
 
+        # Upload the days journaled by log-now / calculate --fix first; they
+        # are marked synced, so sync_all skips their files
+        flushed = flush(data_dir, client, verbose=verbose)
+        if verbose and flushed:
+            print(f"✓ Flushed {flushed} journaled day(s) to dashboard", file=sys.stderr)
+
         # Sync all files modified after last sync
         result = client.sync_all(data_dir, last_sync_timestamp, verbose=verbose)
 
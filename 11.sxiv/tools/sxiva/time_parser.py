@@ -17,12 +17,29 @@ Supported formats:
 - 1.75h        -> 105 minutes (rounded to nearest minute)
 - 0.5h         -> 30 minutes
 - 0.25h        -> 15 minutes
+
+Files repeat the same few times and durations on many lines, so both parsers
+scan their input in a single pass (no regular expressions) and memoize
+results per input string in a bounded LRU cache.
 """
 
-import re
+from functools import lru_cache
 from typing import Optional
 
 
+# Distinct strings remembered per parser (every HH:MM of a day is 1440)
+PARSE_CACHE_SIZE = 2048
+
+
+def _scan_digits(text: str, start: int) -> int:
+    """Index of the first non-digit in text at or after start."""
+    end = start
+    while end < len(text) and text[end].isdecimal():
+        end += 1
+    return end
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_duration(duration_str: str) -> Optional[int]:
     """Parse a duration string into total minutes.
 
@@ -68,38 +85,46 @@ def parse_duration(duration_str: str) -> Optional[int]:
     if duration_str == '0':
         return 0
 
+    # Every format starts with a number: hours, or minutes for Xm
+    end = _scan_digits(duration_str, 0)
+    if end == 0 or end == len(duration_str):
+        return None
+    unit = duration_str[end]
+
     # Format: H:MM or HH:MM (e.g., "1:34", "01:34")
-    if ':' in duration_str:
-        match = re.match(r'^(\d+):(\d{2})$', duration_str)
-        if match:
-            hours = int(match.group(1))
-            minutes = int(match.group(2))
-            return hours * 60 + minutes
+    if unit == ':':
+        minutes = duration_str[end + 1:]
+        if len(minutes) == 2 and minutes.isdecimal():
+            return int(duration_str[:end]) * 60 + int(minutes)
         return None
 
     # Format: X.Yh (decimal hours, e.g., "1.75h", "0.5h", "0.25h")
-    match = re.match(r'^(\d+(?:\.\d+)?)h$', duration_str)
-    if match:
-        hours = float(match.group(1))
-        # Round to nearest minute
-        return round(hours * 60)
-
-    # Format: XhYm (e.g., "1h34m", "2h15m")
-    match = re.match(r'^(\d+)h(\d+)m$', duration_str)
-    if match:
-        hours = int(match.group(1))
-        minutes = int(match.group(2))
-        return hours * 60 + minutes
+    if unit == '.':
+        fraction_end = _scan_digits(duration_str, end + 1)
+        if fraction_end > end + 1 and duration_str[fraction_end:] == 'h':
+            # Round to nearest minute
+            return round(float(duration_str[:fraction_end]) * 60)
+        return None
+
+    if unit == 'h':
+        # Format: Xh (e.g., "1h", "2h")
+        if end + 1 == len(duration_str):
+            return round(float(duration_str[:end]) * 60)
+
+        # Format: XhYm (e.g., "1h34m", "2h15m")
+        minutes_end = _scan_digits(duration_str, end + 1)
+        if minutes_end > end + 1 and duration_str[minutes_end:] == 'm':
+            return int(duration_str[:end]) * 60 + int(duration_str[end + 1:minutes_end])
+        return None
 
     # Format: Xm (e.g., "5m", "75m")
-    match = re.match(r'^(\d+)m$', duration_str)
-    if match:
-        minutes = int(match.group(1))
-        return minutes
+    if unit == 'm' and end + 1 == len(duration_str):
+        return int(duration_str[:end])
 
     return None
 
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
 def parse_time_to_minutes_since_midnight(time_str: str) -> int:
     """Parse HH:MM time string to minutes since midnight.
 
@@ -111,6 +136,9 @@ def parse_time_to_minutes_since_midnight(time_str: str) -> int:
     Returns:
         Minutes since midnight
 
+    Raises:
+        ValueError: If time_str is not two colon-separated integers
+
     Examples:
         >>> parse_time_to_minutes_since_midnight("14:30")
         870
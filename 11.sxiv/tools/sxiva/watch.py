@@ -0,0 +1,226 @@
+"""`sxiva watch`: fix and sync dated files in a data directory as they are saved.
+
+Changes are picked up with inotify on Linux (through libc, no extra
+dependency) and by polling mtimes elsewhere. Saves of one file within
+DEBOUNCE_SECONDS of each other are handled once, after the last of them.
+Each settled change is fixed with one long-lived incremental PointCalculator
+and its payload journaled (see journal.py) and flushed right away over the
+sync client's keep-alive session; payloads that can't be uploaded stay
+journaled until the next flush.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import re
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Optional, Set
+
+from .manifest import Manifest, file_digest
+
+
+# Seconds a file must go unchanged before it is fixed and synced
+DEBOUNCE_SECONDS = float(os.getenv('SXIVA_WATCH_DEBOUNCE', '0.5'))
+
+# Seconds between directory scans when polling
+POLL_INTERVAL = float(os.getenv('SXIVA_WATCH_POLL_INTERVAL', '1.0'))
+
+# Dated files (the ones sync uploads)
+DATED_FILE = re.compile(r'^\d{8}[UMTWRFS]?\.sxiva$')
+
+# inotify(7) constants
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+_INOTIFY_EVENT = struct.Struct('iIII')  # wd, mask, cookie, len (name follows)
+
+
+class InotifyWatcher:
+    """Names of dated files written (or renamed into place) in a directory, via inotify."""
+
+    def __init__(self, data_dir: Path):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        # AttributeError on systems without inotify
+        inotify_init1, inotify_add_watch = libc.inotify_init1, libc.inotify_add_watch
+
+        self.fd = inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        # Editors either rewrite the file or rename a temporary file over it
+        if inotify_add_watch(self.fd, os.fsencode(str(data_dir)), IN_CLOSE_WRITE | IN_MOVED_TO) < 0:
+            errno = ctypes.get_errno()
+            os.close(self.fd)
+            raise OSError(errno, f'inotify_add_watch failed for {data_dir}')
+
+    def changes(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds (None: forever) for changes."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return set()
+
+        names = set()
+        offset = 0
+        while offset < len(data):
+            _, _, _, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if DATED_FILE.match(name):
+                names.add(name)
+        return names
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Names of dated files whose mtime or size changed, by rescanning a directory."""
+
+    def __init__(self, data_dir: Path, interval: float = POLL_INTERVAL):
+        self.data_dir = Path(data_dir)
+        self.interval = interval
+        self.snapshot = self._scan()
+
+    def _scan(self) -> Dict[str, tuple]:
+        snapshot = {}
+        with os.scandir(self.data_dir) as entries:
+            for entry in entries:
+                if DATED_FILE.match(entry.name):
+                    try:
+                        stat = entry.stat()
+                    except OSError:
+                        continue
+                    snapshot[entry.name] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def changes(self, timeout: Optional[float]) -> Set[str]:
+        """Wait up to timeout seconds (at most one poll interval) for changes."""
+        time.sleep(self.interval if timeout is None else min(timeout, self.interval))
+        snapshot = self._scan()
+        names = {name for name, stat in snapshot.items() if self.snapshot.get(name) != stat}
+        self.snapshot = snapshot
+        return names
+
+    def close(self):
+        pass
+
+
+def open_watcher(data_dir: Path, polling: bool = False):
+    """An inotify watcher for data_dir, or a polling one if inotify isn't available (or polling)."""
+    if not polling:
+        try:
+            return InotifyWatcher(data_dir)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(data_dir)
+
+
+class AutoSync:
+    """Fixes and syncs single files with one warm calculator and sync client."""
+
+    def __init__(self, data_dir: Path, client=None):
+        """
+        Args:
+            data_dir: Data directory the files are in
+            client: SxivaSyncClient to upload with, or None to only fix files
+        """
+        from .calculator import PointCalculator
+        from .parser_extractor import SxivaDataExtractor
+
+        self.data_dir = Path(data_dir)
+        self.client = client
+        self.calculator = PointCalculator(incremental=True)
+        self.extractor = SxivaDataExtractor()
+        self.digests = {}  # file name -> content hash after it was last handled
+
+    def catch_up(self, verbose: bool = True) -> Optional[dict]:
+        """Flush the journal and sync whatever changed while nothing was watching.
+
+        Returns: sync_all's result, or None without a client or server
+        """
+        from .journal import flush
+
+        if self.client is None:
+            return None
+        reachable, last_sync_timestamp = self.client.get_last_sync_timestamp()
+        if not reachable:
+            return None
+        flush(self.data_dir, self.client, verbose=verbose)
+        return self.client.sync_all(self.data_dir, last_sync_timestamp, verbose=verbose)
+
+    def handle(self, name: str) -> Optional[str]:
+        """Fix and sync one file.
+
+        Returns: What was done, or None if the file is gone or unchanged since
+        it was last handled (e.g. the event was our own fix being written)
+        """
+        from .journal import flush, record
+
+        file_path = self.data_dir / name
+        if file_digest(file_path) in (None, self.digests.get(name)):
+            return None
+
+        analysis = self.calculator.analyze_file(str(file_path))
+        digest = file_digest(file_path)
+        self.digests[name] = digest
+        status = f"{analysis.num_fixes} fix(es)"
+
+        manifest = Manifest.load(self.data_dir)
+        manifest.mark_recalculated(name, digest)
+        manifest.save()
+
+        data = self.extractor.extract_from_analysis(analysis)
+        if self.client is not None and data is not None:
+            # Through the journal, so an earlier payload of this date that
+            # couldn't be uploaded is superseded rather than sent after it
+            record(file_path, data)
+            flushed = flush(self.data_dir, self.client)
+            status += f", synced {flushed} day(s)" if flushed else ", journaled (server unreachable)"
+        return status
+
+
+def watch(data_dir: Path, auto_sync: AutoSync, debounce: float = DEBOUNCE_SECONDS, polling: bool = False,
+          stop: Optional[threading.Event] = None, report: Callable[[str], None] = print):
+    """Handle changes to dated files in data_dir until stopped.
+
+    Args:
+        data_dir: Directory to watch
+        auto_sync: Handles each settled change
+        debounce: Seconds a file must go unchanged before it is handled
+        polling: If True, poll even where inotify is available
+        stop: Event that ends the loop (checked at least every debounce
+              seconds); without one, runs until interrupted
+        report: Called with a line per handled file
+    """
+    watcher = open_watcher(data_dir, polling)
+    pending = {}  # file name -> monotonic time it settles at
+    try:
+        while stop is None or not stop.is_set():
+            timeout = max(0.0, min(pending.values()) - time.monotonic()) if pending else None
+            if stop is not None:
+                timeout = debounce if timeout is None else min(timeout, debounce)
+
+            for name in watcher.changes(timeout):
+                pending[name] = time.monotonic() + debounce
+
+            now = time.monotonic()
+            for name in [name for name, settles_at in pending.items() if settles_at <= now]:
+                del pending[name]
+                try:
+                    status = auto_sync.handle(name)
+                except Exception as e:
+                    report(f"✗ {name}: {e}")
+                    continue
+                if status:
+                    report(f"✓ {name}: {status}")
+    finally:
+        watcher.close()